@@ -2,19 +2,31 @@
 Authentication API endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, EmailStr
-from ..database import get_db
+from ..database import get_async_db
 from ..db_models import User
 from ..auth import (
     verify_password,
     get_password_hash,
     create_access_token,
-    get_current_user
+    get_current_user,
+    AuthenticatedUser,
+    principal_cache
 )
+from ..services.password_hasher import password_hasher, PasswordHasherBusy
+from .cluster import require_cluster_secret
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+def hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many login attempts in progress, retry later",
+        headers={"Retry-After": "1"},
+    )
+
 class RegisterRequest(BaseModel):
     username: str
     email: EmailStr
@@ -35,10 +47,12 @@ class UserResponse(BaseModel):
     email: str
 
 @router.post("/register", response_model=TokenResponse)
-def register(request: RegisterRequest, db: Session = Depends(get_db)):
+async def register(request: RegisterRequest, db: AsyncSession = Depends(get_async_db)):
     """Register a new user"""
     # Check if username exists
-    existing_user = db.query(User).filter(User.username == request.username).first()
+    existing_user = (await db.execute(
+        select(User).where(User.username == request.username)
+    )).scalar_one_or_none()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -46,7 +60,9 @@ def register(request: RegisterRequest, db: Session = Depends(get_db)):
         )
     
     # Check if email exists
-    existing_email = db.query(User).filter(User.email == request.email).first()
+    existing_email = (await db.execute(
+        select(User).where(User.email == request.email)
+    )).scalar_one_or_none()
     if existing_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -54,15 +70,18 @@ def register(request: RegisterRequest, db: Session = Depends(get_db)):
         )
     
     # Create user
-    hashed_password = get_password_hash(request.password)
+    try:
+        hashed_password = await get_password_hash(request.password)
+    except PasswordHasherBusy:
+        raise hasher_busy()
     new_user = User(
         username=request.username,
         email=request.email,
         hashed_password=hashed_password
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     # Create token (sub must be string for jose library)
     access_token = create_access_token(data={"sub": str(new_user.id)})
@@ -78,17 +97,34 @@ def register(request: RegisterRequest, db: Session = Depends(get_db)):
     }
 
 @router.post("/login", response_model=TokenResponse)
-def login(request: LoginRequest, db: Session = Depends(get_db)):
+async def login(request: LoginRequest, db: AsyncSession = Depends(get_async_db)):
     """Login existing user"""
     # Find user
-    user = db.query(User).filter(User.username == request.username).first()
-    if not user or not verify_password(request.password, user.hashed_password):
+    user = (await db.execute(
+        select(User).where(User.username == request.username)
+    )).scalar_one_or_none()
+    valid, upgraded_hash = False, None
+    try:
+        if user:
+            valid, upgraded_hash = await verify_password(request.password, user.hashed_password)
+        else:
+            # Do the same bcrypt work, so response time does not reveal which usernames exist
+            await password_hasher.verify_dummy(request.password)
+    except PasswordHasherBusy:
+        raise hasher_busy()
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Transparent upgrade of legacy SHA-256 (or lower-cost bcrypt) hashes
+    if upgraded_hash:
+        user.hashed_password = upgraded_hash
+        await db.commit()
+        principal_cache.invalidate_user(user.id)
+    
     # Create token (sub must be string for jose library)
     access_token = create_access_token(data={"sub": str(user.id)})
     
@@ -103,10 +139,15 @@ def login(request: LoginRequest, db: Session = Depends(get_db)):
     }
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: AuthenticatedUser = Depends(get_current_user)):
     """Get current authenticated user"""
     return {
         "id": current_user.id,
         "username": current_user.username,
         "email": current_user.email
     }
+
+@router.get("/hasher", dependencies=[Depends(require_cluster_secret)])
+async def get_hasher_stats():
+    """Password hashing pool: queue depth, shed requests, upgraded hashes (operators only: X-Cluster-Secret)"""
+    return password_hasher.stats()
@@ -0,0 +1,120 @@
+"""
+Internal cluster endpoints: membership updates and room handoff between owner nodes
+"""
+import hmac
+from typing import Dict, Optional
+import httpx
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from pydantic import BaseModel
+from ..models import GameRoom
+from ..room_state import RoomState
+from ..services.room_store import room_store, RoomLockTimeout
+from ..services.room_router import room_router, CLUSTER_SECRET, ROOM_MOVED_CLOSE_CODE
+from ..services.room_lifecycle import room_lifecycle
+from ..websocket import manager, resume_round_timer
+from ..log import get_logger
+
+log = get_logger(__name__)
+
+
+def require_cluster_secret(x_cluster_secret: str = Header("")):
+    """Fail closed: without CLUSTER_SECRET the internal endpoints do not exist"""
+    if not CLUSTER_SECRET:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not hmac.compare_digest(x_cluster_secret.encode(), CLUSTER_SECRET.encode()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["internal"],
+    dependencies=[Depends(require_cluster_secret)],
+)
+
+class ClusterNodesRequest(BaseModel):
+    nodes: Dict[str, str]  # {node_id: base_url}
+    drain: bool = False  # this node is leaving: accept a list without it and hand off every room
+
+@router.post("/rooms/import")
+async def import_room(model: GameRoom):
+    """Take ownership of a room handed off by another node"""
+    room = RoomState.from_model(model)
+    await room_store.save(room)
+
+    resume_round_timer(room)
+
+    return {"status": "imported", "room_code": room.room_code}
+
+async def hand_off(client: httpx.AsyncClient, room_code: str, new_owner: str) -> Optional[str]:
+    """Move one room to its new owner; returns the error, or None once it is handed off"""
+    # Under the room lock, so no handler changes the room after it is copied
+    async with room_store.lock(room_code):
+        room = await room_store.get(room_code)
+        if room is None:
+            room_router.retained.discard(room_code)
+            return None
+        try:
+            response = await client.post(
+                f"{room_router.node_urls[new_owner]}/internal/rooms/import",
+                json=room.to_dict(),
+                headers={"X-Cluster-Secret": CLUSTER_SECRET},
+            )
+        except httpx.HTTPError as e:
+            return f"{type(e).__name__}: {e}"
+        if response.status_code != 200:
+            return f"HTTP {response.status_code}"
+
+        # Forwarding nodes reconnect to the new owner on this close code
+        for websocket in list(manager.active_connections.pop(room_code, ())):
+            try:
+                await websocket.close(code=ROOM_MOVED_CLOSE_CODE)
+            except Exception:
+                pass
+        # Same release path as eviction: timer, team names, room code, used words, store entry
+        await room_lifecycle.release(room)
+        return None
+
+@router.put("/cluster/nodes")
+async def update_cluster_nodes(request: ClusterNodesRequest, response: Response):
+    """
+    Apply new membership and hand off rooms whose owner changed. A room whose handoff
+    fails stays owned and served by this node; the response lists it under "failed"
+    (status 207) and the next membership update retries it.
+    """
+    if (room_router.node_id in request.nodes) == request.drain:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"nodes must include this node ({room_router.node_id}), or exclude it with drain set",
+        )
+    room_router.set_nodes(request.nodes)
+    moved = room_router.moved_rooms(await room_store.room_codes())
+
+    handed_off, failed = [], []
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        for room_code, new_owner in moved:
+            try:
+                error = await hand_off(client, room_code, new_owner)
+            except RoomLockTimeout:
+                error = "room is locked"
+            if error is None:
+                handed_off.append(room_code)
+                continue
+            room_router.retained.add(room_code)
+            failed.append({"room_code": room_code, "node": new_owner, "error": error})
+            log.warning("handoff_failed", room=room_code, node=new_owner, error=error)
+
+    if failed:
+        response.status_code = status.HTTP_207_MULTI_STATUS
+    return {
+        "node_id": room_router.node_id,
+        "nodes": room_router.node_urls,
+        "handed_off": handed_off,
+        "failed": failed,
+    }
+
+
+async def forget_retained(room: RoomState):
+    """Eviction hook: a released room no longer pins its code to this node"""
+    room_router.retained.discard(room.room_code)
+
+
+room_lifecycle.add_eviction_hook(forget_retained)
@@ -1,17 +1,39 @@
 """
 Game history API endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
 from pydantic import BaseModel
 from datetime import datetime
-from ..database import get_db
-from ..db_models import User, GameHistory
-from ..auth import get_current_user
+import base64
+from ..database import get_async_read_db, read_router
+from ..db_models import GameHistory
+from ..models import GameStatus
+from ..auth import AuthenticatedUser, get_current_user
+from ..services.history_writer import history_writer, HistoryQueueFull
+from ..services.leaderboard import player_outcome
+from ..services.room_router import room_router, forward_request
+from ..services.room_store import room_store, RoomLockTimeout
 
 router = APIRouter(prefix="/history", tags=["history"])
 
+MAX_PAGE_SIZE = 100
+
+class GameSummaryResponse(BaseModel):
+    id: int
+    room_code: str
+    played_at: datetime
+    teams: list
+    winner: str
+    final_scores: dict
+    guessed_words_count: int
+
+class GameHistoryPage(BaseModel):
+    games: List[GameSummaryResponse]
+    next_cursor: Optional[str] = None
+
 class GameHistoryResponse(BaseModel):
     id: int
     room_code: str
@@ -21,20 +43,68 @@ class GameHistoryResponse(BaseModel):
     final_scores: dict
     guessed_words: list
 
-@router.get("/my-games", response_model=List[GameHistoryResponse])
-def get_my_games(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-    limit: int = 50
+def encode_cursor(played_at: datetime, game_id: int) -> str:
+    """Opaque keyset cursor: position of the last game on the page"""
+    return base64.urlsafe_b64encode(f"{played_at.isoformat()}|{game_id}".encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        played_at, game_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(played_at), int(game_id)
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+@router.get("/my-games", response_model=GameHistoryPage)
+async def get_my_games(
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    """
+    Get one page of game summaries for current user, newest first.
+    Uses the (user_id, played_at, id) index; pass next_cursor to get the next page.
+    Guessed words are fetched per game from /history/games/{game_id}.
+    """
+    query = (
+        select(
+            GameHistory.id,
+            GameHistory.room_code,
+            GameHistory.played_at,
+            GameHistory.teams,
+            GameHistory.winner,
+            GameHistory.final_scores,
+            GameHistory.guessed_words_count,
+        )
+        .where(GameHistory.user_id == current_user.id)
+        .order_by(GameHistory.played_at.desc(), GameHistory.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        query = query.where(tuple_(GameHistory.played_at, GameHistory.id) < tuple_(*decode_cursor(cursor)))
+    
+    rows = (await db.execute(query)).mappings().all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["played_at"], rows[-1]["id"])
+    
+    return {"games": [dict(row) for row in rows], "next_cursor": next_cursor}
+
+@router.get("/games/{game_id}", response_model=GameHistoryResponse)
+async def get_game(
+    game_id: int,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """Get game history for current user"""
-    games = db.query(GameHistory)\
-        .filter(GameHistory.user_id == current_user.id)\
-        .order_by(GameHistory.played_at.desc())\
-        .limit(limit)\
-        .all()
+    """Get one game of current user including guessed words"""
+    game = (await db.execute(
+        select(GameHistory).where(GameHistory.id == game_id, GameHistory.user_id == current_user.id)
+    )).scalar_one_or_none()
+    if game is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Game not found")
     
-    return [{
+    return {
         "id": game.id,
         "room_code": game.room_code,
         "played_at": game.played_at,
@@ -42,31 +112,95 @@ def get_my_games(
         "winner": game.winner,
         "final_scores": game.final_scores,
         "guessed_words": game.guessed_words
-    } for game in games]
+    }
 
 class SaveGameRequest(BaseModel):
     room_code: str
-    winner: str
-    final_scores: dict
-    teams: list
     guessed_words: list = []
 
+def room_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Room is busy, retry later",
+        headers={"Retry-After": "1"},
+    )
+
+async def credit_user(room_code: str, user: AuthenticatedUser) -> dict:
+    """
+    Mark the user's result of a finished game as saved and return the game_history
+    fields taken from the server's room. Each account is credited once per game; a
+    user not found in the teams by username gets score 0, as before.
+    """
+    try:
+        async with room_store.lock(room_code):
+            room = await room_store.get(room_code)
+            if room is None or room.status != GameStatus.FINISHED:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No finished game in this room")
+            if user.id in room.credited_users:
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Game already saved")
+            room.credited_users.append(user.id)
+            await room_store.save(room)
+    except RoomLockTimeout:
+        raise room_busy()
+    teams = [t.to_dict() for t in room.teams]
+    score, won = player_outcome(teams, room.winner, user.username)
+    return {
+        "teams": teams,
+        "winner": room.winner,
+        "final_scores": {t.name: t.score for t in room.teams},
+        "score": score,
+        "won": won,
+    }
+
+async def uncredit_user(room_code: str, user_id: int):
+    """The history write failed: let the user save the game again"""
+    try:
+        async with room_store.lock(room_code):
+            room = await room_store.get(room_code)
+            if room is not None and user_id in room.credited_users:
+                room.credited_users.remove(user_id)
+                await room_store.save(room)
+    except RoomLockTimeout:
+        pass
+
 @router.post("/save-game")
-def save_game(
+async def save_game(
     request: SaveGameRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    http_request: Request,
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
-    """Save game to history (called from game-end)"""
-    game_history = GameHistory(
-        user_id=current_user.id,
-        room_code=request.room_code,
-        teams=request.teams,
-        winner=request.winner,
-        final_scores=request.final_scores,
-        guessed_words=request.guessed_words
-    )
-    db.add(game_history)
-    db.commit()
+    """
+    Save a finished game to history (called from game-end). Teams, scores and the
+    winner come from the room on the server, so history and the leaderboard only hold
+    results the server saw. The room must still be live and finished: once it is
+    evicted (ROOM_FINISHED_TTL) or lost with a worker's in-memory store, the save
+    returns 404. Rows are written in batches.
+    """
+    if not room_router.is_local(request.room_code):
+        return await forward_request(http_request, request.room_code)
+    
+    result = await credit_user(request.room_code, current_user)
+    try:
+        game_id = await history_writer.submit({
+            "user_id": current_user.id,
+            "room_code": request.room_code,
+            "played_at": datetime.utcnow(),
+            "guessed_words": request.guessed_words,
+            "guessed_words_count": len(request.guessed_words),
+            **result,
+        })
+    except HistoryQueueFull:
+        await uncredit_user(request.room_code, current_user.id)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="History is busy, retry later",
+            headers={"Retry-After": "1"},
+        )
+    except Exception:
+        await uncredit_user(request.room_code, current_user.id)
+        raise
+    
+    # Read-your-writes: the new game must show up in this user's next history read
+    read_router.pin_user(current_user.id)
     
-    return {"status": "saved", "game_id": game_history.id}
+    return {"status": "saved", "game_id": game_id}
@@ -1,12 +1,30 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_read_db
+from ..services.leaderboard import PERIODS, leaderboard_cache, top
 
 router = APIRouter()
 
 
 @router.get("")
-async def get_leaderboard(period: str = "all", limit: int = 50):
-    """Get leaderboard (placeholder)"""
-    return {
+async def get_leaderboard(
+    period: str = "all",
+    limit: int = Query(50, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get top players for all-time, this week or today (UTC), read from rollups"""
+    if period not in PERIODS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"period must be one of: {', '.join(PERIODS)}"
+        )
+    cached = leaderboard_cache.get((period, limit))
+    if cached is not None:
+        return cached
+
+    response = {
         "period": period,
-        "leaders": []
+        "leaders": await top(db, period, limit)
     }
+    leaderboard_cache.put((period, limit), response)
+    return response
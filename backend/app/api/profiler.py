@@ -0,0 +1,37 @@
+"""
+On-demand profiling of the worker that serves the request (operators only: X-Cluster-Secret)
+
+    curl -H "X-Cluster-Secret: $CLUSTER_SECRET" "localhost:8050/internal/profile?seconds=10" > out.txt
+    curl ... "localhost:8050/internal/profile?seconds=10&format=speedscope" > out.speedscope.json
+"""
+import os
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+from ..services.profiler import sampling_profiler, ProfilerBusy, PROFILER_INTERVAL, PROFILER_MAX_SECONDS
+from .cluster import require_cluster_secret
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["internal"],
+    dependencies=[Depends(require_cluster_secret)],
+)
+
+
+@router.get("/profile")
+async def profile_worker(
+    seconds: float = Query(10, gt=0, le=PROFILER_MAX_SECONDS),
+    format: str = Query("collapsed", pattern="^(collapsed|speedscope)$"),
+    interval_ms: float = Query(PROFILER_INTERVAL * 1000, ge=1, le=1000),
+    all_threads: bool = False,
+):
+    """Sample the event-loop thread (or all threads) for `seconds` and return the stacks"""
+    try:
+        profile = await sampling_profiler.profile(seconds, interval_ms / 1000, all_threads)
+    except ProfilerBusy:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A profile is already running")
+    headers = {"X-Worker-Pid": str(os.getpid()), "X-Profile-Samples": str(profile.samples)}
+    if format == "speedscope":
+        filename = f"worker-{os.getpid()}.speedscope.json"
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return JSONResponse(profile.speedscope(), headers=headers)
+    return PlainTextResponse(profile.collapsed(), headers=headers)
@@ -1,10 +1,11 @@
 """
 Room access control: decrypt links, verify passwords
 """
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
 from pydantic import BaseModel
 from ..room_crypto import decrypt_room_link
-from ..api.rooms import active_rooms
+from ..services.room_store import room_store
+from ..services.room_router import room_router, forward_request
 
 router = APIRouter(prefix="/room-access", tags=["room-access"])
 
@@ -16,7 +17,7 @@ class VerifyPasswordRequest(BaseModel):
     password: str
 
 @router.post("/decrypt")
-def decrypt_link(request: DecryptLinkRequest):
+async def decrypt_link(request: DecryptLinkRequest, http_request: Request):
     """Decrypt room link to get room code"""
     room_code = decrypt_room_link(request.encrypted_link)
     if room_code is None:
@@ -25,14 +26,17 @@ def decrypt_link(request: DecryptLinkRequest):
             detail="Invalid room link"
         )
     
+    if not room_router.is_local(room_code):
+        return await forward_request(http_request, room_code)
+    
     # Check if room exists
-    if room_code not in active_rooms:
+    room = await room_store.get(room_code)
+    if room is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Room not found or expired"
         )
     
-    room = active_rooms[room_code]
     has_password = bool(room.settings.room_password)
     
     return {
@@ -41,15 +45,18 @@ def decrypt_link(request: DecryptLinkRequest):
     }
 
 @router.post("/verify-password")
-def verify_password(request: VerifyPasswordRequest):
+async def verify_password(request: VerifyPasswordRequest, http_request: Request):
     """Verify room password"""
-    if request.room_code not in active_rooms:
+    if not room_router.is_local(request.room_code):
+        return await forward_request(http_request, request.room_code)
+    
+    room = await room_store.get(request.room_code)
+    if room is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Room not found"
         )
     
-    room = active_rooms[request.room_code]
     
     # Check if room has password
     if not room.settings.room_password:
@@ -1,8 +1,13 @@
-from fastapi import APIRouter, HTTPException
-from app.models import GameRoom, GameMode, GameStatus, GameSettings, Team, Difficulty
-from app.websocket import active_rooms
+from fastapi import APIRouter, Depends, HTTPException, Request
+from app.models import GameMode, GameStatus, GameSettings, Difficulty
+from app.room_state import RoomState, SettingsState, TeamState
+from app.services.room_store import room_store
+from app.services.room_router import room_router, forward_request
+from app.services.room_lifecycle import room_lifecycle
+from app.services.room_codes import room_code_allocator, RoomCodesExhausted
+from app.services.loop_monitor import loop_monitor
+from app.api.cluster import require_cluster_secret
 import random
-import string
 import uuid
 
 router = APIRouter()
@@ -46,12 +51,32 @@ def generate_meme_team_name() -> str:
     return f"Team {random.randint(1, 9999)}"
 
 
-def generate_room_code() -> str:
-    """Generate unique 4-letter room code"""
-    while True:
-        code = ''.join(random.choices(string.ascii_uppercase, k=4))
-        if code not in active_rooms:
-            return code
+async def release_team_names(room: RoomState):
+    """Eviction hook: make team names of an evicted room available again"""
+    for team in room.teams:
+        used_team_names.discard(team.name)
+
+
+async def release_room_code(room: RoomState):
+    """Eviction hook: return the room code to the allocator free set"""
+    await room_code_allocator.release(room.room_code)
+
+
+room_lifecycle.add_eviction_hook(release_team_names)
+room_lifecycle.add_eviction_hook(release_room_code)
+
+
+async def accept_room_code(code: str) -> bool:
+    """Code must be owned by this node and not taken by a restored room"""
+    return room_router.is_local(code) and not await room_store.exists(code)
+
+
+async def generate_room_code() -> str:
+    """Allocate unique room code owned by this node"""
+    try:
+        return await room_code_allocator.allocate(accept_room_code)
+    except RoomCodesExhausted:
+        raise HTTPException(status_code=503, detail="No free room codes, try again later")
 
 
 @router.post("/create")
@@ -63,13 +88,17 @@ async def create_room(
     difficulty: Difficulty = Difficulty.MEDIUM,
     language: str = "en",
     score_to_win: int = 30,
+    rounds_total: int = 5,  # 0: no round limit, the game only ends on score_to_win
     team_count: int = 2,
     show_translations: bool = True,
     solo_device: bool = False,
     room_password: str = ""
 ):
     """Create new game room with custom settings"""
-    room_code = generate_room_code()
+    if not loop_monitor.admit("room_create"):
+        raise HTTPException(status_code=503, detail="Server is busy, try again later",
+                            headers={"Retry-After": "1"})
+    room_code = await generate_room_code()
     
     # Validate team_count
     if team_count < 2 or team_count > 4:
@@ -78,7 +107,7 @@ async def create_room(
     settings = GameSettings(
         timed_mode=timed_mode,
         round_time=round_time,
-        rounds_total=5,
+        rounds_total=rounds_total,
         difficulty=difficulty,
         language=language,
         word_pack="general",
@@ -91,22 +120,23 @@ async def create_room(
     
     # Generate teams dynamically based on team_count
     teams = [
-        Team(id=i+1, name=generate_meme_team_name(), players=[], score=0)
+        TeamState(id=i+1, name=generate_meme_team_name(), players=[], score=0)
         for i in range(team_count)
     ]
     
-    room = GameRoom(
+    # Settings are validated by pydantic above; the live room keeps slotted state
+    room = RoomState(
         id=uuid.uuid4(),
         room_code=room_code,
         mode=mode,
         status=GameStatus.LOBBY,
         teams=teams,
         current_team_index=0,
-        settings=settings,
+        settings=SettingsState(**settings.model_dump()),
         host_id=host_id
     )
     
-    active_rooms[room_code] = room
+    await room_store.save(room)
     
     # Generate encrypted link
     from ..room_crypto import encrypt_room_link
@@ -121,13 +151,25 @@ async def create_room(
     }
 
 
+@router.get("/stats", dependencies=[Depends(require_cluster_secret)])
+async def get_room_stats():
+    """Room counts per status, eviction counters and room code space utilization (operators only)"""
+    return {
+        **room_lifecycle.stats(),
+        "room_codes": await room_code_allocator.stats(),
+    }
+
+
 @router.get("/{room_code}")
-async def get_room(room_code: str):
+async def get_room(room_code: str, request: Request):
     """Get room info"""
-    if room_code not in active_rooms:
+    if not room_router.is_local(room_code):
+        return await forward_request(request, room_code)
+    
+    room = await room_store.get(room_code)
+    if room is None:
         raise HTTPException(status_code=404, detail="Room not found")
     
-    room = active_rooms[room_code]
     return {
         "room_code": room.room_code,
         "mode": room.mode.value if hasattr(room.mode, 'value') else room.mode,
@@ -142,14 +184,17 @@ async def get_room(room_code: str):
             for team in room.teams
         ],
         "current_round": room.current_round,
-        "settings": room.settings.dict()
+        "settings": room.settings.to_dict()
     }
 
 
 @router.post("/{room_code}/join")
-async def join_room(room_code: str, user_id: str, username: str):
+async def join_room(room_code: str, user_id: str, username: str, request: Request):
     """Join existing room"""
-    if room_code not in active_rooms:
+    if not room_router.is_local(room_code):
+        return await forward_request(request, room_code)
+    
+    if not await room_store.exists(room_code):
         raise HTTPException(status_code=404, detail="Room not found")
     
     return {"status": "success", "room_code": room_code}
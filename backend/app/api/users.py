@@ -1,23 +1,52 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_read_db, read_user_id
+from ..db_models import GameHistory, User, UserStats
+from ..services.user_stats import to_response
+from .history import GameSummaryResponse, MAX_PAGE_SIZE
 
 router = APIRouter()
 
 
+async def ensure_user_exists(db: AsyncSession, user_id: int):
+    if await db.get(User, user_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+
 @router.get("/{user_id}/stats")
-async def get_user_stats(user_id: str):
-    """Get user statistics (placeholder)"""
-    return {
-        "user_id": user_id,
-        "total_score": 0,
-        "games_played": 0,
-        "wins": 0,
-        "avg_words_per_game": 0.0
-    }
+async def get_user_stats(user_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    """Get user statistics (one user_stats row, maintained as games are saved)"""
+    read_user_id.set(user_id)
+    stats = await db.get(UserStats, user_id)
+    if stats is None:
+        await ensure_user_exists(db, user_id)
+    return to_response(user_id, stats)
 
 
 @router.get("/{user_id}/history")
-async def get_user_history(user_id: str, limit: int = 10):
-    """Get user game history (placeholder)"""
+async def get_user_history(
+    user_id: int,
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get user's most recent game summaries"""
+    read_user_id.set(user_id)
+    await ensure_user_exists(db, user_id)
+    result = await db.execute(
+        select(
+            GameHistory.id,
+            GameHistory.room_code,
+            GameHistory.played_at,
+            GameHistory.teams,
+            GameHistory.winner,
+            GameHistory.final_scores,
+            GameHistory.guessed_words_count,
+        )
+        .where(GameHistory.user_id == user_id)
+        .order_by(GameHistory.played_at.desc(), GameHistory.id.desc())
+        .limit(limit)
+    )
     return {
-        "games": []
+        "games": [GameSummaryResponse(**row) for row in result.mappings().all()]
     }
@@ -0,0 +1,34 @@
+"""
+Word analytics API: aggregates over word_guesses, computed in the database
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_read_db
+from ..models import GameMode
+from ..services.word_stats import word_stats, tier_stats
+
+router = APIRouter(prefix="/words", tags=["words"])
+
+@router.get("/stats")
+async def get_word_stats(
+    mode: GameMode = GameMode.ALIAS,
+    order: str = Query("skipped", pattern="^(skipped|hardest|easiest)$"),
+    limit: int = Query(50, ge=1, le=500),
+    min_samples: int = Query(5, ge=1),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Most skipped, hardest or easiest words by guess rate"""
+    return {
+        "mode": mode.value,
+        "order": order,
+        "words": await word_stats(db, mode.value, order, limit, min_samples)
+    }
+
+@router.get("/tiers")
+async def get_tier_stats(
+    mode: Optional[GameMode] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Guess rate per difficulty tier"""
+    return {"tiers": await tier_stats(db, mode.value if mode else None)}
@@ -1,33 +1,47 @@
 """
 Authentication utilities: password hashing, JWT tokens
 """
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from .database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from .database import get_async_db, read_user_id
 from .db_models import User
-import hashlib
+from .services.password_hasher import password_hasher
+from .log import get_logger
 
 # Security
 SECRET_KEY = "aliby-secret-key-change-in-production-2024"  # TODO: Move to env
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
+# Verified-token cache (per worker)
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "300"))  # seconds
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+
+log = get_logger(__name__)
+
 security = HTTPBearer(auto_error=True)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify password against hash"""
-    # Use SHA256 for password hashing (simple and fast for MVP)
-    password_hash = hashlib.sha256(plain_password.encode()).hexdigest()
-    return password_hash == hashed_password
+async def verify_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify password against hash (bcrypt, or legacy SHA-256) in the hashing pool.
+    Returns (valid, upgraded hash or None); store the upgraded hash when returned.
+    Raises PasswordHasherBusy when the pool is saturated.
+    """
+    return await password_hasher.verify(plain_password, hashed_password)
 
-def get_password_hash(password: str) -> str:
-    """Hash a password"""
-    # Use SHA256 for password hashing (simple and fast for MVP)
-    return hashlib.sha256(password.encode()).hexdigest()
+async def get_password_hash(password: str) -> str:
+    """Hash a password with bcrypt in the hashing pool"""
+    return await password_hasher.hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
@@ -40,15 +54,74 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_current_user(
+@dataclass(frozen=True, slots=True)
+class AuthenticatedUser:
+    """Verified principal resolved from a token; safe to share between requests"""
+    id: int
+    username: str
+    email: str
+
+
+class PrincipalCache:
+    """
+    Bounded LRU of verified principals keyed by SHA-256 of the token. An entry lives
+    until AUTH_CACHE_TTL or the token's own expiry, whichever is first. Hits skip both
+    the signature check and the user lookup. Code that changes a user row calls
+    invalidate_user() (or invalidate_token() for one token). Invalidation is per worker:
+    other workers keep their entry for at most AUTH_CACHE_TTL.
+    """
+
+    def __init__(self, max_entries: int = AUTH_CACHE_MAX_ENTRIES, ttl: float = AUTH_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: "OrderedDict[bytes, Tuple[float, AuthenticatedUser]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[AuthenticatedUser]:
+        key = self.key(token)
+        entry = self.entries.get(key)
+        if entry is None or entry[0] <= time.time():
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, token: str, user: AuthenticatedUser, token_expires_at: float):
+        if self.max_entries <= 0:
+            return
+        self.entries[self.key(token)] = (min(time.time() + self.ttl, token_expires_at), user)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate_token(self, token: str):
+        self.entries.pop(self.key(token), None)
+
+    def invalidate_user(self, user_id: int):
+        for key in [k for k, (_, user) in self.entries.items() if user.id == user_id]:
+            del self.entries[key]
+
+    def stats(self) -> dict:
+        return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+
+# Global instance
+principal_cache = PrincipalCache()
+
+
+async def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user from JWT token"""
-    print(f"[AUTH] get_current_user called, credentials: {credentials}")
-    
+    db: AsyncSession = Depends(get_async_db)
+) -> AuthenticatedUser:
+    """Get current authenticated user from JWT token (cached per token)"""
     if credentials is None:
-        print("[AUTH] No credentials provided")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated",
@@ -56,7 +129,10 @@ def get_current_user(
         )
     
     token = credentials.credentials
-    print(f"[AUTH] Token received: {token[:30]}...")
+    cached = principal_cache.get(token)
+    if cached is not None:
+        read_user_id.set(cached.id)
+        return cached
     
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -65,32 +141,34 @@ def get_current_user(
     )
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        print(f"[AUTH] Payload: {payload}")
         user_id_str: str = payload.get("sub")
         if user_id_str is None:
-            print("[AUTH] No user_id in payload")
+            log.debug("token_rejected", reason="no_subject")
             raise credentials_exception
         user_id = int(user_id_str)  # Convert string to int for DB query
-        print(f"[AUTH] Looking for user_id: {user_id}")
-    except JWTError as e:
-        print(f"[AUTH] JWT Error: {e}")
+    except (JWTError, ValueError) as e:
+        log.debug("token_rejected", reason=str(e))
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = (await db.execute(select(User).where(User.id == user_id))).scalar_one_or_none()
     if user is None:
-        print(f"[AUTH] User not found in DB: {user_id}")
+        log.info("token_rejected", reason="unknown_user", user_id=user_id)
         raise credentials_exception
-    print(f"[AUTH] User authenticated: {user.username}")
-    return user
+    
+    principal = AuthenticatedUser(id=user.id, username=user.username, email=user.email)
+    principal_cache.put(token, principal, float(payload.get("exp", 0)))
+    read_user_id.set(principal.id)
+    log.debug("authenticated", user_id=user.id)
+    return principal
 
-def get_current_user_optional(
+async def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
-    db: Session = Depends(get_db)
-) -> Optional[User]:
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[AuthenticatedUser]:
     """Get current user if authenticated, otherwise None (for optional auth)"""
     if credentials is None:
         return None
     try:
-        return get_current_user(credentials, db)
+        return await get_current_user(credentials, db)
     except HTTPException:
         return None
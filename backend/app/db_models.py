@@ -1,7 +1,7 @@
 """
 SQLAlchemy database models for users and game history
 """
-from sqlalchemy import Column, Integer, String, DateTime, JSON, Boolean, ForeignKey, Text
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Date, Float, JSON, Boolean, ForeignKey, Text, Index, UniqueConstraint, false
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .database import Base
@@ -31,6 +31,77 @@ class GameHistory(Base):
     winner = Column(String(100), nullable=False)
     final_scores = Column(JSON, nullable=False)  # {"Team1": 10, "Team2": 8}
     guessed_words = Column(JSON, nullable=False)  # [{"word": "house", "team": "Team1", "translation": "дом", "used_translation": true}]
+    guessed_words_count = Column(Integer, nullable=False, default=0, server_default="0")  # For list views without loading guessed_words
+    score = Column(Float, nullable=False, default=0, server_default="0")  # Score of the user's team
+    won = Column(Boolean, nullable=False, default=False, server_default=false())  # User's team is the winner
     
     # Relationship
     user = relationship("User", back_populates="games")
+    
+    __table_args__ = (
+        # Keyset pagination of a user's games: WHERE user_id = ? AND (played_at, id) < (?, ?) ORDER BY played_at DESC, id DESC
+        Index("ix_game_history_user_played_at", "user_id", "played_at", "id"),
+    )
+
+class LeaderboardRollup(Base):
+    """Per-user totals for one leaderboard window, updated as games are saved"""
+    __tablename__ = "leaderboard_rollups"
+    
+    period = Column(String(8), primary_key=True)  # "all", "week", "day"
+    period_start = Column(Date, primary_key=True)  # Window start (UTC); 1970-01-01 for "all"
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    score = Column(Float, nullable=False, default=0)
+    games_played = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        # Top-N read: WHERE period = ? AND period_start = ? ORDER BY score DESC, user_id DESC LIMIT N
+        Index("ix_leaderboard_rollups_rank", "period", "period_start", "score", "user_id"),
+    )
+
+class UserStats(Base):
+    """Per-user totals, updated in the history writer's batch transaction"""
+    __tablename__ = "user_stats"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    total_score = Column(Float, nullable=False, default=0)
+    games_played = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+    words_guessed = Column(Integer, nullable=False, default=0)  # avg_words_per_game = words_guessed / games_played
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class PackWord(Base):
+    """Word pack entry with a stable id (hash of mode and word, see services.word_stats.word_id)"""
+    __tablename__ = "pack_words"
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=False)
+    mode = Column(String(8), nullable=False)  # "alias" or "taboo"
+    word = Column(String(100), nullable=False)
+    tier = Column(String(8), nullable=False)  # Tier the word was first seen in
+    # Written by the offline retier job
+    guess_rate = Column(Float, nullable=True)
+    samples = Column(Integer, nullable=False, default=0)
+    suggested_tier = Column(String(8), nullable=True)
+    
+    __table_args__ = (
+        UniqueConstraint("mode", "word", name="uq_pack_words_mode_word"),
+    )
+
+class WordGuess(Base):
+    """One word shown during a game and what happened to it"""
+    __tablename__ = "word_guesses"
+    
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    word_id = Column(BigInteger, ForeignKey("pack_words.id"), nullable=False)
+    room_code = Column(String(10), nullable=False)
+    played_at = Column(DateTime, nullable=False)
+    tier = Column(String(8), nullable=False)  # Tier at the time it was played
+    outcome = Column(String(8), nullable=False)  # "guessed", "skipped", "removed"
+    used_translation = Column(Boolean, nullable=False, default=False)
+    
+    __table_args__ = (
+        # Per-word aggregates: GROUP BY word_id, outcome
+        Index("ix_word_guesses_word_outcome", "word_id", "outcome"),
+        # Per-tier guess rates: GROUP BY tier, outcome
+        Index("ix_word_guesses_tier_outcome", "tier", "outcome"),
+    )
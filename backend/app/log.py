@@ -0,0 +1,166 @@
+"""
+Structured logging that keeps I/O off the event loop.
+
+Records go through a QueueHandler into a SimpleQueue; a QueueListener thread formats
+them (JSON lines or text) and writes to stdout. Uvicorn's own loggers, including the
+per-request access log, are routed through the same queue.
+
+    log = get_logger(__name__)
+    log.info("round_end", room=room_code, team=team.name)
+
+A disabled level costs one cached isEnabledFor() check. Noisy events can be sampled
+by name: LOG_SAMPLE="ws_connect=0.01" keeps every 100th ws_connect line and tags
+it with sample_every=100. Per-module levels: LOG_LEVELS="app.websocket=WARNING".
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")  # "logger=LEVEL,..."
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # "json" or "text"
+LOG_SAMPLE = os.getenv("LOG_SAMPLE", "")  # "event=rate,..." with 0 < rate <= 1
+
+UVICORN_LOGGERS = ("uvicorn", "uvicorn.access")
+
+
+def parse_pairs(spec: str) -> Dict[str, str]:
+    pairs = {}
+    for item in spec.split(","):
+        name, sep, value = item.strip().partition("=")
+        if sep and name:
+            pairs[name.strip()] = value.strip()
+    return pairs
+
+
+# {event: keep every Nth}
+sample_every: Dict[str, int] = {
+    event: max(1, round(1 / float(rate))) for event, rate in parse_pairs(LOG_SAMPLE).items() if float(rate) > 0
+}
+sample_counts: Dict[str, int] = {}
+
+
+class StructLogger:
+    """Logger taking an event name and keyword fields"""
+    __slots__ = ("logger",)
+
+    def __init__(self, name: str):
+        self.logger = logging.getLogger(name)
+
+    def log(self, level: int, event: str, fields: dict, exc_info=None):
+        if not self.logger.isEnabledFor(level):
+            return
+        every = sample_every.get(event)
+        if every:
+            count = sample_counts.get(event, 0)
+            sample_counts[event] = count + 1
+            if count % every:
+                return
+            fields["sample_every"] = every
+        self.logger.log(level, event, extra={"fields": fields}, exc_info=exc_info)
+
+    def debug(self, event: str, **fields):
+        self.log(logging.DEBUG, event, fields)
+
+    def info(self, event: str, **fields):
+        self.log(logging.INFO, event, fields)
+
+    def warning(self, event: str, **fields):
+        self.log(logging.WARNING, event, fields)
+
+    def error(self, event: str, **fields):
+        self.log(logging.ERROR, event, fields)
+
+    def exception(self, event: str, **fields):
+        self.log(logging.ERROR, event, fields, exc_info=True)
+
+
+def get_logger(name: str) -> StructLogger:
+    return StructLogger(name)
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "event": record.msg,
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        fields = getattr(record, "fields", None) or {}
+        line = f"{self.formatTime(record)} {record.levelname} {record.name} {record.msg}"
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_text:
+            line += "\n" + record.exc_text
+        return line
+
+
+class EventQueueHandler(QueueHandler):
+    """Only merges args and renders tracebacks on the caller's thread; formatting happens in the listener"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+queue_handler: Optional[EventQueueHandler] = None
+listener: Optional[QueueListener] = None
+output_handler: Optional[logging.Handler] = None
+
+
+def start_listener():
+    global listener
+    log_queue = queue.SimpleQueue()
+    queue_handler.queue = log_queue
+    listener = QueueListener(log_queue, output_handler)
+    listener.start()
+
+
+def stop_listener():
+    """Write out queued records (called at exit)"""
+    if listener is not None and listener._thread is not None:
+        listener.stop()
+
+
+def setup_logging():
+    """Route all logging through the queue; safe to call more than once"""
+    global queue_handler, output_handler
+    if queue_handler is not None:
+        return
+    output_handler = logging.StreamHandler(sys.stdout)
+    output_handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else TextFormatter())
+    queue_handler = EventQueueHandler(queue.SimpleQueue())
+    start_listener()
+    atexit.register(stop_listener)
+    # Forked workers (app.serve) don't inherit the listener thread: start a fresh one
+    os.register_at_fork(after_in_child=start_listener)
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(LOG_LEVEL)
+    for name in UVICORN_LOGGERS:
+        logger = logging.getLogger(name)
+        logger.handlers = [queue_handler]
+        logger.propagate = False
+    for name, level in parse_pairs(LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level.upper())
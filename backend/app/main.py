@@ -1,20 +1,43 @@
-from fastapi import FastAPI, Request
+import asyncio
+import os
+import time
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy import text
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-from app.websocket import router as ws_router
-from app.api import auth, rooms, users, leaderboard, history, room_access
-from app.database import engine, Base
+from app.websocket import router as ws_router, manager, resume_round_timer
+from app.api import auth, rooms, users, leaderboard, history, room_access, cluster, words, profiler
+from app.api.cluster import require_cluster_secret
+from app.database import async_engine, pool_stats, read_router
+from app.services.broadcast_bus import broadcast_bus
+from app.services.room_lifecycle import room_lifecycle
+from app.services.room_store import room_store
+from app.services.room_journal import JournaledRoomStore
+from app.services.history_writer import history_writer
+from app.services.leaderboard import rollup_pruner
+from app.services.loop_monitor import loop_monitor
+from app.services.password_hasher import password_hasher
+from app.services.word_stats import word_guess_recorder
+from app.services.word_service import word_service
+from app.log import setup_logging, get_logger
+from app import metrics
+from app.tracing import tracer
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# Structured logging through a background queue (LOG_LEVEL, LOG_LEVELS, LOG_FORMAT, LOG_SAMPLE)
+setup_logging()
+log = get_logger(__name__)
+
+# Schema is managed by Alembic migrations: run `python -m app.migrate` before starting workers
 
 # Rate limiter (40 requests per minute)
 limiter = Limiter(key_func=get_remote_address, default_limits=["40/minute"])
 
 app = FastAPI(title="Alias/Taboo API")
 app.state.limiter = limiter
+app.state.ready = False  # Flipped by warm_up(); /ready reports it
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 # CORS - allow all origins for development (nginx proxies from different ports/IPs)
@@ -31,14 +54,183 @@ app.include_router(ws_router)
 app.include_router(auth.router)
 app.include_router(history.router)
 app.include_router(room_access.router)
+app.include_router(cluster.router)
+app.include_router(words.router)
+app.include_router(profiler.router)
 app.include_router(rooms.router, prefix="/rooms", tags=["rooms"])
 app.include_router(users.router, prefix="/users", tags=["users"])
 app.include_router(leaderboard.router, prefix="/leaderboard", tags=["leaderboard"])
 
+@app.on_event("startup")
+async def restore_rooms():
+    # Rebuild rooms from the local journal and restart timers from their deadlines
+    if isinstance(room_store, JournaledRoomStore):
+        for room in await room_store.recover():
+            resume_round_timer(room)
+        room_store.start()
+
+
+@app.on_event("startup")
+async def start_loop_monitor():
+    # Samples event-loop lag; new rooms and sockets are refused while it stays high
+    loop_monitor.start()
+
+
+@app.on_event("startup")
+async def start_metrics_server():
+    # Per-worker scrape port (METRICS_PORT + slot); the prefork master sets WORKER_SLOT
+    await metrics.metrics_server.start(int(os.getenv("WORKER_SLOT", "0")))
+
+
+@app.on_event("startup")
+async def start_tracer():
+    tracer.start()
+
+
+@app.on_event("startup")
+async def start_history_writer():
+    history_writer.start()
+
+
+@app.on_event("startup")
+async def start_rollup_pruner():
+    # Deletes day and week leaderboard rollups past retention
+    rollup_pruner.start()
+
+
+@app.on_event("startup")
+async def start_read_router():
+    # Probes replica lag; reads fall back to the primary while it is unknown or too high
+    read_router.start()
+
+
+@app.on_event("startup")
+async def start_password_hasher():
+    password_hasher.start()
+
+
+@app.on_event("startup")
+async def start_broadcast_bus():
+    # One bus subscription per worker delivers other workers' room events locally
+    await broadcast_bus.start(manager.send_local)
+
+
+@app.on_event("startup")
+async def start_room_lifecycle():
+    room_lifecycle.start()
+
+
+WARMUP_RETRY_INTERVAL = 1.0  # seconds
+
+
+async def warm_up():
+    """Load word packs and open a database connection, then report ready"""
+    started = time.perf_counter()
+    await asyncio.to_thread(word_service.load)
+    while True:
+        try:
+            async with async_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            break
+        except Exception as e:
+            log.warning("db_unreachable", error=str(e))
+            await asyncio.sleep(WARMUP_RETRY_INTERVAL)
+    app.state.ready = True
+    log.info("ready", seconds=round(time.perf_counter() - started, 2))
+
+
+@app.on_event("startup")
+async def start_warm_up():
+    # Runs in the background: the worker accepts connections (and /health) right away
+    app.state.warm_up_task = asyncio.create_task(warm_up())
+
+
+@app.on_event("shutdown")
+async def mark_not_ready():
+    # Load balancers stop routing here before the services below shut down
+    app.state.ready = False
+
+
+@app.on_event("shutdown")
+async def stop_loop_monitor():
+    await loop_monitor.stop()
+
+
+@app.on_event("shutdown")
+async def stop_metrics_server():
+    await metrics.metrics_server.stop()
+
+
+@app.on_event("shutdown")
+async def stop_tracer():
+    # Export traces still buffered
+    await tracer.stop()
+
+
+@app.on_event("shutdown")
+async def stop_broadcast_bus():
+    await broadcast_bus.stop()
+
+
+@app.on_event("shutdown")
+async def stop_room_lifecycle():
+    await room_lifecycle.stop()
+
+
+@app.on_event("shutdown")
+async def drain_history_writer():
+    await history_writer.stop()
+
+
+@app.on_event("shutdown")
+async def stop_rollup_pruner():
+    await rollup_pruner.stop()
+
+
+@app.on_event("shutdown")
+async def stop_read_router():
+    await read_router.stop()
+
+
+@app.on_event("shutdown")
+async def flush_word_guesses():
+    await word_guess_recorder.stop()
+
+
+@app.on_event("shutdown")
+async def stop_password_hasher():
+    password_hasher.stop()
+
+
+@app.on_event("shutdown")
+async def flush_room_journal():
+    if isinstance(room_store, JournaledRoomStore):
+        await room_store.stop()
+
+
 @app.get("/")
 async def root():
     return {"message": "Alias/Taboo API", "status": "online"}
 
 @app.get("/health")
 async def health():
+    """Liveness: the process is up and serving (no dependency checks)"""
     return {"status": "healthy"}
+
+@app.get("/ready")
+async def ready():
+    """Readiness: warm-up finished and not shutting down"""
+    if not app.state.ready:
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    return {"status": "ready"}
+
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_cluster_secret)])
+async def prometheus_metrics():
+    """Metrics of whichever worker serves the request (operators only); Prometheus scrapes METRICS_PORT per worker"""
+    return PlainTextResponse(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/db/pool", dependencies=[Depends(require_cluster_secret)])
+async def db_pool():
+    """Connection pool usage and history writer queue (operators only: X-Cluster-Secret)"""
+    return {**pool_stats(), "history_writer": history_writer.stats()}
@@ -0,0 +1,193 @@
+"""
+Prometheus metrics in the text exposition format (GET /metrics).
+
+Every update happens on the worker's event loop thread, so counters and histograms are
+plain Python numbers in dicts and lists: no locks, one dict lookup and an add per event.
+Values that already exist elsewhere (open sockets, rooms by status) are read through
+callbacks at scrape time instead of being tracked on the hot path.
+
+Metrics are per worker: with WEB_CONCURRENCY > 1 each worker reports its own values
+under its pid in the `worker` label, and a scrape of the shared app port reaches one
+random worker. Set METRICS_PORT to have every worker also serve its metrics on its own
+port, METRICS_PORT + worker slot (0..WEB_CONCURRENCY-1), and scrape each of them.
+"""
+import asyncio
+import math
+import os
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4"  # charset is appended by the response
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # first per-worker scrape port (0 = off)
+METRICS_HOST = os.getenv("METRICS_HOST", "0.0.0.0")
+
+# Seconds: 0.5 ms .. 5 s
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+FANOUT_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+def escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    # pid is read at render time: forked workers share the master's import of this module
+    pairs = [f'worker="{os.getpid()}"']
+    pairs += [f'{name}="{escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}"
+
+
+def format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+
+    def samples(self) -> Iterable[Tuple[str, Tuple, float]]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{labels} {format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self.values: Dict[Tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        for key, value in sorted(self.values.items()):
+            yield "", format_labels(self.labels, key), value
+
+
+class GaugeFunc(Metric):
+    """Gauge read from a callback at scrape time: {label values: value} or a number"""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, fn: Callable, labels: Tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self.fn = fn
+
+    def samples(self):
+        result = self.fn()
+        if not isinstance(result, dict):
+            result = {(): result}
+        for key, value in sorted(result.items()):
+            key = key if isinstance(key, tuple) else (key,)
+            yield "", format_labels(self.labels, key), value
+
+
+class CounterFunc(GaugeFunc):
+    """Counter kept elsewhere (e.g. in a service's stats) and read at scrape time"""
+    kind = "counter"
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        # {labels: [per-bucket counts..., +Inf count, sum]}
+        self.values: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, *labels):
+        series = self.values.get(labels)
+        if series is None:
+            series = self.values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def samples(self):
+        for key, series in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), series):
+                cumulative += count
+                yield "_bucket", format_labels(self.labels, key, f'le="{format_value(float(bound))}"'), cumulative
+            yield "_sum", format_labels(self.labels, key), series[-1]
+            yield "_count", format_labels(self.labels, key), cumulative
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Minimal HTTP server on the worker's event loop: every request gets the registry"""
+
+    def __init__(self):
+        self.server = None
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 5)
+            body = registry.render().encode()
+            writer.write(
+                f"HTTP/1.1 200 OK\r\nContent-Type: {CONTENT_TYPE}; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, slot: int):
+        if METRICS_PORT and self.server is None:
+            self.server = await asyncio.start_server(self.handle, METRICS_HOST, METRICS_PORT + slot)
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+
+# Global instance
+registry = Registry()
+
+# Global instance
+metrics_server = MetricsServer()
+
+ws_messages_in = registry.register(Counter(
+    "aliby_ws_messages_received_total", "WebSocket messages received, by type", ("type",)))
+ws_messages_out = registry.register(Counter(
+    "aliby_ws_messages_sent_total", "WebSocket messages sent to sockets on this worker, by type", ("type",)))
+ws_handler_seconds = registry.register(Histogram(
+    "aliby_ws_handler_seconds", "Time to handle one WebSocket message, by type", ("type",)))
+broadcast_seconds = registry.register(Histogram(
+    "aliby_broadcast_seconds", "Time to publish a room event and send it to local sockets"))
+broadcast_fanout = registry.register(Histogram(
+    "aliby_broadcast_fanout", "Local sockets a room event was sent to", buckets=FANOUT_BUCKETS))
+timer_lateness_seconds = registry.register(Histogram(
+    "aliby_timer_lateness_seconds", "Delay of round timer ticks past their scheduled time"))
@@ -0,0 +1,35 @@
+"""
+Apply database migrations: python -m app.migrate
+
+Run once per deploy, before starting workers (the app itself no longer creates
+tables). Databases created by the old import-time create_all have tables but no
+alembic_version; they are stamped at the baseline revision and then upgraded,
+and revisions skip the tables, columns and indexes create_all already made.
+"""
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from app.database import engine
+
+BASELINE_REVISION = "0001_baseline"
+ALEMBIC_INI = Path(__file__).parent.parent / "alembic.ini"
+
+
+def alembic_config() -> Config:
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(Path(__file__).parent / "migrations"))
+    return config
+
+
+def main():
+    config = alembic_config()
+    tables = set(inspect(engine).get_table_names())
+    if "users" in tables and "alembic_version" not in tables:
+        print(f"[Migrate] Existing schema without migration history, stamping {BASELINE_REVISION}")
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, "head")
+
+
+if __name__ == "__main__":
+    main()
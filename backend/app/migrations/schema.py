@@ -0,0 +1,21 @@
+"""
+Schema checks for revisions
+
+Between the first schema changes and the introduction of migrations, the app
+created tables with Base.metadata.create_all, so a database stamped at the
+baseline may already contain some of the objects a later revision adds.
+"""
+import sqlalchemy as sa
+from alembic import op
+
+
+def has_table(table: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(table)
+
+
+def has_column(table: str, column: str) -> bool:
+    return column in {c["name"] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def has_index(table: str, index: str) -> bool:
+    return index in {i["name"] for i in sa.inspect(op.get_bind()).get_indexes(table)}
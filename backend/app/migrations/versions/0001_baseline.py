@@ -0,0 +1,48 @@
+"""Baseline: users and game_history as created by Base.metadata.create_all
+
+Databases created before migrations existed are stamped at this revision
+by app.migrate instead of running it.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("username", sa.String(50), nullable=False),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("hashed_password", sa.String(255), nullable=False),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "game_history",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("room_code", sa.String(10), nullable=False),
+        sa.Column("played_at", sa.DateTime()),
+        sa.Column("teams", sa.JSON(), nullable=False),
+        sa.Column("winner", sa.String(100), nullable=False),
+        sa.Column("final_scores", sa.JSON(), nullable=False),
+        sa.Column("guessed_words", sa.JSON(), nullable=False),
+    )
+    op.create_index("ix_game_history_id", "game_history", ["id"])
+
+
+def downgrade():
+    op.drop_table("game_history")
+    op.drop_table("users")
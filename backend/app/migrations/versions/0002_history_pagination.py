@@ -0,0 +1,40 @@
+"""game_history: guessed_words_count, per-user score/won and keyset pagination index
+
+Revision ID: 0002_history_pagination
+Revises: 0001_baseline
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.migrations.schema import has_column, has_index
+
+revision = "0002_history_pagination"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Skip objects that create_all already added to databases stamped at the baseline
+    count_missing = not has_column("game_history", "guessed_words_count")
+    with op.batch_alter_table("game_history") as batch:
+        if count_missing:
+            batch.add_column(sa.Column("guessed_words_count", sa.Integer(), nullable=False, server_default="0"))
+        if not has_column("game_history", "score"):
+            batch.add_column(sa.Column("score", sa.Float(), nullable=False, server_default="0"))
+            batch.add_column(sa.Column("won", sa.Boolean(), nullable=False, server_default=sa.false()))
+    if not has_index("game_history", "ix_game_history_user_played_at"):
+        op.create_index("ix_game_history_user_played_at", "game_history", ["user_id", "played_at", "id"])
+    # Fill guessed_words_count for existing rows; score/won come from
+    # python -m app.services.user_stats backfill (needs usernames matched in teams JSON)
+    # (json_array_length exists in both Postgres and SQLite)
+    if count_missing:
+        op.execute("UPDATE game_history SET guessed_words_count = json_array_length(guessed_words)")
+
+
+def downgrade():
+    op.drop_index("ix_game_history_user_played_at", table_name="game_history")
+    with op.batch_alter_table("game_history") as batch:
+        batch.drop_column("won")
+        batch.drop_column("score")
+        batch.drop_column("guessed_words_count")
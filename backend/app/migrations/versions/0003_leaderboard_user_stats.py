@@ -0,0 +1,47 @@
+"""leaderboard_rollups and user_stats aggregates
+
+Revision ID: 0003_leaderboard_user_stats
+Revises: 0002_history_pagination
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.migrations.schema import has_table
+
+revision = "0003_leaderboard_user_stats"
+down_revision = "0002_history_pagination"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Skip tables that create_all already added to databases stamped at the baseline
+    if not has_table("leaderboard_rollups"):
+        op.create_table(
+            "leaderboard_rollups",
+            sa.Column("period", sa.String(8), primary_key=True),
+            sa.Column("period_start", sa.Date(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+            sa.Column("score", sa.Float(), nullable=False),
+            sa.Column("games_played", sa.Integer(), nullable=False),
+            sa.Column("wins", sa.Integer(), nullable=False),
+        )
+        op.create_index(
+            "ix_leaderboard_rollups_rank", "leaderboard_rollups", ["period", "period_start", "score", "user_id"]
+        )
+
+    if not has_table("user_stats"):
+        op.create_table(
+            "user_stats",
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+            sa.Column("total_score", sa.Float(), nullable=False),
+            sa.Column("games_played", sa.Integer(), nullable=False),
+            sa.Column("wins", sa.Integer(), nullable=False),
+            sa.Column("words_guessed", sa.Integer(), nullable=False),
+            sa.Column("updated_at", sa.DateTime()),
+        )
+
+
+def downgrade():
+    op.drop_table("user_stats")
+    op.drop_table("leaderboard_rollups")
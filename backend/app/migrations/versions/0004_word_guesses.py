@@ -0,0 +1,49 @@
+"""pack_words and word_guesses for word-level analytics
+
+Revision ID: 0004_word_guesses
+Revises: 0003_leaderboard_user_stats
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.migrations.schema import has_table
+
+revision = "0004_word_guesses"
+down_revision = "0003_leaderboard_user_stats"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Skip tables that create_all already added to databases stamped at the baseline
+    if not has_table("pack_words"):
+        op.create_table(
+            "pack_words",
+            sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=False),
+            sa.Column("mode", sa.String(8), nullable=False),
+            sa.Column("word", sa.String(100), nullable=False),
+            sa.Column("tier", sa.String(8), nullable=False),
+            sa.Column("guess_rate", sa.Float(), nullable=True),
+            sa.Column("samples", sa.Integer(), nullable=False),
+            sa.Column("suggested_tier", sa.String(8), nullable=True),
+            sa.UniqueConstraint("mode", "word", name="uq_pack_words_mode_word"),
+        )
+
+    if not has_table("word_guesses"):
+        op.create_table(
+            "word_guesses",
+            sa.Column("id", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), primary_key=True),
+            sa.Column("word_id", sa.BigInteger(), sa.ForeignKey("pack_words.id"), nullable=False),
+            sa.Column("room_code", sa.String(10), nullable=False),
+            sa.Column("played_at", sa.DateTime(), nullable=False),
+            sa.Column("tier", sa.String(8), nullable=False),
+            sa.Column("outcome", sa.String(8), nullable=False),
+            sa.Column("used_translation", sa.Boolean(), nullable=False),
+        )
+        op.create_index("ix_word_guesses_word_outcome", "word_guesses", ["word_id", "outcome"])
+        op.create_index("ix_word_guesses_tier_outcome", "word_guesses", ["tier", "outcome"])
+
+
+def downgrade():
+    op.drop_table("word_guesses")
+    op.drop_table("pack_words")
@@ -74,11 +74,19 @@ class GuessedWord(BaseModel):
     translation: str = ""  # Russian translation (for round summary)
 
 
+class WordEvent(BaseModel):
+    word: str
+    tier: str = ""  # Pack difficulty tier the word was drawn from
+    outcome: str  # "guessed", "skipped" or "removed" (guessed, then removed in round review)
+    used_translation: bool = False
+    timestamp: float
+
+
 class Team(BaseModel):
     id: int  # 1 or 2
     name: str
     players: List[Player] = []
-    score: int = 0
+    score: float = 0  # 0.5 points when translation was used
 
 
 # Game Room
@@ -99,6 +107,11 @@ class GameRoom(BaseModel):
     current_word: Optional["Word"] = None  # Current word being played
     timer_ended: bool = False  # True when timer reaches 0
     awaiting_team_selection: bool = False  # True when waiting for team selection for last word
+    round_ends_at: float = 0.0  # Unix timestamp when the running round timer expires (0 = no timer)
+    last_activity_at: float = Field(default_factory=time.time)  # Used for TTL eviction
+    word_log: List[WordEvent] = []  # Word outcomes of this game, written to word_guesses at game end
+    winner: str = ""  # Name of the winning team, set when the game finishes
+    credited_users: List[int] = []  # Accounts whose result of this finished game was saved to history
 
 
 # Word
@@ -110,6 +123,11 @@ class Word(BaseModel):
     category: str = "general"
     popularity_score: float = 0.0
     translation: str = ""  # Russian translation (empty if not available)
+    tier: str = ""  # Pack difficulty tier ("easy", "medium", "hard")
+
+
+# Resolve GameRoom.current_word forward reference
+GameRoom.model_rebuild()
 
 
 # WebSocket Messages
@@ -6,6 +6,7 @@ Example: BADW|202602011430 -> QkFEV3wyMDI2MDIwMTE0MzA=
 import base64
 from datetime import datetime
 from typing import Optional
+from .services.room_codes import ROOM_CODE_LENGTH
 
 def encrypt_room_link(room_code: str) -> str:
     """
@@ -30,8 +31,8 @@ def decrypt_room_link(encrypted_link: str) -> Optional[str]:
         if len(parts) != 2:
             return None
         room_code = parts[0]
-        # Validate room code (4 uppercase letters)
-        if len(room_code) == 4 and room_code.isalpha() and room_code.isupper():
+        # Validate room code (ROOM_CODE_LENGTH uppercase letters)
+        if len(room_code) == ROOM_CODE_LENGTH and room_code.isalpha() and room_code.isupper():
             return room_code
         return None
     except Exception:
@@ -0,0 +1,296 @@
+"""
+Hot in-memory room state as slotted dataclasses.
+
+Game handlers mutate rooms on every event, so live rooms are kept in plain slotted
+objects instead of pydantic models: no validation on assignment, no per-instance
+__dict__. The pydantic models in app.models stay the schema at API and serialization
+boundaries: from_model() converts a validated GameRoom, to_dict() produces the same
+JSON shape as GameRoom.model_dump(mode="json"). Rooms this service stored itself
+(Redis, journal) come back through from_stored() without pydantic.
+"""
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+from app.models import GameRoom, GameMode, GameStatus, Difficulty
+
+
+@dataclass(slots=True)
+class SettingsState:
+    timed_mode: bool = True
+    round_time: int = 60
+    rounds_total: int = 5
+    difficulty: Difficulty = Difficulty.MEDIUM
+    language: str = "en"
+    word_pack: str = "general"
+    score_to_win: int = 30
+    team_count: int = 2
+    show_translations: bool = True
+    solo_device: bool = False
+    room_password: str = ""
+
+    def to_dict(self) -> dict:
+        return {
+            "timed_mode": self.timed_mode,
+            "round_time": self.round_time,
+            "rounds_total": self.rounds_total,
+            "difficulty": self.difficulty.value,
+            "language": self.language,
+            "word_pack": self.word_pack,
+            "score_to_win": self.score_to_win,
+            "team_count": self.team_count,
+            "show_translations": self.show_translations,
+            "solo_device": self.solo_device,
+            "room_password": self.room_password,
+        }
+
+
+@dataclass(slots=True)
+class PlayerState:
+    user_id: str
+    username: str
+    is_explaining: bool = False
+
+    def to_dict(self) -> dict:
+        return {"user_id": self.user_id, "username": self.username, "is_explaining": self.is_explaining}
+
+
+@dataclass(slots=True)
+class TeamState:
+    id: int
+    name: str
+    players: List[PlayerState] = field(default_factory=list)
+    score: float = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "players": [p.to_dict() for p in self.players],
+            "score": self.score,
+        }
+
+
+@dataclass(slots=True)
+class GuessedWordState:
+    word: str
+    taboo_words: List[str]
+    timestamp: float
+    used_translation: bool = False
+    translation: str = ""
+
+    def to_dict(self) -> dict:
+        return {
+            "word": self.word,
+            "taboo_words": self.taboo_words,
+            "timestamp": self.timestamp,
+            "used_translation": self.used_translation,
+            "translation": self.translation,
+        }
+
+
+@dataclass(slots=True)
+class WordEventState:
+    word: str
+    tier: str
+    outcome: str
+    used_translation: bool
+    timestamp: float
+
+    def to_dict(self) -> dict:
+        return {
+            "word": self.word,
+            "tier": self.tier,
+            "outcome": self.outcome,
+            "used_translation": self.used_translation,
+            "timestamp": self.timestamp,
+        }
+
+
+@dataclass(slots=True)
+class WordState:
+    """Word on screen. taboo_words may be shared with the word pack - never mutate it."""
+    word: str
+    taboo_words: List[str] = field(default_factory=list)
+    translation: str = ""
+    category: str = "general"
+    tier: str = ""
+
+    def to_dict(self) -> dict:
+        return {
+            "word": self.word,
+            "taboo_words": self.taboo_words,
+            "translation": self.translation,
+            "category": self.category,
+            "tier": self.tier,
+        }
+
+
+@dataclass(slots=True)
+class RoomState:
+    room_code: str
+    mode: GameMode
+    host_id: str
+    settings: SettingsState = field(default_factory=SettingsState)
+    status: GameStatus = GameStatus.LOBBY
+    teams: List[TeamState] = field(default_factory=list)
+    current_round: int = 0
+    current_team_index: int = 0
+    id: uuid.UUID = field(default_factory=uuid.uuid4)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    current_round_words: List[GuessedWordState] = field(default_factory=list)
+    is_paused: bool = False
+    paused_time_left: int = 0
+    current_word: Optional[WordState] = None
+    timer_ended: bool = False
+    awaiting_team_selection: bool = False
+    round_ends_at: float = 0.0
+    last_activity_at: float = field(default_factory=time.time)
+    word_log: List[WordEventState] = field(default_factory=list)
+    winner: str = ""
+    credited_users: List[int] = field(default_factory=list)
+
+    def log_word(self, outcome: str, used_translation: bool = False):
+        """Record the outcome of the word on screen for word_guesses"""
+        if self.current_word is not None:
+            self.word_log.append(WordEventState(
+                self.current_word.word, self.current_word.tier, outcome, used_translation, time.time()
+            ))
+
+    def mark_word_removed(self, word: str):
+        """A guessed word was taken back in round review"""
+        for event in reversed(self.word_log):
+            if event.word == word and event.outcome == "guessed":
+                event.outcome = "removed"
+                return
+
+    def to_dict(self) -> dict:
+        """Same shape as GameRoom.model_dump(mode="json", exclude_none=True)"""
+        data = {
+            "id": str(self.id),
+            "room_code": self.room_code,
+            "mode": self.mode.value,
+            "status": self.status.value,
+            "teams": [t.to_dict() for t in self.teams],
+            "current_round": self.current_round,
+            "current_team_index": self.current_team_index,
+            "settings": self.settings.to_dict(),
+            "host_id": self.host_id,
+            "created_at": self.created_at.isoformat(),
+            "current_round_words": [gw.to_dict() for gw in self.current_round_words],
+            "is_paused": self.is_paused,
+            "paused_time_left": self.paused_time_left,
+            "timer_ended": self.timer_ended,
+            "awaiting_team_selection": self.awaiting_team_selection,
+            "round_ends_at": self.round_ends_at,
+            "last_activity_at": self.last_activity_at,
+            "word_log": [e.to_dict() for e in self.word_log],
+            "winner": self.winner,
+            "credited_users": list(self.credited_users),
+        }
+        if self.current_word is not None:
+            data["current_word"] = self.current_word.to_dict()
+        return data
+
+    @classmethod
+    def from_model(cls, model: GameRoom) -> "RoomState":
+        """Build hot state from a validated pydantic GameRoom"""
+        word = model.current_word
+        return cls(
+            id=model.id,
+            room_code=model.room_code,
+            mode=model.mode,
+            status=model.status,
+            teams=[
+                TeamState(
+                    id=t.id,
+                    name=t.name,
+                    players=[PlayerState(p.user_id, p.username, p.is_explaining) for p in t.players],
+                    score=t.score,
+                )
+                for t in model.teams
+            ],
+            current_round=model.current_round,
+            current_team_index=model.current_team_index,
+            settings=SettingsState(**model.settings.model_dump()),
+            host_id=model.host_id,
+            created_at=model.created_at,
+            current_round_words=[
+                GuessedWordState(gw.word, gw.taboo_words, gw.timestamp, gw.used_translation, gw.translation)
+                for gw in model.current_round_words
+            ],
+            is_paused=model.is_paused,
+            paused_time_left=model.paused_time_left,
+            current_word=WordState(word.word, word.taboo_words, word.translation, word.category, word.tier) if word else None,
+            timer_ended=model.timer_ended,
+            awaiting_team_selection=model.awaiting_team_selection,
+            round_ends_at=model.round_ends_at,
+            last_activity_at=model.last_activity_at,
+            word_log=[
+                WordEventState(e.word, e.tier, e.outcome, e.used_translation, e.timestamp)
+                for e in model.word_log
+            ],
+            winner=model.winner,
+            credited_users=list(model.credited_users),
+        )
+
+    @classmethod
+    def from_stored(cls, data) -> "RoomState":
+        """Rebuild a room serialized by to_dict() (dict or JSON bytes) without validation.
+
+        Only for data this service wrote; fields added since it was written get GameRoom's defaults.
+        """
+        if isinstance(data, (bytes, str)):
+            data = json.loads(data)
+        word = data.get("current_word")
+        settings = data.get("settings", {})
+        return cls(
+            id=uuid.UUID(data["id"]),
+            room_code=data["room_code"],
+            mode=GameMode(data["mode"]),
+            status=GameStatus(data.get("status", GameStatus.LOBBY)),
+            teams=[
+                TeamState(
+                    id=t["id"],
+                    name=t["name"],
+                    players=[PlayerState(p["user_id"], p["username"], p.get("is_explaining", False))
+                             for p in t.get("players", ())],
+                    score=t.get("score", 0),
+                )
+                for t in data.get("teams", ())
+            ],
+            current_round=data.get("current_round", 0),
+            current_team_index=data.get("current_team_index", 0),
+            settings=SettingsState(**{**settings, "difficulty": Difficulty(settings.get("difficulty", "medium"))}),
+            host_id=data["host_id"],
+            created_at=datetime.fromisoformat(data["created_at"]),
+            current_round_words=[
+                GuessedWordState(gw["word"], gw.get("taboo_words", []), gw["timestamp"],
+                                 gw.get("used_translation", False), gw.get("translation", ""))
+                for gw in data.get("current_round_words", ())
+            ],
+            is_paused=data.get("is_paused", False),
+            paused_time_left=data.get("paused_time_left", 0),
+            current_word=WordState(word["word"], word.get("taboo_words", []), word.get("translation", ""),
+                                   word.get("category", "general"), word.get("tier", "")) if word else None,
+            timer_ended=data.get("timer_ended", False),
+            awaiting_team_selection=data.get("awaiting_team_selection", False),
+            round_ends_at=data.get("round_ends_at", 0.0),
+            last_activity_at=data.get("last_activity_at", time.time()),
+            word_log=[
+                WordEventState(e["word"], e.get("tier", ""), e["outcome"], e.get("used_translation", False),
+                               e["timestamp"])
+                for e in data.get("word_log", ())
+            ],
+            winner=data.get("winner", ""),
+            credited_users=list(data.get("credited_users", ())),
+        )
+
+    @classmethod
+    def from_dict(cls, data) -> "RoomState":
+        """Validate serialized room (dict or JSON bytes) through GameRoom, then convert"""
+        if isinstance(data, (bytes, str)):
+            return cls.from_model(GameRoom.model_validate_json(data))
+        return cls.from_model(GameRoom.model_validate(data))
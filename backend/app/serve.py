@@ -0,0 +1,139 @@
+"""
+Production launcher: python -m app.serve [--workers N] [--host H] [--port P]
+
+The master process imports the app, loads word packs and other immutable data once,
+moves everything it allocated into the GC's permanent generation (gc.freeze) and
+then forks the workers. Workers share those pages copy-on-write: frozen objects are
+never traversed by the collector, so collections don't dirty the shared pages.
+Each worker runs uvicorn with uvloop and httptools on the socket the master bound.
+
+The master restarts workers that die and forwards SIGTERM/SIGINT for a graceful stop.
+With more than one worker, rooms and broadcasts must go through Redis (REDIS_URL),
+and Prometheus should scrape each worker on METRICS_PORT + slot (see app.metrics).
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+from app.log import get_logger, setup_logging, stop_listener
+
+log = get_logger("app.serve")
+
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+WORKER_RESTART_DELAY = 1.0  # seconds between restarts of a crashing worker
+
+
+def preload():
+    """Import the app and load shared immutable data in the master"""
+    from app.main import app
+    from app.services.word_service import word_service
+    word_service.load()
+    return app
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app, sock: socket.socket):
+    import uvicorn
+    gc.enable()
+    # Default handlers: uvicorn installs its own graceful-shutdown handlers
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    # log_config=None: keep the queue handlers set up by app.log instead of uvicorn's defaults
+    config = uvicorn.Config(app, loop="uvloop", http="httptools", ws="websockets", lifespan="on",
+                            proxy_headers=True, log_config=None)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class Master:
+    def __init__(self, app, sock: socket.socket, workers: int):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.children = {}  # {pid: slot}
+        self.stopping = False
+
+    def spawn(self, slot: int):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            os.environ["WORKER_SLOT"] = str(slot)  # per-worker metrics port (METRICS_PORT)
+            try:
+                run_worker(self.app, self.sock)
+            except BaseException:
+                log.exception("worker_failed", slot=slot)
+                code = 1
+            finally:
+                stop_listener()  # os._exit skips atexit: write out queued records first
+                os._exit(code)  # Never return into the master's code path
+        self.children[pid] = slot
+        log.info("worker_started", slot=slot, pid=pid)
+
+    def stop(self, signum, frame):
+        self.stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        for slot in range(self.workers):
+            self.spawn(slot)
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            slot = self.children.pop(pid, None)
+            if slot is None or self.stopping:
+                continue
+            log.warning("worker_restart", slot=slot, pid=pid, status=status)
+            time.sleep(WORKER_RESTART_DELAY)
+            self.spawn(slot)
+        log.info("workers_stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prefork production server")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=WEB_CONCURRENCY)
+    parser.add_argument("--no-preload", action="store_true",
+                        help="load word packs in each worker instead of the master (for comparison)")
+    args = parser.parse_args()
+
+    # No collections while the shared heap is built: they would only leave holes in it
+    gc.disable()
+    setup_logging()
+    if args.no_preload:
+        from app.main import app
+    else:
+        app = preload()
+    sock = bind_socket(args.host, args.port)
+    gc.collect()
+    gc.freeze()
+    log.info("master_started", pid=os.getpid(), host=args.host, port=args.port, workers=args.workers,
+             frozen=gc.get_freeze_count())
+    Master(app, sock, args.workers).run()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
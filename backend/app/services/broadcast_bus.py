@@ -0,0 +1,177 @@
+"""
+Broadcast bus: fan room events out to sockets held by other worker processes.
+
+Each worker delivers its own events to local sockets immediately and publishes them
+to the bus; other workers receive them through a single subscription and deliver
+to their local sockets. A lost subscription is re-established with backoff; events
+published by other workers while it is down are not delivered here.
+"""
+import asyncio
+import json
+import os
+import uuid
+from typing import Awaitable, Callable, List, Optional
+from app.log import get_logger
+
+log = get_logger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "")
+BROADCAST_BUS_BACKEND = os.getenv("BROADCAST_BUS", "redis" if REDIS_URL else "loopback")
+BROADCAST_CHANNEL = "aliby:broadcast"
+BROADCAST_BATCH_SIZE = int(os.getenv("BROADCAST_BATCH_SIZE", "256"))
+BROADCAST_BATCH_INTERVAL = float(os.getenv("BROADCAST_BATCH_INTERVAL", "0.002"))  # seconds
+BROADCAST_RETRY_MIN = 0.1  # seconds before the first resubscribe attempt
+BROADCAST_RETRY_MAX = float(os.getenv("BROADCAST_RETRY_MAX", "5"))  # seconds, cap of the backoff
+
+# Callback that sends a message to sockets of a room on this worker
+DeliverFn = Callable[[str, dict], Awaitable[None]]
+
+
+class BroadcastBus:
+    """Interface for cross-worker room event delivery."""
+
+    async def start(self, deliver: DeliverFn) -> None:
+        raise NotImplementedError
+
+    async def stop(self) -> None:
+        raise NotImplementedError
+
+    def publish(self, room_code: str, message: dict) -> None:
+        """Queue message for other workers. Never blocks the caller."""
+        raise NotImplementedError
+
+
+class LoopbackBroadcastBus(BroadcastBus):
+    """Single-process bus: local delivery already reaches every socket, nothing to forward."""
+
+    async def start(self, deliver: DeliverFn) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    def publish(self, room_code: str, message: dict) -> None:
+        pass
+
+
+class RedisBroadcastBus(BroadcastBus):
+    """
+    Redis pub/sub bus. Outgoing events are buffered and published as one JSON array
+    per batch; each worker holds exactly one subscription to BROADCAST_CHANNEL.
+    """
+
+    def __init__(self, redis_client, channel: str = BROADCAST_CHANNEL):
+        self.redis = redis_client
+        self.channel = channel
+        self.worker_id = uuid.uuid4().hex[:12]
+        self.pending: List[list] = []
+        self.wakeup = asyncio.Event()
+        self.deliver: Optional[DeliverFn] = None
+        self.tasks: List[asyncio.Task] = []
+        self.pubsub = None
+        self.resubscribes = 0
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBroadcastBus":
+        import redis.asyncio as redis_asyncio
+        return cls(redis_asyncio.from_url(url))
+
+    async def start(self, deliver: DeliverFn) -> None:
+        self.deliver = deliver
+        await self._subscribe()
+        self.tasks = [
+            asyncio.create_task(self._publish_loop()),
+            asyncio.create_task(self._subscribe_loop()),
+        ]
+
+    async def stop(self) -> None:
+        await self._flush()
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        if self.pubsub is not None:
+            try:
+                await self.pubsub.unsubscribe(self.channel)
+            except Exception:
+                pass
+            await self._close_pubsub()
+
+    def publish(self, room_code: str, message: dict) -> None:
+        self.pending.append([room_code, message])
+        self.wakeup.set()
+
+    async def _flush(self) -> None:
+        while self.pending:
+            batch = self.pending[:BROADCAST_BATCH_SIZE]
+            del self.pending[:BROADCAST_BATCH_SIZE]
+            payload = json.dumps({"origin": self.worker_id, "events": batch})
+            try:
+                await self.redis.publish(self.channel, payload)
+            except Exception as e:
+                log.error("broadcast_publish_failed", dropped=len(batch), error=str(e))
+
+    async def _publish_loop(self) -> None:
+        while True:
+            await self.wakeup.wait()
+            # Short linger lets events from the same handler share one PUBLISH
+            await asyncio.sleep(BROADCAST_BATCH_INTERVAL)
+            self.wakeup.clear()
+            await self._flush()
+
+    async def _subscribe(self) -> None:
+        self.pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        await self.pubsub.subscribe(self.channel)
+
+    async def _close_pubsub(self) -> None:
+        pubsub, self.pubsub = self.pubsub, None
+        if pubsub is not None:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+    async def _subscribe_loop(self) -> None:
+        """Deliver incoming events; resubscribe with backoff whenever the subscription fails"""
+        delay = BROADCAST_RETRY_MIN
+        while True:
+            try:
+                if self.pubsub is None:
+                    await self._subscribe()
+                    self.resubscribes += 1
+                    log.info("broadcast_resubscribed")
+                    delay = BROADCAST_RETRY_MIN
+                async for item in self.pubsub.listen():
+                    await self._deliver_envelope(item)
+                raise ConnectionError("subscription closed")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.error("broadcast_subscription_lost", error=str(e), retry_in=delay)
+                await self._close_pubsub()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, BROADCAST_RETRY_MAX)
+
+    async def _deliver_envelope(self, item: dict) -> None:
+        try:
+            envelope = json.loads(item["data"])
+        except (TypeError, ValueError):
+            return
+        if envelope.get("origin") == self.worker_id:
+            return  # Already delivered locally
+        for room_code, message in envelope.get("events", []):
+            try:
+                await self.deliver(room_code, message)
+            except Exception:
+                log.exception("broadcast_delivery_failed", room=room_code)
+
+
+def create_broadcast_bus() -> BroadcastBus:
+    """Pick backend from BROADCAST_BUS env (loopback/redis). Defaults to redis when REDIS_URL is set."""
+    if BROADCAST_BUS_BACKEND == "redis":
+        return RedisBroadcastBus.from_url(REDIS_URL or "redis://localhost:6379")
+    return LoopbackBroadcastBus()
+
+
+# Global instance
+broadcast_bus = create_broadcast_bus()
@@ -0,0 +1,168 @@
+"""
+Buffered game-history writer.
+
+At game end every authenticated player posts /history/save-game at almost the same
+moment. Instead of one transaction per request, rows are queued and a background task
+inserts them in batches (one multi-row INSERT ... RETURNING per batch, flushed by size
+or time). Leaderboard rollups and user_stats for the batch are upserted in the same
+transaction. Each request waits for its row's acknowledgement (the new id). A bounded
+queue applies backpressure, and shutdown drains the queue before the engine closes.
+"""
+import asyncio
+import os
+import time
+from typing import List, Tuple
+from sqlalchemy import insert
+from app.database import AsyncSessionLocal
+from app.db_models import GameHistory
+from app.services import leaderboard, user_stats
+from app.log import get_logger
+
+log = get_logger(__name__)
+
+HISTORY_BATCH_SIZE = int(os.getenv("HISTORY_BATCH_SIZE", "200"))
+HISTORY_FLUSH_INTERVAL = float(os.getenv("HISTORY_FLUSH_INTERVAL", "0.05"))  # seconds
+HISTORY_QUEUE_MAX = int(os.getenv("HISTORY_QUEUE_MAX", "5000"))
+HISTORY_ENQUEUE_TIMEOUT = float(os.getenv("HISTORY_ENQUEUE_TIMEOUT", "2"))  # seconds
+
+
+class HistoryQueueFull(Exception):
+    """Writer is saturated; caller should retry later"""
+
+
+class HistoryWriter:
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=HISTORY_QUEUE_MAX)
+        self.task = None
+        self.accepting = False
+        # Metrics
+        self.batches = 0
+        self.rows_written = 0
+        self.rejected = 0
+        self.failed = 0
+        self.last_batch_size = 0
+        self.last_flush_seconds = 0.0
+
+    async def submit(self, row: dict) -> int:
+        """Queue a game_history row and wait until it is committed. Returns the row id."""
+        if not self.accepting:
+            raise HistoryQueueFull("History writer is not running")
+        future = asyncio.get_running_loop().create_future()
+        try:
+            await asyncio.wait_for(self.queue.put((row, future)), HISTORY_ENQUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise HistoryQueueFull("History queue is full")
+        return await future
+
+    async def _next_batch(self) -> Tuple[List[Tuple[dict, asyncio.Future]], bool]:
+        """
+        Block for the first item, then collect until batch size or flush interval.
+        Returns (batch, stop) - stop is True once the shutdown sentinel (None) is seen.
+        """
+        batch = []
+        item = await self.queue.get()
+        deadline = time.monotonic() + HISTORY_FLUSH_INTERVAL
+        while item is not None:
+            batch.append(item)
+            if len(batch) >= HISTORY_BATCH_SIZE:
+                return batch, False
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                return batch, False
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                return batch, False
+        return batch, True
+
+    async def _insert(self, rows: List[dict]) -> List[int]:
+        """Insert rows and their rollup updates in one transaction; returns ids in row order"""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                insert(GameHistory).returning(GameHistory.id, sort_by_parameter_order=True),
+                rows,
+            )
+            ids = result.scalars().all()
+            await leaderboard.apply_games(db, rows)
+            await user_stats.apply_games(db, rows)
+            await db.commit()
+        return ids
+
+    async def write_batch(self, batch: List[Tuple[dict, asyncio.Future]]):
+        if not batch:
+            return
+        rows = [row for row, _ in batch]
+        started = time.perf_counter()
+        try:
+            results = list(await self._insert(rows))
+        except Exception as e:
+            if len(batch) == 1:
+                log.exception("history_row_failed")
+                results = [e]
+            else:
+                # One bad row fails the whole INSERT: retry row by row so only that save fails
+                log.warning("history_batch_failed", rows=len(batch))
+                results = await self._insert_each(rows)
+        written = 0
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                self.failed += 1
+                if not future.done():
+                    future.set_exception(result)
+            else:
+                written += 1
+                if not future.done():
+                    future.set_result(result)
+        if written:
+            leaderboard.leaderboard_cache.invalidate()
+        self.batches += 1
+        self.rows_written += written
+        self.last_batch_size = len(batch)
+        self.last_flush_seconds = time.perf_counter() - started
+
+    async def _insert_each(self, rows: List[dict]) -> list:
+        """Row id or the exception, per row"""
+        results = []
+        for row in rows:
+            try:
+                results.append((await self._insert([row]))[0])
+            except Exception as e:
+                log.exception("history_row_failed")
+                results.append(e)
+        return results
+
+    async def run(self):
+        stop = False
+        while not stop:
+            batch, stop = await self._next_batch()
+            await self.write_batch(batch)
+
+    def start(self):
+        if self.task is None:
+            self.accepting = True
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Stop accepting rows and write everything still queued before returning"""
+        self.accepting = False
+        if self.task is not None:
+            # Sentinel goes behind queued rows, so the writer drains them first
+            await self.queue.put(None)
+            await self.task
+            self.task = None
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.queue.qsize(),
+            "batches": self.batches,
+            "rows_written": self.rows_written,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "last_batch_size": self.last_batch_size,
+            "last_flush_seconds": round(self.last_flush_seconds, 4),
+        }
+
+
+# Global instance
+history_writer = HistoryWriter()
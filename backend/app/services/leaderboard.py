@@ -0,0 +1,170 @@
+"""
+Leaderboard kept as rollups instead of scanning game_history.
+
+Every saved game adds the player's score to three rows of leaderboard_rollups: the
+all-time window, the current ISO week and the current day (UTC). The upserts run in
+the history writer's batch transaction, so the board moves together with history.
+A top-N read is one range scan of the (period, period_start, score, user_id) index.
+Day and week rows older than LEADERBOARD_RETENTION_DAYS are deleted by a background
+pruner once per LEADERBOARD_PRUNE_INTERVAL; reads only use the current period.
+Responses are cached per worker; the cache is cleared when this worker commits
+rollups and otherwise expires after LEADERBOARD_CACHE_TTL seconds.
+"""
+import asyncio
+import os
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import delete, select
+from app.database import AsyncSessionLocal, dialect_insert
+from app.db_models import LeaderboardRollup, User
+from app.log import get_logger
+
+log = get_logger(__name__)
+
+PERIODS = ("all", "week", "day")
+ALL_TIME_START = date(1970, 1, 1)
+LEADERBOARD_CACHE_TTL = float(os.getenv("LEADERBOARD_CACHE_TTL", "10"))  # seconds
+LEADERBOARD_RETENTION_DAYS = max(7, int(os.getenv("LEADERBOARD_RETENTION_DAYS", "14")))  # the current week must stay
+LEADERBOARD_PRUNE_INTERVAL = float(os.getenv("LEADERBOARD_PRUNE_INTERVAL", "3600"))  # seconds
+
+
+def player_outcome(teams: list, winner: str, username: str) -> Tuple[float, bool]:
+    """(team score, won) for the team the user played in; (0, False) if not found"""
+    for team in teams:
+        if not isinstance(team, dict):
+            continue
+        for player in team.get("players") or []:
+            if isinstance(player, dict) and player.get("username") == username:
+                return float(team.get("score") or 0), team.get("name") == winner
+    return 0.0, False
+
+
+def period_start(period: str, played_at: datetime) -> date:
+    if period == "day":
+        return played_at.date()
+    if period == "week":
+        return played_at.date() - timedelta(days=played_at.weekday())
+    return ALL_TIME_START
+
+
+async def apply_games(db, rows: List[dict]):
+    """Add saved game_history rows to the rollups (caller commits)"""
+    totals: Dict[tuple, List[float]] = defaultdict(lambda: [0.0, 0, 0])
+    for row in rows:
+        for period in PERIODS:
+            total = totals[(period, period_start(period, row["played_at"]), row["user_id"])]
+            total[0] += row["score"]
+            total[1] += 1
+            total[2] += 1 if row["won"] else 0
+    if not totals:
+        return
+
+    # Sorted keys give concurrent workers the same lock order
+    stmt = dialect_insert(db, LeaderboardRollup).values([
+        {"period": key[0], "period_start": key[1], "user_id": key[2],
+         "score": score, "games_played": games, "wins": wins}
+        for key, (score, games, wins) in sorted(totals.items())
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["period", "period_start", "user_id"],
+        set_={
+            "score": LeaderboardRollup.score + stmt.excluded.score,
+            "games_played": LeaderboardRollup.games_played + stmt.excluded.games_played,
+            "wins": LeaderboardRollup.wins + stmt.excluded.wins,
+        },
+    )
+    await db.execute(stmt)
+
+
+async def top(db, period: str, limit: int) -> List[dict]:
+    start = period_start(period, datetime.utcnow())
+    result = await db.execute(
+        select(
+            LeaderboardRollup.user_id,
+            User.username,
+            LeaderboardRollup.score,
+            LeaderboardRollup.games_played,
+            LeaderboardRollup.wins,
+        )
+        .join(User, User.id == LeaderboardRollup.user_id)
+        .where(LeaderboardRollup.period == period, LeaderboardRollup.period_start == start)
+        .order_by(LeaderboardRollup.score.desc(), LeaderboardRollup.user_id.desc())
+        .limit(limit)
+    )
+    return [
+        {"rank": rank, **row}
+        for rank, row in enumerate(result.mappings().all(), start=1)
+    ]
+
+
+async def prune(db, now: datetime) -> int:
+    """Delete day and week rollups past retention (caller commits); returns rows deleted"""
+    cutoff = now.date() - timedelta(days=LEADERBOARD_RETENTION_DAYS)
+    result = await db.execute(
+        delete(LeaderboardRollup)
+        .where(LeaderboardRollup.period.in_(("day", "week")), LeaderboardRollup.period_start < cutoff)
+    )
+    return result.rowcount
+
+
+class RollupPruner:
+    def __init__(self):
+        self.task = None
+        self.rows_deleted = 0
+
+    async def prune_once(self):
+        async with AsyncSessionLocal() as db:
+            deleted = await prune(db, datetime.utcnow())
+            await db.commit()
+        self.rows_deleted += deleted
+        if deleted:
+            log.info("leaderboard_pruned", rows=deleted)
+
+    async def run(self):
+        while True:
+            try:
+                await self.prune_once()
+            except Exception:
+                log.exception("leaderboard_prune_failed")
+            await asyncio.sleep(LEADERBOARD_PRUNE_INTERVAL)
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+
+class LeaderboardCache:
+    def __init__(self, ttl: float = LEADERBOARD_CACHE_TTL):
+        self.ttl = ttl
+        self.entries: Dict[tuple, Tuple[float, dict]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Optional[dict]:
+        entry = self.entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: tuple, value: dict):
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self):
+        self.entries.clear()
+
+
+# Global instance
+leaderboard_cache = LeaderboardCache()
+
+# Global instance
+rollup_pruner = RollupPruner()
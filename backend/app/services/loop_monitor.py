@@ -0,0 +1,126 @@
+"""
+Event-loop lag monitor with admission control.
+
+Every room, timer and broadcast of a worker runs on one asyncio loop, so one blocking
+call stalls all of them. A sampler task sleeps LOOP_LAG_INTERVAL and measures how late
+it wakes up; that delay is what every other coroutine waited too. A watchdog thread
+watches the sampler's heartbeat: when the loop has not come back for
+LOOP_STALL_THRESHOLD it logs the stack executing on the loop thread and the asyncio task
+it belongs to, i.e. the blocking call while it is still blocking.
+
+While the smoothed lag is above LOOP_OVERLOAD_LAG the worker is overloaded and admit()
+refuses new work (room creation, WebSocket connections), so rooms already playing keep
+their latency. Admission reopens once the lag falls below half the threshold.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, Optional
+from app import metrics
+from app.log import get_logger
+
+log = get_logger(__name__)
+
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.1"))  # seconds between samples
+LOOP_STALL_THRESHOLD = float(os.getenv("LOOP_STALL_THRESHOLD", "0.25"))  # log the stack beyond this
+LOOP_OVERLOAD_LAG = float(os.getenv("LOOP_OVERLOAD_LAG", "0.1"))  # 0 disables admission control
+LOOP_LAG_SMOOTHING = 0.2  # weight of a new sample in the moving average
+LOOP_STACK_LIMIT = 30  # innermost frames logged per stall
+
+
+class LoopMonitor:
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.thread: Optional[threading.Thread] = None
+        self.stopped = threading.Event()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.loop_thread_id: Optional[int] = None
+        self.heartbeat = 0.0  # time.monotonic() of the last sample
+        # Metrics
+        self.lag = 0.0
+        self.smoothed_lag = 0.0
+        self.overloaded = False
+        self.stalls = 0
+        self.rejected: Dict[str, int] = {}
+
+    def record(self, lag: float):
+        self.heartbeat = time.monotonic()
+        self.lag = lag
+        self.smoothed_lag += LOOP_LAG_SMOOTHING * (lag - self.smoothed_lag)
+        loop_lag_seconds.observe(lag)
+        if LOOP_OVERLOAD_LAG <= 0:
+            return
+        if not self.overloaded and self.smoothed_lag > LOOP_OVERLOAD_LAG:
+            self.overloaded = True
+            log.warning("loop_overloaded", lag=round(self.smoothed_lag, 4))
+        elif self.overloaded and self.smoothed_lag < LOOP_OVERLOAD_LAG / 2:
+            self.overloaded = False
+            log.info("loop_recovered", lag=round(self.smoothed_lag, 4))
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            wake_at = loop.time() + LOOP_LAG_INTERVAL
+            await asyncio.sleep(LOOP_LAG_INTERVAL)
+            self.record(max(loop.time() - wake_at, 0.0))
+
+    def watch(self):
+        """Watchdog thread: report each stall once, with the stack that is blocking the loop"""
+        reported = None
+        while not self.stopped.wait(LOOP_STALL_THRESHOLD / 2):
+            beat = self.heartbeat
+            stalled = time.monotonic() - beat - LOOP_LAG_INTERVAL
+            if stalled < LOOP_STALL_THRESHOLD or beat == reported:
+                continue
+            reported = beat
+            self.stalls += 1
+            frame = sys._current_frames().get(self.loop_thread_id)
+            task = asyncio.current_task(self.loop)
+            stack = traceback.format_stack(frame, limit=LOOP_STACK_LIMIT) if frame else []
+            log.warning("loop_stall", seconds=round(stalled, 3),
+                        task=task.get_name() if task else None, stack="".join(stack))
+
+    def admit(self, kind: str) -> bool:
+        """Admission-control hook: False while the worker is overloaded (counted per kind)"""
+        if not self.overloaded:
+            return True
+        self.rejected[kind] = self.rejected.get(kind, 0) + 1
+        return False
+
+    def start(self):
+        if self.task is not None:
+            return
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread_id = threading.get_ident()
+        self.heartbeat = time.monotonic()
+        self.task = asyncio.create_task(self.run())
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.watch, name="loop-watchdog", daemon=True)
+        self.thread.start()
+
+    async def stop(self):
+        self.stopped.set()
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+
+# Global instance
+loop_monitor = LoopMonitor()
+
+loop_lag_seconds = metrics.registry.register(metrics.Histogram(
+    "aliby_loop_lag_seconds", "How late the event loop ran a task scheduled to wake up"))
+metrics.registry.register(metrics.GaugeFunc(
+    "aliby_loop_lag_smoothed_seconds", "Moving average of event-loop lag", lambda: loop_monitor.smoothed_lag))
+metrics.registry.register(metrics.GaugeFunc(
+    "aliby_loop_overloaded", "1 while new rooms and WebSocket connections are refused",
+    lambda: int(loop_monitor.overloaded)))
+metrics.registry.register(metrics.CounterFunc(
+    "aliby_loop_stalls_total", "Event-loop stalls longer than LOOP_STALL_THRESHOLD", lambda: loop_monitor.stalls))
+metrics.registry.register(metrics.CounterFunc(
+    "aliby_admission_rejected_total", "Work refused while overloaded, by kind",
+    lambda: dict(loop_monitor.rejected), ("kind",)))
@@ -0,0 +1,149 @@
+"""
+Password hashing in a dedicated, size-limited process pool.
+
+bcrypt costs tens of milliseconds of CPU per hash by design. Running it on the event
+loop or the default threadpool would stall game traffic during a login storm, so
+hashes are computed in PASSWORD_HASH_WORKERS child processes running at lower CPU
+priority. At most PASSWORD_HASH_MAX_PENDING operations may be queued or running per
+worker; beyond that, callers get PasswordHasherBusy (503) instead of waiting.
+
+Legacy unsalted SHA-256 hashes still verify; a successful login returns a bcrypt
+replacement so the caller can upgrade the stored hash transparently.
+
+The worker functions only import bcrypt/hashlib, so spawned children start fast.
+"""
+import asyncio
+import hashlib
+import hmac
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+PASSWORD_BCRYPT_ROUNDS = int(os.getenv("PASSWORD_BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_NICE = int(os.getenv("PASSWORD_HASH_NICE", "10"))  # CPU priority penalty of hash processes
+
+LEGACY_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+BCRYPT_MAX_BYTES = 72  # bcrypt ignores (bcrypt>=5: rejects) longer secrets
+
+
+class PasswordHasherBusy(Exception):
+    """Too many hash operations pending; caller should retry later"""
+
+
+# Functions below run in the pool processes
+
+def _init_worker(nice: int):
+    if nice and hasattr(os, "nice"):
+        os.nice(nice)
+
+
+def _secret(password: str) -> bytes:
+    return password.encode()[:BCRYPT_MAX_BYTES]
+
+
+def _bcrypt_hash(password: str, rounds: int) -> str:
+    import bcrypt
+    return bcrypt.hashpw(_secret(password), bcrypt.gensalt(rounds)).decode()
+
+
+def _needs_rehash(hashed: str, rounds: int) -> bool:
+    # $2b$12$... - cost is the second field
+    parts = hashed.split("$")
+    return len(parts) < 4 or parts[2] != f"{rounds:02d}"
+
+
+def _verify(password: str, hashed: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    """Returns (valid, replacement hash if the stored one should be upgraded)"""
+    if LEGACY_SHA256_RE.match(hashed):
+        valid = hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), hashed)
+    else:
+        import bcrypt
+        try:
+            valid = bcrypt.checkpw(_secret(password), hashed.encode())
+        except ValueError:
+            return False, None
+        if valid and not _needs_rehash(hashed, rounds):
+            return True, None
+    return valid, (_bcrypt_hash(password, rounds) if valid else None)
+
+
+class PasswordHasher:
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_pending: int = PASSWORD_HASH_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.dummy_hash: Optional[str] = None  # hash of a random secret at the current cost
+        # Metrics
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.shed = 0
+        self.upgraded = 0
+        self.busy_seconds = 0.0
+
+    def start(self):
+        if self.executor is None:
+            # spawn: forking a process that runs an event loop and DB pools is unsafe
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(PASSWORD_HASH_NICE,),
+            )
+
+    def stop(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    async def _run(self, fn, *args):
+        if self.pending >= self.max_pending:
+            self.shed += 1
+            raise PasswordHasherBusy("Password hashing queue is full")
+        self.start()
+        self.pending += 1
+        self.peak_pending = max(self.peak_pending, self.pending)
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+            self.busy_seconds += time.perf_counter() - started
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_bcrypt_hash, password, PASSWORD_BCRYPT_ROUNDS)
+
+    async def verify(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """(valid, upgraded hash or None). Store the upgraded hash when it is returned."""
+        valid, upgraded = await self._run(_verify, password, hashed, PASSWORD_BCRYPT_ROUNDS)
+        if upgraded:
+            self.upgraded += 1
+        return valid, upgraded
+
+    async def verify_dummy(self, password: str):
+        """Same bcrypt work as verify() for a user that does not exist"""
+        if self.dummy_hash is None:
+            self.dummy_hash = await self.hash(os.urandom(16).hex())
+        await self.verify(password, self.dummy_hash)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "peak_pending": self.peak_pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "shed": self.shed,
+            "upgraded": self.upgraded,
+            "avg_seconds": round(self.busy_seconds / self.completed, 4) if self.completed else 0.0,
+        }
+
+
+# Global instance
+password_hasher = PasswordHasher()
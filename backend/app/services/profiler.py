@@ -0,0 +1,152 @@
+"""
+In-process sampling profiler for live workers.
+
+A background thread reads sys._current_frames() every PROFILER_INTERVAL and counts
+identical stacks; nothing is traced or instrumented, so the cost is one stack walk per
+sample per thread, paid by the profiler thread. Samples of the event-loop thread are
+tagged with the asyncio task running at that moment ("task:<name>" under the thread).
+
+Output is either collapsed stacks (one "frame;frame;... count" line per stack, the
+input of flamegraph.pl and speedscope) or speedscope's JSON file format.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+PROFILER_INTERVAL = float(os.getenv("PROFILER_INTERVAL", "0.01"))  # seconds between samples
+PROFILER_MAX_SECONDS = float(os.getenv("PROFILER_MAX_SECONDS", "60"))
+PROFILER_MAX_DEPTH = 128
+
+Frame = Tuple[str, str, int]  # (function, file, first line)
+Stack = Tuple[Frame, ...]  # outermost first
+
+
+class ProfilerBusy(Exception):
+    """A profile is already being recorded in this worker"""
+
+
+def short_path(path: str) -> str:
+    for prefix in sorted(sys.path, key=len, reverse=True):
+        if prefix and path.startswith(prefix + os.sep):
+            return path[len(prefix) + 1:]
+    return path
+
+
+def frame_label(frame: Frame) -> str:
+    name, path, line = frame
+    return f"{name} ({path}:{line})"
+
+
+class Profile:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.started = time.time()
+        self.duration = 0.0
+        self.samples = 0
+        self.stacks: Dict[str, Counter] = {}  # {thread label: Counter(stack)}
+        self.code_labels: Dict[object, Frame] = {}
+
+    def frame(self, code) -> Frame:
+        label = self.code_labels.get(code)
+        if label is None:
+            label = self.code_labels[code] = (code.co_name, short_path(code.co_filename), code.co_firstlineno)
+        return label
+
+    def add(self, thread: str, frame, task: Optional[str]):
+        stack: List[Frame] = []
+        while frame is not None and len(stack) < PROFILER_MAX_DEPTH:
+            stack.append(self.frame(frame.f_code))
+            frame = frame.f_back
+        if task:
+            stack.append((f"task:{task}", "", 0))
+        stack.reverse()
+        self.stacks.setdefault(thread, Counter())[tuple(stack)] += 1
+
+    def collapsed(self) -> str:
+        lines = []
+        for thread, stacks in self.stacks.items():
+            for stack, count in stacks.most_common():
+                labels = [thread] + [frame_label(frame) if frame[1] else frame[0] for frame in stack]
+                lines.append(";".join(label.replace(";", ",") for label in labels) + f" {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self) -> dict:
+        frames: List[dict] = []
+        index: Dict[Frame, int] = {}
+        profiles = []
+        for thread, stacks in self.stacks.items():
+            samples, weights = [], []
+            for stack, count in stacks.most_common():
+                ids = []
+                for frame in stack:
+                    if frame not in index:
+                        index[frame] = len(frames)
+                        name, path, line = frame
+                        frames.append({"name": name, "file": path, "line": line} if path else {"name": name})
+                    ids.append(index[frame])
+                samples.append(ids)
+                weights.append(count * self.interval)
+            profiles.append({
+                "type": "sampled",
+                "name": thread,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 6),
+                "samples": samples,
+                "weights": weights,
+            })
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "exporter": "aliby-profiler",
+            "name": f"worker {os.getpid()}, {self.samples} samples",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+
+class SamplingProfiler:
+    def __init__(self):
+        self.lock = threading.Lock()  # one profile at a time per worker
+        self.profiles_recorded = 0
+
+    def record(self, seconds: float, interval: float = PROFILER_INTERVAL, all_threads: bool = False,
+               loop: Optional[asyncio.AbstractEventLoop] = None, loop_thread_id: Optional[int] = None) -> Profile:
+        """Blocking: sample for `seconds`; run it in a thread, never on the event loop"""
+        if not self.lock.acquire(blocking=False):
+            raise ProfilerBusy("A profile is already running")
+        try:
+            profile = Profile(interval)
+            own_id = threading.get_ident()
+            deadline = time.monotonic() + min(seconds, PROFILER_MAX_SECONDS)
+            while time.monotonic() < deadline:
+                names = {t.ident: t.name for t in threading.enumerate()}
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own_id or not (all_threads or thread_id == loop_thread_id):
+                        continue
+                    task = None
+                    if thread_id == loop_thread_id and loop is not None:
+                        current = asyncio.current_task(loop)
+                        task = current.get_name() if current else None
+                    profile.add(names.get(thread_id, str(thread_id)), frame, task)
+                profile.samples += 1
+                time.sleep(interval)
+            profile.duration = time.time() - profile.started
+            self.profiles_recorded += 1
+            return profile
+        finally:
+            self.lock.release()
+
+    async def profile(self, seconds: float, interval: float = PROFILER_INTERVAL, all_threads: bool = False) -> Profile:
+        """Profile the calling worker; the event loop keeps serving while samples are taken"""
+        return await asyncio.to_thread(
+            self.record, seconds, interval, all_threads, asyncio.get_running_loop(), threading.get_ident()
+        )
+
+
+# Global instance
+sampling_profiler = SamplingProfiler()
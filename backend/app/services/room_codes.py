@@ -0,0 +1,196 @@
+"""
+Room code allocator: issues unused codes in O(1) without random retry loops.
+
+A counter walks indices 0..26^L-1 and a keyed Feistel permutation maps each index to
+a code, so consecutive rooms get unpredictable but never-repeating codes. Released
+codes go to a free set and are reused first. With the Redis room store, the counter
+and free set live in Redis (INCR/SPOP are atomic), so workers never hand out the
+same code.
+"""
+import hashlib
+import os
+import string
+from collections import deque
+from typing import Optional
+
+ROOM_CODE_LENGTH = int(os.getenv("ROOM_CODE_LENGTH", "4"))
+ROOM_CODE_KEY = os.getenv("ROOM_CODE_KEY", "aliby-room-code-key-change-in-production")
+ROOM_CODE_ALPHABET = string.ascii_uppercase
+FEISTEL_ROUNDS = 4
+FREE_CODE_TRIES = 16  # rejected free codes per allocation before falling back to the counter
+
+
+class RoomCodesExhausted(Exception):
+    """Every code of the configured length is in use"""
+
+
+class FeistelPermutation:
+    """
+    Keyed bijection on [0, size). Balanced Feistel network over the smallest even
+    number of bits that covers size, with cycle walking for out-of-range outputs.
+    """
+
+    def __init__(self, size: int, key: str, rounds: int = FEISTEL_ROUNDS):
+        self.size = size
+        bits = max(2, (size - 1).bit_length())
+        self.half_bits = (bits + 1) // 2
+        self.half_mask = (1 << self.half_bits) - 1
+        self.round_keys = [
+            hashlib.blake2b(f"{key}:{i}".encode(), digest_size=16).digest()
+            for i in range(rounds)
+        ]
+
+    def _round(self, value: int, round_key: bytes) -> int:
+        digest = hashlib.blake2b(value.to_bytes(8, "big"), key=round_key, digest_size=8).digest()
+        return int.from_bytes(digest, "big") & self.half_mask
+
+    def _encrypt(self, value: int) -> int:
+        left, right = value >> self.half_bits, value & self.half_mask
+        for round_key in self.round_keys:
+            left, right = right, left ^ self._round(right, round_key)
+        return (left << self.half_bits) | right
+
+    def permute(self, index: int) -> int:
+        # Domain is < 4x size, so cycle walking takes a few steps on average
+        value = self._encrypt(index)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+
+class LocalCodeCounter:
+    """Process-local counter and free set (memory room store)"""
+
+    def __init__(self):
+        self.next = 0
+        self.free = deque()
+        self.free_codes = set()  # members of self.free, so a code is queued at most once
+
+    async def next_index(self) -> int:
+        index = self.next
+        self.next += 1
+        return index
+
+    async def pop_free(self) -> Optional[str]:
+        if not self.free:
+            return None
+        code = self.free.popleft()
+        self.free_codes.discard(code)
+        return code
+
+    async def push_free(self, code: str):
+        if code not in self.free_codes:
+            self.free_codes.add(code)
+            self.free.append(code)
+
+    async def position(self) -> int:
+        return self.next
+
+    async def free_count(self) -> int:
+        return len(self.free)
+
+
+class RedisCodeCounter:
+    """Counter and free set shared by all workers through Redis"""
+
+    def __init__(self, redis_client, length: int):
+        self.redis = redis_client
+        self.counter_key = f"aliby:room_codes:{length}:next"
+        self.free_key = f"aliby:room_codes:{length}:free_set"
+
+    async def next_index(self) -> int:
+        return await self.redis.incr(self.counter_key) - 1
+
+    async def pop_free(self) -> Optional[str]:
+        code = await self.redis.spop(self.free_key)
+        if code is None:
+            return None
+        return code.decode() if isinstance(code, bytes) else code
+
+    async def push_free(self, code: str):
+        await self.redis.sadd(self.free_key, code)
+
+    async def position(self) -> int:
+        return int(await self.redis.get(self.counter_key) or 0)
+
+    async def free_count(self) -> int:
+        return await self.redis.scard(self.free_key)
+
+
+class RoomCodeAllocator:
+    def __init__(self, counter, length: int = ROOM_CODE_LENGTH, key: str = ROOM_CODE_KEY):
+        self.counter = counter
+        self.length = length
+        self.space = len(ROOM_CODE_ALPHABET) ** length
+        self.permutation = FeistelPermutation(self.space, f"{key}:{length}")
+        self.issued = 0
+        self.released = 0
+        self.skipped = 0
+
+    def encode(self, value: int) -> str:
+        chars = []
+        for _ in range(self.length):
+            value, digit = divmod(value, len(ROOM_CODE_ALPHABET))
+            chars.append(ROOM_CODE_ALPHABET[digit])
+        return "".join(reversed(chars))
+
+    async def allocate(self, accept=None) -> str:
+        """
+        Return an unused code. accept(code) -> bool lets the caller reject codes
+        (e.g. owned by another node or still present after a restart). Rejected
+        fresh codes are skipped; rejected free codes go back to the free set, since
+        they become usable again (room deleted, ownership moved back).
+        """
+        rejected = []
+        try:
+            while True:
+                code = await self.counter.pop_free() if len(rejected) < FREE_CODE_TRIES else None
+                from_free = code is not None
+                if code is None:
+                    index = await self.counter.next_index()
+                    if index >= self.space:
+                        raise RoomCodesExhausted(f"All {self.space} room codes of length {self.length} are in use")
+                    code = self.encode(self.permutation.permute(index))
+                if accept is None or await accept(code):
+                    self.issued += 1
+                    return code
+                self.skipped += 1
+                if from_free:
+                    rejected.append(code)
+        finally:
+            for code in rejected:
+                await self.counter.push_free(code)
+
+    async def release(self, code: str):
+        await self.counter.push_free(code)
+        self.released += 1
+
+    async def stats(self) -> dict:
+        position = min(await self.counter.position(), self.space)
+        free = await self.counter.free_count()
+        in_use = max(position - free, 0)
+        return {
+            "code_length": self.length,
+            "code_space": self.space,
+            "counter_position": position,
+            "free_list": free,
+            "utilization": round(in_use / self.space, 6),
+            "issued": self.issued,
+            "released": self.released,
+            "skipped": self.skipped,
+        }
+
+
+def create_room_code_allocator() -> RoomCodeAllocator:
+    """Share the counter through Redis when rooms are stored there"""
+    from app.services.room_store import ROOM_STORE_BACKEND, REDIS_URL
+    if ROOM_STORE_BACKEND == "redis":
+        import redis.asyncio as redis_asyncio
+        counter = RedisCodeCounter(redis_asyncio.from_url(REDIS_URL or "redis://localhost:6379"), ROOM_CODE_LENGTH)
+    else:
+        counter = LocalCodeCounter()
+    return RoomCodeAllocator(counter)
+
+
+# Global instance
+room_code_allocator = create_room_code_allocator()
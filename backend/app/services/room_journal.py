@@ -0,0 +1,267 @@
+"""
+Crash-safe room persistence on local disk: append-only log plus periodic snapshots.
+
+save()/delete() only mark a room dirty, so the game handlers pay a dict insert. A
+background writer serializes each dirty room once per flush, appends the records to
+rooms.log from a worker thread and fsyncs at most ROOM_JOURNAL_FSYNC_INTERVAL after a
+write, also when no further writes follow. Compaction writes every room to
+snapshot.bin (zlib-compressed, atomic rename) and truncates the log.
+
+One process journals a directory: recover() takes an exclusive flock on journal.lock.
+Another process pointed at the same directory (e.g. a second prefork worker) logs
+journal_locked and runs without the journal instead of interleaving records.
+
+Record framing (log and snapshot): <length:u32><crc32:u32><payload>. Payload is JSON
+{"seq": n, "code": "ABCD", "room": {...}} or {"seq": n, "code": "ABCD"} for deletion.
+Replay stops at the first torn or corrupt record.
+"""
+import asyncio
+import fcntl
+import json
+import os
+import struct
+import time
+import zlib
+from typing import Dict, List, Optional
+from app.room_state import RoomState
+from app.services.room_store import RoomStore
+from app.log import get_logger
+
+log = get_logger(__name__)
+
+ROOM_JOURNAL_DIR = os.getenv("ROOM_JOURNAL_DIR", "")  # Empty = journal disabled
+JOURNAL_FLUSH_INTERVAL = float(os.getenv("ROOM_JOURNAL_FLUSH_INTERVAL", "0.05"))  # seconds
+JOURNAL_FSYNC_INTERVAL = float(os.getenv("ROOM_JOURNAL_FSYNC_INTERVAL", "1.0"))
+SNAPSHOT_INTERVAL = float(os.getenv("ROOM_SNAPSHOT_INTERVAL", "60"))
+SNAPSHOT_MAX_LOG_BYTES = int(os.getenv("ROOM_SNAPSHOT_MAX_LOG_BYTES", str(64 * 1024 * 1024)))
+SNAPSHOT_BATCH_SIZE = 500
+
+RECORD_HEADER = struct.Struct("<II")
+
+# Marker for a deleted room in the dirty set
+DELETED = None
+
+
+def encode_record(payload: dict) -> bytes:
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return RECORD_HEADER.pack(len(data), zlib.crc32(data)) + data
+
+
+def decode_records(buf: bytes) -> List[dict]:
+    records = []
+    offset = 0
+    while offset + RECORD_HEADER.size <= len(buf):
+        length, crc = RECORD_HEADER.unpack_from(buf, offset)
+        start = offset + RECORD_HEADER.size
+        data = buf[start:start + length]
+        if len(data) < length or zlib.crc32(data) != crc:
+            log.warning("journal_torn_record", offset=offset)
+            break
+        records.append(json.loads(data))
+        offset = start + length
+    return records
+
+
+class JournaledRoomStore(RoomStore):
+    """Wraps another store and journals every save/delete to local disk."""
+
+    def __init__(self, inner: RoomStore, directory: str):
+        super().__init__()
+        self.inner = inner
+        self.directory = directory
+        self.log_path = os.path.join(directory, "rooms.log")
+        self.snapshot_path = os.path.join(directory, "snapshot.bin")
+        self.dirty: Dict[str, Optional[RoomState]] = {}
+        self.seq = 0
+        self.log_file = None
+        self.log_bytes = 0
+        self.last_fsync = 0.0
+        self.unsynced = False  # appended since the last fsync
+        self.lock_file = None
+        self.enabled = True  # False when another process holds the directory lock
+        self.last_snapshot = 0.0
+        self.task = None
+        self.stopping = asyncio.Event()
+        self.io_lock = asyncio.Lock()
+
+    # RoomStore interface: hot path only marks rooms dirty
+    def lock(self, room_code: str):
+        return self.inner.lock(room_code)
+
+    async def get(self, room_code: str) -> Optional[RoomState]:
+        return await self.inner.get(room_code)
+
+    async def save(self, room: RoomState) -> None:
+        await self.inner.save(room)
+        if self.enabled:
+            self.dirty[room.room_code] = room
+
+    async def delete(self, room_code: str) -> None:
+        await self.inner.delete(room_code)
+        if self.enabled:
+            self.dirty[room_code] = DELETED
+
+    async def exists(self, room_code: str) -> bool:
+        return await self.inner.exists(room_code)
+
+    async def room_codes(self) -> List[str]:
+        return await self.inner.room_codes()
+
+    async def round_deadline(self, room_code: str) -> float:
+        return await self.inner.round_deadline(room_code)
+
+    # Recovery
+    def _read_rooms(self) -> Dict[str, RoomState]:
+        rooms: Dict[str, RoomState] = {}
+        snapshot_seq = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "rb") as f:
+                snapshot = decode_records(zlib.decompress(f.read()))
+            if snapshot:
+                snapshot_seq = snapshot[0]["seq"]
+                for record in snapshot[1:]:
+                    rooms[record["code"]] = RoomState.from_stored(record["room"])
+        self.seq = snapshot_seq
+        if os.path.exists(self.log_path):
+            with open(self.log_path, "rb") as f:
+                records = decode_records(f.read())
+            for record in records:
+                if record["seq"] <= snapshot_seq:
+                    continue  # Already in snapshot
+                if "room" in record:
+                    rooms[record["code"]] = RoomState.from_stored(record["room"])
+                else:
+                    rooms.pop(record["code"], None)
+                self.seq = max(self.seq, record["seq"])
+        return rooms
+
+    def _lock_directory(self) -> bool:
+        """Exclusive lock on the journal directory, held until stop() or process exit"""
+        lock_file = open(os.path.join(self.directory, "journal.lock"), "a")
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        self.lock_file = lock_file
+        return True
+
+    async def recover(self) -> List[RoomState]:
+        """Load snapshot + log into the inner store. Call once at startup, before start()."""
+        os.makedirs(self.directory, exist_ok=True)
+        if not self._lock_directory():
+            self.enabled = False
+            log.warning("journal_locked", directory=self.directory)
+            return []
+        rooms = await asyncio.to_thread(self._read_rooms)
+        for room in rooms.values():
+            await self.inner.save(room)
+        log.info("journal_recovered", rooms=len(rooms), seq=self.seq)
+        return list(rooms.values())
+
+    # Background writer
+    def _append(self, chunk: bytes, fsync: bool):
+        if self.log_file is None:
+            self.log_file = open(self.log_path, "ab")
+        self.log_file.write(chunk)
+        self.log_file.flush()
+        if fsync:
+            os.fsync(self.log_file.fileno())
+
+    async def flush(self, fsync: bool = False):
+        now = time.monotonic()
+        fsync = fsync or now - self.last_fsync >= JOURNAL_FSYNC_INTERVAL
+        if not self.dirty:
+            # Nothing new, but the tail of earlier flushes still reaches the disk on schedule
+            if fsync and self.unsynced:
+                async with self.io_lock:
+                    await asyncio.to_thread(self._append, b"", True)
+                self.unsynced = False
+                self.last_fsync = now
+            return
+        dirty, self.dirty = self.dirty, {}
+        chunks = []
+        for code, room in dirty.items():
+            self.seq += 1
+            payload = {"seq": self.seq, "code": code}
+            if room is not DELETED:
+                payload["room"] = room.to_dict()
+            chunks.append(encode_record(payload))
+        chunk = b"".join(chunks)
+        async with self.io_lock:
+            await asyncio.to_thread(self._append, chunk, fsync)
+        self.log_bytes += len(chunk)
+        self.unsynced = not fsync
+        if fsync:
+            self.last_fsync = now
+
+    def _write_snapshot(self, data: bytes):
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        # Everything in the log is covered by the snapshot now
+        if self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
+        with open(self.log_path, "wb") as f:
+            os.fsync(f.fileno())
+
+    async def snapshot(self):
+        """Compact: write all rooms to snapshot.bin and truncate the log"""
+        await self.flush(fsync=True)
+        snapshot_seq = self.seq
+        chunks = [encode_record({"seq": snapshot_seq})]
+        codes = await self.inner.room_codes()
+        for start in range(0, len(codes), SNAPSHOT_BATCH_SIZE):
+            for code in codes[start:start + SNAPSHOT_BATCH_SIZE]:
+                room = await self.inner.get(code)
+                if room is not None:
+                    chunks.append(encode_record({
+                        "seq": snapshot_seq,
+                        "code": code,
+                        "room": room.to_dict(),
+                    }))
+            await asyncio.sleep(0)
+        # Changes made while serializing are still dirty and go to the fresh log
+        data = zlib.compress(b"".join(chunks), 1)
+        async with self.io_lock:
+            await asyncio.to_thread(self._write_snapshot, data)
+        self.log_bytes = 0
+        self.last_snapshot = time.monotonic()
+
+    async def run(self):
+        self.last_snapshot = time.monotonic()
+        while not self.stopping.is_set():
+            try:
+                await asyncio.wait_for(self.stopping.wait(), JOURNAL_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush()
+                # Compact only when the log has grown since the last snapshot
+                if self.log_bytes and (time.monotonic() - self.last_snapshot >= SNAPSHOT_INTERVAL
+                                       or self.log_bytes >= SNAPSHOT_MAX_LOG_BYTES):
+                    await self.snapshot()
+            except Exception:
+                log.exception("journal_write_failed")
+
+    def start(self):
+        if self.task is None and self.enabled:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        # Let an in-progress flush or snapshot finish instead of cancelling mid-write
+        if self.task is not None:
+            self.stopping.set()
+            await self.task
+            self.task = None
+        await self.flush(fsync=True)
+        if self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
+        if self.lock_file is not None:
+            self.lock_file.close()
+            self.lock_file = None
@@ -0,0 +1,158 @@
+"""
+Room lifecycle: TTL-based eviction of abandoned lobbies, idle games and finished rooms.
+
+A background sweep walks the room store in small batches, yielding to the event loop
+between batches, and evicts rooms whose last activity is older than the TTL for their
+status. Modules that keep per-room state register eviction hooks to release it.
+"""
+import asyncio
+import json
+import os
+import time
+from typing import Awaitable, Callable, Dict, List
+from app.models import GameStatus
+from app.room_state import RoomState
+from app.services.room_store import room_store, RoomLockTimeout
+from app.services.word_service import word_service
+from app.log import get_logger
+from app import metrics
+
+log = get_logger(__name__)
+
+LOBBY_TTL = float(os.getenv("ROOM_LOBBY_TTL", str(30 * 60)))  # seconds
+PLAYING_IDLE_TTL = float(os.getenv("ROOM_PLAYING_IDLE_TTL", str(60 * 60)))
+FINISHED_TTL = float(os.getenv("ROOM_FINISHED_TTL", str(10 * 60)))
+SWEEP_INTERVAL = float(os.getenv("ROOM_SWEEP_INTERVAL", "30"))
+SWEEP_BATCH_SIZE = int(os.getenv("ROOM_SWEEP_BATCH_SIZE", "200"))
+ROOM_ARCHIVE_PATH = os.getenv("ROOM_ARCHIVE_PATH", "")  # JSONL file for finished rooms (empty = off)
+
+# Hook called with the evicted room after it is removed from the store
+EvictionHook = Callable[[RoomState], Awaitable[None]]
+
+
+class RoomLifecycleManager:
+    def __init__(self):
+        self.ttls = {
+            GameStatus.LOBBY: LOBBY_TTL,
+            GameStatus.PLAYING: PLAYING_IDLE_TTL,
+            GameStatus.FINISHED: FINISHED_TTL,
+        }
+        self.hooks: List[EvictionHook] = []
+        self.task = None
+        # Metrics: room counts per status from the last full sweep, evictions per status
+        self.rooms_by_status: Dict[str, int] = {s.value: 0 for s in GameStatus}
+        self.evictions: Dict[str, int] = {s.value: 0 for s in GameStatus}
+        self.archived = 0
+        self.last_sweep_duration = 0.0
+
+    def add_eviction_hook(self, hook: EvictionHook):
+        self.hooks.append(hook)
+
+    def is_expired(self, room: RoomState, now: float) -> bool:
+        return now - room.last_activity_at > self.ttls[room.status]
+
+    async def evict_expired(self, room_code: str) -> bool:
+        """
+        Evict under the room lock, re-checking the TTL: a handler in the middle of a
+        message finishes and saves first, and cannot re-create the room afterwards.
+        """
+        try:
+            async with room_store.lock(room_code):
+                room = await room_store.get(room_code)
+                if room is None or not self.is_expired(room, time.time()):
+                    return False
+                await self.evict(room)
+                return True
+        except RoomLockTimeout:
+            log.warning("eviction_skipped_locked", room=room_code)
+            return False
+
+    async def evict(self, room: RoomState):
+        """Archive and release a room; the caller holds room_store.lock(room.room_code)"""
+        if room.status == GameStatus.FINISHED and ROOM_ARCHIVE_PATH:
+            await asyncio.to_thread(self._archive, room)
+        await self.release(room)
+        self.evictions[room.status.value] += 1
+
+    async def release(self, room: RoomState):
+        """Remove a room from this node and run the eviction hooks (eviction and handoff)"""
+        # Delete first: a hook frees the room code, and allocate() must not find it still taken
+        await room_store.delete(room.room_code)
+        for hook in self.hooks:
+            try:
+                await hook(room)
+            except Exception:
+                log.exception("eviction_hook_failed", room=room.room_code)
+        word_service.clear_room_words(room.room_code)
+
+    def _archive(self, room: RoomState):
+        with open(ROOM_ARCHIVE_PATH, "a") as f:
+            f.write(json.dumps(room.to_dict(), separators=(",", ":")) + "\n")
+        self.archived += 1
+
+    async def sweep(self):
+        """One incremental pass over all rooms"""
+        started = time.perf_counter()
+        codes = await room_store.room_codes()
+        counts = {s.value: 0 for s in GameStatus}
+
+        for start in range(0, len(codes), SWEEP_BATCH_SIZE):
+            now = time.time()
+            for code in codes[start:start + SWEEP_BATCH_SIZE]:
+                room = await room_store.get(code)
+                if room is None:
+                    continue
+                if self.is_expired(room, now) and await self.evict_expired(code):
+                    continue
+                counts[room.status.value] += 1
+            # Let game traffic run between batches
+            await asyncio.sleep(0)
+
+        # Drop used-word sets of rooms that no longer exist here (evicted elsewhere or handed off)
+        live = set(codes)
+        for code in list(word_service.used_words_per_room):
+            if code not in live and not await room_store.exists(code):
+                word_service.clear_room_words(code)
+
+        self.rooms_by_status = counts
+        self.last_sweep_duration = time.perf_counter() - started
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(SWEEP_INTERVAL)
+            try:
+                await self.sweep()
+            except Exception:
+                log.exception("sweep_failed")
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    def stats(self) -> dict:
+        return {
+            "rooms_by_status": dict(self.rooms_by_status),
+            "evictions": dict(self.evictions),
+            "archived": self.archived,
+            "last_sweep_seconds": round(self.last_sweep_duration, 4),
+            "ttl_seconds": {s.value: ttl for s, ttl in self.ttls.items()},
+        }
+
+
+# Global instance
+room_lifecycle = RoomLifecycleManager()
+
+metrics.registry.register(metrics.GaugeFunc(
+    "aliby_rooms", "Rooms by status at the last eviction sweep", lambda: dict(room_lifecycle.rooms_by_status),
+    ("status",),
+))
+metrics.registry.register(metrics.CounterFunc(
+    "aliby_room_evictions_total", "Rooms evicted since start, by status", lambda: dict(room_lifecycle.evictions),
+    ("status",),
+))
@@ -0,0 +1,203 @@
+"""
+Consistent-hash room sharding: every room code has exactly one owner node.
+
+The owner keeps the authoritative GameRoom and its timers in memory. Other nodes
+forward WebSocket and REST traffic for that room to the owner, so game events never
+need a network round trip for shared state.
+
+Cluster membership comes from CLUSTER_NODES, e.g.
+    CLUSTER_NODES=node1=http://backend1:8000,node2=http://backend2:8000
+    NODE_ID=node1
+Without CLUSTER_NODES the node owns every room and routing is a no-op.
+"""
+import asyncio
+import bisect
+import hashlib
+import os
+from typing import Dict, List, Optional, Set, Tuple
+from app.log import get_logger
+
+log = get_logger(__name__)
+
+NODE_ID = os.getenv("NODE_ID", "local")
+CLUSTER_NODES = os.getenv("CLUSTER_NODES", "")
+CLUSTER_SECRET = os.getenv("CLUSTER_SECRET", "")  # unset: /internal endpoints are disabled
+RING_VNODES = int(os.getenv("RING_VNODES", "64"))
+
+# Close code sent to forwarded sockets when a room moves to another owner
+ROOM_MOVED_CLOSE_CODE = 4001
+# Close code sent to a client when its room's owner cannot be reached (Try Again Later)
+OWNER_UNAVAILABLE_CLOSE_CODE = 1013
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring with virtual nodes. Adding or removing a node moves ~1/N of keys."""
+
+    def __init__(self, nodes: Optional[List[str]] = None, vnodes: int = RING_VNODES):
+        self.vnodes = vnodes
+        self.points: List[int] = []
+        self.owners: List[str] = []
+        self.nodes: set = set()
+        for node in nodes or []:
+            self.add_node(node)
+
+    def add_node(self, node: str):
+        if node in self.nodes:
+            return
+        self.nodes.add(node)
+        for i in range(self.vnodes):
+            point = _hash(f"{node}#{i}")
+            index = bisect.bisect(self.points, point)
+            self.points.insert(index, point)
+            self.owners.insert(index, node)
+
+    def remove_node(self, node: str):
+        if node not in self.nodes:
+            return
+        self.nodes.discard(node)
+        kept = [(p, o) for p, o in zip(self.points, self.owners) if o != node]
+        self.points = [p for p, _ in kept]
+        self.owners = [o for _, o in kept]
+
+    def get_node(self, key: str) -> Optional[str]:
+        if not self.points:
+            return None
+        index = bisect.bisect(self.points, _hash(key)) % len(self.points)
+        return self.owners[index]
+
+
+def parse_cluster_nodes(spec: str) -> Dict[str, str]:
+    """Parse 'id=url,id=url' into {id: url}"""
+    nodes = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        node_id, _, url = item.partition("=")
+        nodes[node_id.strip()] = url.strip().rstrip("/")
+    return nodes
+
+
+class RoomRouter:
+    def __init__(self, node_id: str = NODE_ID, nodes: Optional[Dict[str, str]] = None):
+        self.node_id = node_id
+        self.node_urls: Dict[str, str] = {}
+        self.ring = HashRing()
+        self.retained: Set[str] = set()  # rooms kept here after a failed handoff, until one succeeds
+        self.set_nodes(nodes or {})
+
+    @property
+    def clustered(self) -> bool:
+        return bool(self.node_urls) and list(self.node_urls) != [self.node_id]
+
+    def set_nodes(self, nodes: Dict[str, str]):
+        """Replace membership. A node missing from the list owns no rooms (drained)."""
+        nodes = dict(nodes)
+        for node in list(self.ring.nodes):
+            if node not in nodes:
+                self.ring.remove_node(node)
+        for node in nodes:
+            self.ring.add_node(node)
+        self.node_urls = nodes
+
+    def ring_owner(self, room_code: str) -> str:
+        if not self.clustered:
+            return self.node_id
+        return self.ring.get_node(room_code)
+
+    def owner(self, room_code: str) -> str:
+        """Ring owner, except that a room whose handoff failed stays with this node"""
+        if room_code in self.retained:
+            return self.node_id
+        return self.ring_owner(room_code)
+
+    def is_local(self, room_code: str) -> bool:
+        return not self.clustered or self.owner(room_code) == self.node_id
+
+    def owner_url(self, room_code: str) -> str:
+        return self.node_urls[self.owner(room_code)]
+
+    def moved_rooms(self, room_codes: List[str]) -> List[Tuple[str, str]]:
+        """Local rooms that now belong to another node: [(room_code, new_owner)]"""
+        return [
+            (code, self.ring_owner(code))
+            for code in room_codes
+            if self.ring_owner(code) != self.node_id
+        ]
+
+
+async def forward_request(request, room_code: str):
+    """Proxy a REST request to the room owner and relay its response"""
+    import httpx
+    from fastapi import Response
+
+    url = room_router.owner_url(room_code) + request.url.path
+    headers = {k: v for k, v in request.headers.items() if k.lower() not in ("host", "content-length")}
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        upstream = await client.request(
+            request.method,
+            url,
+            params=request.query_params,
+            headers=headers,
+            content=await request.body(),
+        )
+    return Response(
+        content=upstream.content,
+        status_code=upstream.status_code,
+        media_type=upstream.headers.get("content-type"),
+    )
+
+
+async def forward_websocket(websocket, room_code: str):
+    """
+    Pipe an accepted client socket to the owner's /ws/game/{room_code}.
+    If the owner hands the room off (close code ROOM_MOVED_CLOSE_CODE), reconnect to the new owner.
+    """
+    import websockets
+    from fastapi import WebSocketDisconnect
+
+    client_gone = False
+    while not client_gone:
+        owner_url = room_router.owner_url(room_code)
+        ws_url = owner_url.replace("http://", "ws://").replace("https://", "wss://")
+        try:
+            upstream = await websockets.connect(f"{ws_url}/ws/game/{room_code}", open_timeout=10)
+        except (OSError, asyncio.TimeoutError, websockets.InvalidHandshake) as e:
+            log.warning("ws_forward_failed", room=room_code, owner=owner_url, error=str(e))
+            await websocket.close(code=OWNER_UNAVAILABLE_CLOSE_CODE)
+            return
+        try:
+
+            async def client_to_owner():
+                nonlocal client_gone
+                try:
+                    while True:
+                        await upstream.send(await websocket.receive_text())
+                except WebSocketDisconnect:
+                    client_gone = True
+
+            async def owner_to_client():
+                async for message in upstream:
+                    await websocket.send_text(message)
+
+            tasks = [asyncio.create_task(client_to_owner()), asyncio.create_task(owner_to_client())]
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            if client_gone or upstream.close_code != ROOM_MOVED_CLOSE_CODE:
+                break
+        finally:
+            await upstream.close()
+
+    if not client_gone:
+        await websocket.close()
+
+
+# Global instance
+room_router = RoomRouter(NODE_ID, parse_cluster_nodes(CLUSTER_NODES))
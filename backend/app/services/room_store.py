@@ -0,0 +1,222 @@
+"""
+Room storage backends: in-memory (single worker) and Redis (shared, survives restarts)
+
+Game handlers and timers read a room, mutate it and save it back. They do that inside
+room_store.lock(room_code), so two tasks or two workers never interleave on one room
+and a save never overwrites a change it has not seen.
+"""
+import asyncio
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+from app.models import GameStatus
+from app.room_state import RoomState
+
+REDIS_URL = os.getenv("REDIS_URL", "")
+ROOM_STORE_BACKEND = os.getenv("ROOM_STORE", "redis" if REDIS_URL else "memory")
+ROOM_KEY_PREFIX = "aliby:room:"
+ROOM_INDEX_KEY = "aliby:rooms"
+ROOM_LOCK_PREFIX = "aliby:room_lock:"
+ROOM_ROUND_PREFIX = "aliby:room_round:"
+ROOM_LOCK_TTL = float(os.getenv("ROOM_LOCK_TTL", "5"))  # seconds before a lock of a crashed worker expires
+ROOM_LOCK_TIMEOUT = float(os.getenv("ROOM_LOCK_TIMEOUT", "10"))  # seconds to wait for a room lock
+
+
+class RoomLockTimeout(Exception):
+    """A room stayed locked by another worker for longer than ROOM_LOCK_TIMEOUT"""
+
+
+class RoomLocks:
+    """Per-room asyncio locks, dropped as soon as nobody holds or waits for them"""
+
+    def __init__(self):
+        self.locks: Dict[str, asyncio.Lock] = {}
+        self.users: Dict[str, int] = {}
+
+    @asynccontextmanager
+    async def hold(self, room_code: str):
+        lock = self.locks.get(room_code)
+        if lock is None:
+            lock = self.locks[room_code] = asyncio.Lock()
+            self.users[room_code] = 0
+        self.users[room_code] += 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self.users[room_code] -= 1
+            if not self.users[room_code]:
+                del self.locks[room_code]
+                del self.users[room_code]
+
+
+class RoomStore:
+    """Interface for room storage. All methods are async so Redis I/O never blocks the loop."""
+
+    def __init__(self):
+        self.locks = RoomLocks()
+
+    def lock(self, room_code: str):
+        """Async context manager serializing get -> mutate -> save of one room (not reentrant)"""
+        return self.locks.hold(room_code)
+
+    async def get(self, room_code: str) -> Optional[RoomState]:
+        raise NotImplementedError
+
+    async def save(self, room: RoomState) -> None:
+        raise NotImplementedError
+
+    async def delete(self, room_code: str) -> None:
+        raise NotImplementedError
+
+    async def exists(self, room_code: str) -> bool:
+        raise NotImplementedError
+
+    async def room_codes(self) -> List[str]:
+        raise NotImplementedError
+
+    async def round_deadline(self, room_code: str) -> float:
+        """round_ends_at of a playing room, 0.0 otherwise; cheap enough for every timer tick"""
+        raise NotImplementedError
+
+
+def round_deadline_of(room: Optional[RoomState]) -> float:
+    if room is None or room.status != GameStatus.PLAYING:
+        return 0.0
+    return room.round_ends_at
+
+
+class InMemoryRoomStore(RoomStore):
+    """Rooms live in a process-local dict. Mutations on returned rooms are live."""
+
+    def __init__(self):
+        super().__init__()
+        self.rooms: Dict[str, RoomState] = {}
+
+    async def get(self, room_code: str) -> Optional[RoomState]:
+        return self.rooms.get(room_code)
+
+    async def save(self, room: RoomState) -> None:
+        self.rooms[room.room_code] = room
+
+    async def delete(self, room_code: str) -> None:
+        self.rooms.pop(room_code, None)
+
+    async def exists(self, room_code: str) -> bool:
+        return room_code in self.rooms
+
+    async def room_codes(self) -> List[str]:
+        return list(self.rooms.keys())
+
+    async def round_deadline(self, room_code: str) -> float:
+        return round_deadline_of(self.rooms.get(room_code))
+
+
+class RedisRoomStore(RoomStore):
+    """
+    Rooms are stored as compact JSON under aliby:room:{code}, with a set index of codes.
+    The round deadline is also kept under aliby:room_round:{code}, so round timers can
+    check it every second without loading the room.
+    Every worker reads the same keys, so rooms survive restarts and are visible everywhere.
+    Callers must save() after mutating a room returned by get(), under lock(room_code).
+    """
+
+    def __init__(self, redis_client):
+        super().__init__()
+        self.redis = redis_client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisRoomStore":
+        import redis.asyncio as redis_asyncio
+        return cls(redis_asyncio.from_url(url))
+
+    @staticmethod
+    def serialize(room: RoomState) -> bytes:
+        return json.dumps(room.to_dict(), separators=(",", ":")).encode()
+
+    @staticmethod
+    def deserialize(raw: bytes) -> RoomState:
+        return RoomState.from_stored(raw)
+
+    @asynccontextmanager
+    async def lock(self, room_code: str):
+        """Local lock first (no Redis polling between tasks of this worker), then the shared one"""
+        async with self.locks.hold(room_code):
+            key = ROOM_LOCK_PREFIX + room_code
+            token = os.urandom(16).hex().encode()
+            deadline = time.monotonic() + ROOM_LOCK_TIMEOUT
+            delay = 0.002
+            while not await self.redis.set(key, token, nx=True, px=int(ROOM_LOCK_TTL * 1000)):
+                if time.monotonic() >= deadline:
+                    raise RoomLockTimeout(f"Room {room_code} is locked by another worker")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.05)
+            try:
+                yield
+            finally:
+                await self._unlock(key, token)
+
+    async def _unlock(self, key: str, token: bytes):
+        """Delete the lock only if it is still ours (it may have expired and been taken)"""
+        from redis.exceptions import WatchError
+        async with self.redis.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                if await pipe.get(key) == token:
+                    pipe.multi()
+                    pipe.delete(key)
+                    await pipe.execute()
+            except WatchError:
+                pass
+
+    async def get(self, room_code: str) -> Optional[RoomState]:
+        raw = await self.redis.get(ROOM_KEY_PREFIX + room_code)
+        if raw is None:
+            return None
+        return self.deserialize(raw)
+
+    async def save(self, room: RoomState) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(ROOM_KEY_PREFIX + room.room_code, self.serialize(room))
+            pipe.set(ROOM_ROUND_PREFIX + room.room_code, repr(round_deadline_of(room)))
+            pipe.sadd(ROOM_INDEX_KEY, room.room_code)
+            await pipe.execute()
+
+    async def delete(self, room_code: str) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(ROOM_KEY_PREFIX + room_code, ROOM_ROUND_PREFIX + room_code)
+            pipe.srem(ROOM_INDEX_KEY, room_code)
+            await pipe.execute()
+
+    async def exists(self, room_code: str) -> bool:
+        return bool(await self.redis.exists(ROOM_KEY_PREFIX + room_code))
+
+    async def room_codes(self) -> List[str]:
+        codes = await self.redis.smembers(ROOM_INDEX_KEY)
+        return sorted(c.decode() if isinstance(c, bytes) else c for c in codes)
+
+    async def round_deadline(self, room_code: str) -> float:
+        raw = await self.redis.get(ROOM_ROUND_PREFIX + room_code)
+        return float(raw) if raw is not None else 0.0
+
+
+def create_room_store() -> RoomStore:
+    """
+    Pick backend from ROOM_STORE env (memory/redis). Defaults to redis when REDIS_URL is set.
+    With ROOM_JOURNAL_DIR set, the store is wrapped with a crash-safe local journal.
+    """
+    if ROOM_STORE_BACKEND == "redis":
+        store = RedisRoomStore.from_url(REDIS_URL or "redis://localhost:6379")
+    else:
+        store = InMemoryRoomStore()
+
+    from app.services.room_journal import ROOM_JOURNAL_DIR, JournaledRoomStore
+    if ROOM_JOURNAL_DIR:
+        store = JournaledRoomStore(store, ROOM_JOURNAL_DIR)
+    return store
+
+
+# Global instance
+room_store = create_room_store()
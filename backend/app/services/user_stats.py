@@ -0,0 +1,144 @@
+"""
+Per-user statistics kept as one user_stats row per user.
+
+The history writer adds each batch of saved games to user_stats in the same
+transaction as the game_history insert, so reading stats is a primary-key lookup.
+For rows saved before the table existed, run the backfill:
+
+    python -m app.services.user_stats backfill
+
+It recomputes each game's score/won from the stored teams JSON, then rebuilds
+user_stats from game_history with a single INSERT ... SELECT ... GROUP BY.
+"""
+import argparse
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List
+from sqlalchemy import bindparam, case, func, select, text, update
+from app.database import SessionLocal, dialect_insert
+from app.db_models import GameHistory, User, UserStats
+from app.services.leaderboard import player_outcome
+
+BACKFILL_CHUNK_SIZE = 1000
+
+
+async def apply_games(db, rows: List[dict]):
+    """Add saved game_history rows to user_stats (caller commits)"""
+    totals: Dict[int, List[float]] = defaultdict(lambda: [0.0, 0, 0, 0])
+    for row in rows:
+        total = totals[row["user_id"]]
+        total[0] += row["score"]
+        total[1] += 1
+        total[2] += 1 if row["won"] else 0
+        total[3] += row["guessed_words_count"]
+    if not totals:
+        return
+
+    now = datetime.utcnow()
+    # Sorted keys give concurrent workers the same lock order
+    stmt = dialect_insert(db, UserStats).values([
+        {"user_id": user_id, "total_score": score, "games_played": games,
+         "wins": wins, "words_guessed": words, "updated_at": now}
+        for user_id, (score, games, wins, words) in sorted(totals.items())
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={
+            "total_score": UserStats.total_score + stmt.excluded.total_score,
+            "games_played": UserStats.games_played + stmt.excluded.games_played,
+            "wins": UserStats.wins + stmt.excluded.wins,
+            "words_guessed": UserStats.words_guessed + stmt.excluded.words_guessed,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    await db.execute(stmt)
+
+
+def to_response(user_id: int, stats) -> dict:
+    games = stats.games_played if stats else 0
+    return {
+        "user_id": user_id,
+        "total_score": stats.total_score if stats else 0,
+        "games_played": games,
+        "wins": stats.wins if stats else 0,
+        "avg_words_per_game": round(stats.words_guessed / games, 2) if games else 0.0,
+    }
+
+
+def backfill_outcomes(db) -> int:
+    """Recompute score/won of every game_history row from its teams JSON, in id order chunks"""
+    stmt = (
+        update(GameHistory)
+        .where(GameHistory.id == bindparam("game_id"))
+        .values(score=bindparam("new_score"), won=bindparam("new_won"))
+    )
+    last_id, updated = 0, 0
+    while True:
+        rows = db.execute(
+            select(GameHistory.id, GameHistory.teams, GameHistory.winner, User.username)
+            .join(User, User.id == GameHistory.user_id)
+            .where(GameHistory.id > last_id)
+            .order_by(GameHistory.id)
+            .limit(BACKFILL_CHUNK_SIZE)
+        ).all()
+        if not rows:
+            return updated
+        params = []
+        for game_id, teams, winner, username in rows:
+            score, won = player_outcome(teams or [], winner, username)
+            params.append({"game_id": game_id, "new_score": score, "new_won": won})
+        db.connection().execute(stmt, params)
+        db.commit()
+        updated += len(rows)
+        last_id = rows[-1][0]
+
+
+def backfill_stats(db) -> int:
+    """Rebuild user_stats from game_history in one statement and transaction"""
+    if db.bind.dialect.name == "postgresql":
+        # Blocks history inserts until commit, so no batch is counted twice or lost
+        db.execute(text("LOCK TABLE game_history IN SHARE MODE"))
+    totals = select(
+        GameHistory.user_id,
+        func.sum(GameHistory.score),
+        func.count(GameHistory.id),
+        func.sum(case((GameHistory.won, 1), else_=0)),
+        func.sum(GameHistory.guessed_words_count),
+        func.max(GameHistory.played_at),
+    ).group_by(GameHistory.user_id)
+    stmt = dialect_insert(db, UserStats).from_select(
+        ["user_id", "total_score", "games_played", "wins", "words_guessed", "updated_at"], totals
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={
+            "total_score": stmt.excluded.total_score,
+            "games_played": stmt.excluded.games_played,
+            "wins": stmt.excluded.wins,
+            "words_guessed": stmt.excluded.words_guessed,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    result = db.execute(stmt)
+    db.commit()
+    return result.rowcount
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-user statistics maintenance")
+    parser.add_argument("command", choices=["backfill"])
+    parser.add_argument("--skip-outcomes", action="store_true",
+                        help="trust stored score/won instead of recomputing them from teams JSON")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        if not args.skip_outcomes:
+            print(f"[UserStats] Recomputed outcomes of {backfill_outcomes(db)} games")
+        print(f"[UserStats] Rebuilt stats of {backfill_stats(db)} users")
+    print(f"[UserStats] Backfill finished in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
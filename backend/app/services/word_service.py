@@ -1,26 +1,71 @@
 import json
+import os
 import random
 from pathlib import Path
 from typing import List, Optional
-from app.models import Word, GameMode, Difficulty
+from app.models import GameMode, Difficulty
+from app.room_state import WordState
+from app.log import get_logger
+from app import tracing
 
-# Load word data
+log = get_logger(__name__)
+
+# Word data (loaded by WordService.load(), not at import)
 DATA_DIR = Path(__file__).parent.parent / "data"
-ALIAS_WORDS = json.loads((DATA_DIR / "words_alias.json").read_text())
-TABOO_WORDS = json.loads((DATA_DIR / "words_taboo.json").read_text())
+
+# Tier changes suggested by the retier job (python -m app.services.word_stats retier).
+# Kept in a separate file: the pack files themselves are never rewritten.
+WORD_TIER_OVERRIDES_PATH = Path(os.getenv("WORD_TIER_OVERRIDES_PATH", str(DATA_DIR / "word_tier_overrides.json")))
+RETIERED = ("easy", "medium", "hard")
+
+
+def apply_tier_overrides(packs: dict, overrides: dict) -> int:
+    """Move words between easy/medium/hard lists in place. overrides: {word: tier}"""
+    moved = 0
+    for tier in RETIERED:
+        keep = []
+        for entry in packs.get(tier, []):
+            target = overrides.get(entry["word"], tier)
+            if target != tier and target in RETIERED:
+                packs.setdefault(target, []).append(entry)
+                moved += 1
+            else:
+                keep.append(entry)
+        packs[tier] = keep
+    return moved
+
+
+def load_packs() -> dict:
+    """Parse word packs and apply tier overrides: {GameMode: {tier: [entry, ...]}}"""
+    packs = {
+        GameMode.ALIAS: json.loads((DATA_DIR / "words_alias.json").read_text()),
+        GameMode.TABOO: json.loads((DATA_DIR / "words_taboo.json").read_text()),
+    }
+    if WORD_TIER_OVERRIDES_PATH.exists():
+        overrides = json.loads(WORD_TIER_OVERRIDES_PATH.read_text())
+        moved = sum(apply_tier_overrides(packs[mode], overrides.get(mode.value, {})) for mode in packs)
+        log.info("tier_overrides_applied", words=moved, path=WORD_TIER_OVERRIDES_PATH.name)
+    return packs
 
 
 class WordService:
     def __init__(self):
         # Track used words per room: {room_code: set(word1, word2, ...)}
         self.used_words_per_room = {}
+        self.packs: Optional[dict] = None
+    
+    def load(self):
+        """Load word packs once (startup warm-up; first use loads them otherwise)"""
+        if self.packs is None:
+            self.packs = load_packs()
     
+    @tracing.traced("word_draw")
     def get_random_word(
         self, 
         mode: GameMode, 
         difficulty: Difficulty,
         room_code: str
-    ) -> Optional[Word]:
+    ) -> Optional[WordState]:
         """Get random UNIQUE word based on mode and difficulty"""
         
         # Initialize room's used words set
@@ -34,19 +79,17 @@ class WordService:
             difficulty = random.choice([Difficulty.EASY, Difficulty.MEDIUM, Difficulty.HARD])
         
         # Select word pool
-        if mode == GameMode.ALIAS:
-            words = ALIAS_WORDS.get(difficulty.value, [])
-        elif mode == GameMode.TABOO:
-            words = TABOO_WORDS.get(difficulty.value, [])
-        else:
+        self.load()
+        if mode not in self.packs:
             return None
+        words = self.packs[mode].get(difficulty.value, [])
         
         # Filter out already used words
         available_words = [w for w in words if w["word"] not in used_words]
         
         # If all words used, reset the pool
         if not available_words:
-            print(f"[WordService] All words used in room {room_code}, resetting pool")
+            log.debug("word_pool_reset", room=room_code)
             used_words.clear()
             available_words = words
         
@@ -59,13 +102,13 @@ class WordService:
         # Mark as used
         used_words.add(word_data["word"])
         
-        # Return Word object
-        return Word(
+        # Return lightweight word state (taboo list is shared with the pack, not copied)
+        return WordState(
             word=word_data["word"],
             taboo_words=word_data.get("taboo_words", []),
-            difficulty=0.5,  # Legacy field, not used
+            translation=word_data.get("translation", ""),
             category="general",
-            translation=word_data.get("translation", "")
+            tier=difficulty.value
         )
     
     def clear_room_words(self, room_code: str):
@@ -77,7 +120,7 @@ class WordService:
         self,
         mode: GameMode,
         room_code: str
-    ) -> Optional[Word]:
+    ) -> Optional[WordState]:
         """Get word with mixed difficulty (random)"""
         difficulties = [Difficulty.EASY, Difficulty.MEDIUM, Difficulty.HARD]
         chosen_difficulty = random.choice(difficulties)
@@ -0,0 +1,237 @@
+"""
+Word-level analytics: normalized per-word guess records.
+
+Rooms log each word's outcome (guessed, skipped, removed in review) while a game is
+played. At game end the log is written in one transaction: new words are added to
+pack_words under a stable id derived from (mode, word), and one word_guesses row per
+event is inserted in bulk. Aggregates (most skipped words, guess rate per tier) are
+GROUP BY queries on indexed columns, so nothing is parsed in Python.
+
+The offline retier job computes each word's guess rate and writes tier suggestions to
+WORD_TIER_OVERRIDES_PATH, which word_service applies when packs are loaded:
+
+    python -m app.services.word_stats retier [--min-samples 20] [--write]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import List, Optional, Set
+from sqlalchemy import case, func, select, update, bindparam
+from app.database import AsyncSessionLocal, SessionLocal, dialect_insert
+from app.db_models import PackWord, WordGuess
+from app.log import get_logger
+
+log = get_logger(__name__)
+
+WORD_TIER_EASY_RATE = float(os.getenv("WORD_TIER_EASY_RATE", "0.8"))  # guess rate at or above -> easy
+WORD_TIER_HARD_RATE = float(os.getenv("WORD_TIER_HARD_RATE", "0.5"))  # guess rate below -> hard
+WORD_TIER_MIN_SAMPLES = int(os.getenv("WORD_TIER_MIN_SAMPLES", "20"))
+
+
+def word_id(mode: str, word: str) -> int:
+    """Stable 63-bit id: the same word gets the same id in every process and database"""
+    digest = hashlib.blake2b(f"{mode}:{word}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") >> 1
+
+
+guessed_count = func.sum(case((WordGuess.outcome == "guessed", 1), else_=0))
+skipped_count = func.sum(case((WordGuess.outcome == "skipped", 1), else_=0))
+samples_count = func.count(WordGuess.id)
+
+
+class WordGuessRecorder:
+    """Writes a finished room's word log in the background; stop() waits for pending writes"""
+
+    def __init__(self):
+        self.tasks: Set[asyncio.Task] = set()
+        self.games_written = 0
+        self.rows_written = 0
+        self.failed = 0
+
+    def record(self, room):
+        if not room.word_log:
+            return
+        events, room.word_log = room.word_log, []
+        task = asyncio.create_task(self.write(room.room_code, room.mode.value, events))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def write(self, room_code: str, mode: str, events: list):
+        played_at = datetime.utcnow()
+        words = {}
+        rows = []
+        for event in events:
+            wid = word_id(mode, event.word)
+            words.setdefault(wid, {"id": wid, "mode": mode, "word": event.word, "tier": event.tier, "samples": 0})
+            rows.append({
+                "word_id": wid,
+                "room_code": room_code,
+                "played_at": played_at,
+                "tier": event.tier,
+                "outcome": event.outcome,
+                "used_translation": event.used_translation,
+            })
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    dialect_insert(db, PackWord)
+                    .values([words[wid] for wid in sorted(words)])
+                    .on_conflict_do_nothing(index_elements=["id"])
+                )
+                await db.execute(WordGuess.__table__.insert(), rows)
+                await db.commit()
+        except Exception:
+            self.failed += 1
+            log.exception("word_guesses_write_failed", room=room_code, rows=len(rows))
+            return
+        self.games_written += 1
+        self.rows_written += len(rows)
+
+    async def stop(self):
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self.tasks),
+            "games_written": self.games_written,
+            "rows_written": self.rows_written,
+            "failed": self.failed,
+        }
+
+
+async def word_stats(db, mode: str, order: str, limit: int, min_samples: int) -> List[dict]:
+    """Per-word guessed/skipped counts. order: "skipped", "hardest" or "easiest" """
+    guess_rate = (guessed_count * 1.0 / samples_count).label("guess_rate")
+    order_by = {
+        "skipped": [skipped_count.desc()],
+        "hardest": [guess_rate.asc()],
+        "easiest": [guess_rate.desc()],
+    }[order]
+    result = await db.execute(
+        select(
+            PackWord.word,
+            PackWord.tier,
+            guessed_count.label("guessed"),
+            skipped_count.label("skipped"),
+            samples_count.label("samples"),
+            guess_rate,
+        )
+        .join(PackWord, PackWord.id == WordGuess.word_id)
+        .where(PackWord.mode == mode)
+        .group_by(PackWord.id, PackWord.word, PackWord.tier)
+        .having(samples_count >= min_samples)
+        .order_by(*order_by, PackWord.id)
+        .limit(limit)
+    )
+    return [dict(row) for row in result.mappings().all()]
+
+
+async def tier_stats(db, mode: Optional[str] = None) -> List[dict]:
+    """Guess rate per tier the words were played in"""
+    query = select(
+        WordGuess.tier,
+        guessed_count.label("guessed"),
+        skipped_count.label("skipped"),
+        samples_count.label("samples"),
+    ).group_by(WordGuess.tier).order_by(WordGuess.tier)
+    if mode:
+        query = query.join(PackWord, PackWord.id == WordGuess.word_id).where(PackWord.mode == mode)
+    rows = (await db.execute(query)).mappings().all()
+    return [
+        {**row, "guess_rate": round(row["guessed"] / row["samples"], 4) if row["samples"] else 0.0}
+        for row in rows
+    ]
+
+
+def suggest_tier(guess_rate: float) -> str:
+    if guess_rate >= WORD_TIER_EASY_RATE:
+        return "easy"
+    if guess_rate < WORD_TIER_HARD_RATE:
+        return "hard"
+    return "medium"
+
+
+def retier(db, min_samples: int, pack_tiers: dict, overrides: dict) -> dict:
+    """
+    Store guess_rate/samples/suggested_tier on pack_words and update overrides
+    {mode: {word: tier}}: words with enough samples get their suggested tier when it
+    differs from their tier in the pack files, other words keep their override.
+    """
+    rows = db.execute(
+        select(PackWord.id, PackWord.mode, PackWord.word, guessed_count, samples_count)
+        .join(WordGuess, WordGuess.word_id == PackWord.id)
+        .group_by(PackWord.id, PackWord.mode, PackWord.word)
+    ).all()
+
+    overrides = {mode: dict(words) for mode, words in overrides.items()}
+    params = []
+    for wid, mode, word, guessed, samples in rows:
+        rate = guessed / samples if samples else 0.0
+        suggested = suggest_tier(rate) if samples >= min_samples else None
+        params.append({"word_id": wid, "new_rate": rate, "new_samples": samples, "new_tier": suggested})
+        original = pack_tiers.get(mode, {}).get(word)
+        if suggested is None or original is None:
+            continue
+        if suggested != original:
+            overrides.setdefault(mode, {})[word] = suggested
+        else:
+            overrides.get(mode, {}).pop(word, None)
+    if params:
+        db.connection().execute(
+            update(PackWord)
+            .where(PackWord.id == bindparam("word_id"))
+            .values(guess_rate=bindparam("new_rate"), samples=bindparam("new_samples"),
+                    suggested_tier=bindparam("new_tier")),
+            params,
+        )
+        db.commit()
+    return overrides
+
+
+def load_pack_tiers() -> dict:
+    """{mode: {word: tier}} as in the pack files, before overrides"""
+    from app.services.word_service import DATA_DIR, RETIERED
+    tiers = {}
+    for mode in ("alias", "taboo"):
+        packs = json.loads((DATA_DIR / f"words_{mode}.json").read_text())
+        tiers[mode] = {}
+        for tier in RETIERED:
+            for entry in packs.get(tier, []):
+                tiers[mode].setdefault(entry["word"], tier)
+    return tiers
+
+
+def main():
+    from app.services.word_service import WORD_TIER_OVERRIDES_PATH
+
+    parser = argparse.ArgumentParser(description="Word analytics jobs")
+    parser.add_argument("command", choices=["retier"])
+    parser.add_argument("--min-samples", type=int, default=WORD_TIER_MIN_SAMPLES,
+                        help="plays a word needs before its tier may change")
+    parser.add_argument("--write", action="store_true",
+                        help=f"write overrides to {WORD_TIER_OVERRIDES_PATH} (applied on next backend start)")
+    args = parser.parse_args()
+
+    current = json.loads(WORD_TIER_OVERRIDES_PATH.read_text()) if WORD_TIER_OVERRIDES_PATH.exists() else {}
+    with SessionLocal() as db:
+        overrides = retier(db, args.min_samples, load_pack_tiers(), current)
+    changes = sum(len(words) for words in overrides.values())
+    print(f"[WordStats] {changes} words differ from their pack tier (min samples {args.min_samples})")
+    for mode, words in overrides.items():
+        for word, tier in sorted(words.items()):
+            print(f"  {mode}: {word} -> {tier}")
+    if args.write:
+        WORD_TIER_OVERRIDES_PATH.write_text(json.dumps(overrides, ensure_ascii=False, indent=2, sort_keys=True))
+        print(f"[WordStats] Overrides written to {WORD_TIER_OVERRIDES_PATH}")
+
+
+# Global instance
+word_guess_recorder = WordGuessRecorder()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+Lightweight tail-sampled tracing of WebSocket messages.
+
+Each received message opens a trace (room code and message type as attributes); spans
+around decode, the handler, word draws, state builds, serialization and sends are
+recorded into it. When the trace ends, it is kept only if it was slow
+(TRACE_SLOW_THRESHOLD) or picked by TRACE_SAMPLE_RATE, so the common fast path costs
+a few list appends. Kept traces are exported in the background to a JSONL file
+(TRACE_FILE) and/or an OTLP/HTTP JSON endpoint (TRACE_OTLP_URL, e.g. a local collector
+or Jaeger on :4318/v1/traces). With neither set, tracing is off and span() returns a
+shared no-op.
+
+    with tracing.span("word_draw"):
+        ...
+"""
+import asyncio
+import functools
+import json
+import os
+import random
+import time
+from contextvars import ContextVar
+from typing import List, Optional
+from app import metrics
+from app.log import get_logger
+
+log = get_logger(__name__)
+
+TRACE_FILE = os.getenv("TRACE_FILE", "")
+TRACE_OTLP_URL = os.getenv("TRACE_OTLP_URL", "")
+TRACE_SLOW_THRESHOLD = float(os.getenv("TRACE_SLOW_THRESHOLD", "0.05"))  # seconds: always keep slower traces
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.01"))  # share of fast traces kept
+TRACE_FLUSH_INTERVAL = float(os.getenv("TRACE_FLUSH_INTERVAL", "1"))  # seconds
+TRACE_BUFFER_MAX = int(os.getenv("TRACE_BUFFER_MAX", "1000"))  # kept traces waiting for export
+SERVICE_NAME = "aliby-backend"
+
+ENABLED = bool(TRACE_FILE or TRACE_OTLP_URL)
+
+current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+
+
+def new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class Trace:
+    __slots__ = ("trace_id", "start_ns", "spans", "stack", "finished")
+
+    def __init__(self):
+        self.trace_id = new_id(128)
+        self.start_ns = time.time_ns()
+        self.spans: List["Span"] = []  # in end order
+        self.stack: List[str] = []  # span ids of open spans
+        self.finished = False
+
+
+class Span:
+    __slots__ = ("trace", "name", "attrs", "span_id", "parent_id", "start_ns", "end_ns")
+
+    def __init__(self, trace: Trace, name: str, attrs: dict):
+        self.trace = trace
+        self.name = name
+        self.attrs = attrs
+        self.span_id = new_id(64)
+        self.parent_id = trace.stack[-1] if trace.stack else ""
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.trace.stack.append(self.span_id)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.perf_counter_ns()
+        if exc_type is not None and exc_type is not asyncio.CancelledError:
+            self.attrs["error"] = exc_type.__name__
+        self.trace.stack.pop()
+        self.trace.spans.append(self)
+        return False
+
+
+class NoopSpan:
+    __slots__ = ()
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = NoopSpan()
+
+
+def span(name: str, **attrs):
+    """Child span of the current trace; no-op outside a trace"""
+    trace = current_trace.get()
+    if trace is None or trace.finished:
+        return NOOP_SPAN
+    return Span(trace, name, attrs)
+
+
+def traced(name: str):
+    """Decorator: run a (sync) function inside a span"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class Tracer:
+    def __init__(self):
+        self.buffer: List[Trace] = []
+        self.task: Optional[asyncio.Task] = None
+        self.client = None
+        # Metrics
+        self.started = 0
+        self.kept = 0
+        self.dropped = 0
+        self.export_failed = 0
+
+    def start_trace(self, name: str, **attrs):
+        """Root span of a new trace in the current context; call finish() with it when done"""
+        if not ENABLED:
+            return NOOP_SPAN
+        self.started += 1
+        trace = Trace()
+        current_trace.set(trace)
+        return Span(trace, name, attrs).__enter__()
+
+    def finish(self, root):
+        """End the trace of a root span and keep it if it is slow or sampled"""
+        if root is NOOP_SPAN:
+            return
+        root.__exit__(None, None, None)
+        trace = root.trace
+        trace.finished = True
+        current_trace.set(None)
+        duration = (root.end_ns - root.start_ns) / 1e9
+        if duration < TRACE_SLOW_THRESHOLD and random.random() >= TRACE_SAMPLE_RATE:
+            return
+        if len(self.buffer) >= TRACE_BUFFER_MAX:
+            self.dropped += 1
+            return
+        self.kept += 1
+        self.buffer.append(trace)
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(TRACE_FLUSH_INTERVAL)
+            await self.flush()
+
+    async def flush(self):
+        if not self.buffer:
+            return
+        traces, self.buffer = self.buffer, []
+        try:
+            if TRACE_FILE:
+                lines = "".join(json.dumps(to_record(trace), separators=(",", ":")) + "\n" for trace in traces)
+                await asyncio.to_thread(append_file, TRACE_FILE, lines)
+            if TRACE_OTLP_URL:
+                response = await self.client.post(TRACE_OTLP_URL, json=to_otlp(traces))
+                response.raise_for_status()
+        except Exception as e:
+            self.export_failed += len(traces)
+            log.warning("trace_export_failed", traces=len(traces), error=str(e))
+
+    def start(self):
+        if ENABLED and self.task is None:
+            if TRACE_OTLP_URL:
+                import httpx
+                self.client = httpx.AsyncClient(timeout=5)
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+            await self.flush()
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    def stats(self) -> dict:
+        return {
+            "enabled": ENABLED,
+            "started": self.started,
+            "kept": self.kept,
+            "dropped": self.dropped,
+            "export_failed": self.export_failed,
+            "pending": len(self.buffer),
+        }
+
+
+def append_file(path: str, lines: str):
+    with open(path, "a") as f:
+        f.write(lines)
+
+
+def to_record(trace: Trace) -> dict:
+    """One JSONL line: spans with offsets from the root start, in milliseconds"""
+    root = trace.spans[-1]
+    return {
+        "trace_id": trace.trace_id,
+        "name": root.name,
+        "ts": trace.start_ns // 1_000_000,
+        "duration_ms": round((root.end_ns - root.start_ns) / 1e6, 3),
+        **root.attrs,
+        "spans": [
+            {
+                "name": s.name,
+                "span_id": s.span_id,
+                "parent_id": s.parent_id,
+                "start_ms": round((s.start_ns - root.start_ns) / 1e6, 3),
+                "duration_ms": round((s.end_ns - s.start_ns) / 1e6, 3),
+                **s.attrs,
+            }
+            for s in trace.spans[:-1]
+        ],
+    }
+
+
+def otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(traces: List[Trace]) -> dict:
+    """OTLP/HTTP JSON export request"""
+    spans = []
+    for trace in traces:
+        root = trace.spans[-1]
+        for s in trace.spans:
+            start = trace.start_ns + s.start_ns - root.start_ns
+            spans.append({
+                "traceId": trace.trace_id,
+                "spanId": s.span_id,
+                "parentSpanId": s.parent_id,
+                "name": s.name,
+                "kind": 2 if s is root else 1,  # SERVER for the message, INTERNAL below it
+                "startTimeUnixNano": str(start),
+                "endTimeUnixNano": str(start + s.end_ns - s.start_ns),
+                "attributes": [{"key": key, "value": otlp_value(value)} for key, value in s.attrs.items()],
+            })
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": "app.tracing"}, "spans": spans}],
+        }]
+    }
+
+
+# Global instance
+tracer = Tracer()
+
+metrics.registry.register(metrics.CounterFunc(
+    "aliby_traces_total", "Message traces by outcome of tail sampling",
+    lambda: {"kept": tracer.kept, "dropped": tracer.dropped, "discarded": tracer.started - tracer.kept - tracer.dropped},
+    ("outcome",),
+))
@@ -3,13 +3,31 @@ from typing import Dict, Set
 import json
 import asyncio
 import time
-from app.models import GameRoom, GameState, GameMode, GameStatus, Team, Player, GameSettings, GuessedWord
+from app.models import GameStatus
+from app.room_state import RoomState, TeamState, PlayerState, GuessedWordState
 from app.services.word_service import word_service
+from app.services.room_store import room_store
+from app.services.broadcast_bus import broadcast_bus
+from app.services.room_router import room_router, forward_websocket
+from app.services.room_lifecycle import room_lifecycle
+from app.services.word_stats import word_guess_recorder
+from app.services.loop_monitor import loop_monitor
+from app.log import get_logger
+from app import metrics, tracing
+from app.tracing import tracer
+
+log = get_logger(__name__)
 
 router = APIRouter()
 
-# In-memory storage for MVP (move to Redis later)
-active_rooms: Dict[str, GameRoom] = {}
+OVERLOADED_CLOSE_CODE = 1013  # Try Again Later: worker refuses new sockets while overloaded
+
+# Message types the endpoint handles; anything else is counted as "other"
+MESSAGE_TYPES = frozenset({
+    "join_team", "start_game", "start_round", "word_guessed", "end_round", "word_skip", "pause_game",
+    "resume_game", "remove_word", "confirm_round_end", "team_selected", "round_end",
+})
+
 room_connections: Dict[str, Set[WebSocket]] = {}
 active_timers: Dict[str, asyncio.Task] = {}  # Track active timer tasks
 
@@ -31,13 +49,29 @@ class ConnectionManager:
                 del self.active_connections[room_code]
 
     async def broadcast(self, room_code: str, message: dict):
+        """Send to sockets on this worker and forward to other workers via the bus"""
+        started = time.perf_counter()
+        with tracing.span("broadcast", type=message.get("type")):
+            broadcast_bus.publish(room_code, message)
+            await self.send_local(room_code, message)
+        metrics.broadcast_seconds.observe(time.perf_counter() - started)
+
+    async def send_local(self, room_code: str, message: dict):
+        """Send message only to sockets connected to this worker"""
         if room_code in self.active_connections:
+            connections = self.active_connections[room_code]
+            metrics.broadcast_fanout.observe(len(connections))
+            metrics.ws_messages_out.inc(message.get("type", ""), amount=len(connections))
+            # Serialize once for the whole room (same encoding as WebSocket.send_json)
+            with tracing.span("serialize"):
+                text = json.dumps(message, separators=(",", ":"), ensure_ascii=False)
             disconnected = set()
-            for connection in self.active_connections[room_code]:
-                try:
-                    await connection.send_json(message)
-                except:
-                    disconnected.add(connection)
+            with tracing.span("send", sockets=len(connections)):
+                for connection in connections:
+                    try:
+                        await connection.send_text(text)
+                    except:
+                        disconnected.add(connection)
             
             # Clean up disconnected
             for conn in disconnected:
@@ -46,21 +80,29 @@ class ConnectionManager:
 
 manager = ConnectionManager()
 
+metrics.registry.register(metrics.GaugeFunc(
+    "aliby_ws_connections", "Open WebSocket connections on this worker",
+    lambda: sum(len(sockets) for sockets in manager.active_connections.values()),
+))
 
-async def monitor_round_timer(room_code: str, duration: int):
-    """Monitor round timer and send updates every second"""
+
+async def monitor_round_timer(room_code: str, duration: int, ends_at: float):
+    """
+    Send timer updates every second until the round's deadline. ends_at identifies the
+    round: when the stored deadline changes (round ended or a new one started, possibly
+    on another worker), this timer stops without touching the room.
+    """
     try:
         time_left = duration
+        loop = asyncio.get_running_loop()
         
         while time_left > 0:
+            tick_at = loop.time() + 1
             await asyncio.sleep(1)
+            metrics.timer_lateness_seconds.observe(max(loop.time() - tick_at, 0.0))
             time_left -= 1
             
-            if room_code not in active_rooms:
-                return
-                
-            room = active_rooms[room_code]
-            if room.status != GameStatus.PLAYING:
+            if await room_store.round_deadline(room_code) != ends_at:
                 return
             
             # Send timer update every second
@@ -70,7 +112,13 @@ async def monitor_round_timer(room_code: str, duration: int):
             })
         
         # Time's up - mark timer as ended (don't send round_summary yet!)
-        room.timer_ended = True
+        async with room_store.lock(room_code):
+            room = await room_store.get(room_code)
+            if room is None or room.status != GameStatus.PLAYING or room.round_ends_at != ends_at:
+                return
+            room.timer_ended = True
+            room.round_ends_at = 0.0
+            await room_store.save(room)
         
         # Notify all clients that timer ended (but keep last word visible)
         await manager.broadcast(room_code, {
@@ -80,13 +128,55 @@ async def monitor_round_timer(room_code: str, duration: int):
         # Timer was cancelled (e.g., round ended early or paused)
         pass
     finally:
-        # Clean up timer reference
-        if room_code in active_timers:
+        # Clean up timer reference (only if a newer timer hasn't replaced this one)
+        if active_timers.get(room_code) is asyncio.current_task():
             del active_timers[room_code]
 
 
-def get_game_state(room: GameRoom) -> dict:
-    """Convert GameRoom to GameState for broadcasting"""
+def schedule_round_timer(room_code: str, duration: int, ends_at: float):
+    """Start (or restart) the background timer task for the round ending at ends_at"""
+    if room_code in active_timers:
+        active_timers[room_code].cancel()
+    active_timers[room_code] = asyncio.create_task(monitor_round_timer(room_code, duration, ends_at))
+
+
+def resume_round_timer(room: RoomState):
+    """Restart a room's timer from its absolute deadline (after restart or handoff)"""
+    if room.status == GameStatus.PLAYING and room.round_ends_at > 0:
+        remaining = int(round(room.round_ends_at - time.time()))
+        schedule_round_timer(room.room_code, max(remaining, 0), room.round_ends_at)
+
+
+def cancel_round_timer(room_code: str):
+    if room_code in active_timers:
+        active_timers.pop(room_code).cancel()
+
+
+async def release_room_connections(room: RoomState):
+    """Eviction hook: stop timer and close sockets of an evicted room"""
+    cancel_round_timer(room.room_code)
+    for websocket in list(manager.active_connections.pop(room.room_code, ())):
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+
+
+room_lifecycle.add_eviction_hook(release_room_connections)
+
+
+def decode_message(raw: str):
+    """Parsed JSON object of a client frame, or None if it is not one"""
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+@tracing.traced("state_build")
+def get_game_state(room: RoomState) -> dict:
+    """Convert room state to GameState message for broadcasting"""
     return {
         "type": "game_state",
         "data": {
@@ -94,25 +184,10 @@ def get_game_state(room: GameRoom) -> dict:
             "mode": room.mode.value if hasattr(room.mode, 'value') else room.mode,
             "status": room.status.value if hasattr(room.status, 'value') else room.status,
             "host_id": room.host_id,
-            "teams": [
-                {
-                    "id": team.id,
-                    "name": team.name,
-                    "players": [
-                        {
-                            "user_id": p.user_id,
-                            "username": p.username,
-                            "is_explaining": p.is_explaining
-                        }
-                        for p in team.players
-                    ],
-                    "score": team.score
-                }
-                for team in room.teams
-            ],
+            "teams": [team.to_dict() for team in room.teams],
             "current_round": room.current_round,
             "current_team_index": room.current_team_index,
-            "settings": room.settings.dict(),
+            "settings": room.settings.to_dict(),
             "is_paused": room.is_paused
         }
     }
@@ -120,18 +195,27 @@ def get_game_state(room: GameRoom) -> dict:
 
 @router.websocket("/ws/game/{room_code}")
 async def websocket_endpoint(websocket: WebSocket, room_code: str):
+    # Another node owns this room - pipe the socket to it
+    if not room_router.is_local(room_code):
+        await websocket.accept()
+        await forward_websocket(websocket, room_code)
+        return
+    
+    if not loop_monitor.admit("websocket"):
+        await websocket.accept()
+        await websocket.close(code=OVERLOADED_CLOSE_CODE)
+        return
+    
     await manager.connect(websocket, room_code)
     
-    print(f"[WebSocket] Client connected to room: {room_code}")
-    print(f"[WebSocket] Active rooms: {list(active_rooms.keys())}")
+    log.info("ws_connect", room=room_code)
     
     # Send current state if room exists
-    if room_code in active_rooms:
-        room = active_rooms[room_code]
-        print(f"[WebSocket] Room found, sending game state")
+    room = await room_store.get(room_code)
+    if room is not None:
         await websocket.send_json(get_game_state(room))
     else:
-        print(f"[WebSocket] ERROR: Room {room_code} not found in active_rooms!")
+        log.warning("ws_room_not_found", room=room_code)
         await websocket.send_json({
             "type": "error",
             "message": f"Room {room_code} not found"
@@ -139,438 +223,465 @@ async def websocket_endpoint(websocket: WebSocket, room_code: str):
     
     try:
         while True:
-            data = await websocket.receive_json()
-            message_type = data.get("type")
-            
-            if room_code not in active_rooms:
-                await websocket.send_json({
-                    "type": "error",
-                    "message": "Room not found"
-                })
-                continue
-            
-            room = active_rooms[room_code]
-            
-            if message_type == "join_team":
-                # Add player to team
-                team_id = data.get("team")
-                user_id = data.get("user_id")
-                username = data.get("username")
-                
-                # Find or create team
-                team = next((t for t in room.teams if t.id == team_id), None)
-                if not team:
-                    team = Team(
-                        id=team_id,
-                        name=f"Team {team_id}",
-                        players=[],
-                        score=0
-                    )
-                    room.teams.append(team)
-                
-                # Remove player from other teams
-                for t in room.teams:
-                    t.players = [p for p in t.players if p.user_id != user_id]
-                
-                # Add to new team
-                team.players.append(Player(
-                    user_id=user_id,
-                    username=username,
-                    is_explaining=False
-                ))
+            raw = await websocket.receive_text()
+            # Trace of this message; kept only if slow or sampled (app.tracing)
+            trace = tracer.start_trace("ws_message", room=room_code)
+            metric_type = "invalid"
+            handler_started = time.perf_counter()
+            try:
+                with tracing.span("decode"):
+                    data = decode_message(raw)
+                if data is not None:
+                    message_type = data.get("type")
+                    metric_type = message_type if message_type in MESSAGE_TYPES else "other"
+                trace.set(type=metric_type)
+                metrics.ws_messages_in.inc(metric_type)
+                if data is None:
+                    await websocket.send_json({
+                        "type": "error",
+                        "message": "Invalid message"
+                    })
+                    continue
                 
-                # Broadcast updated state
-                await manager.broadcast(room_code, get_game_state(room))
-            
-            elif message_type == "start_game":
-                # Move from LOBBY to PLAYING, but don't start round yet
-                if room.status == GameStatus.LOBBY:
-                    room.status = GameStatus.PLAYING
-                    room.current_round = 1
-                    
-                    # Set first explainer
-                    if room.teams and room.teams[0].players:
-                        room.teams[0].players[0].is_explaining = True
-                    
-                    # Broadcast state - GamePage will show "Start Round" button
-                    await manager.broadcast(room_code, get_game_state(room))
-            
-            elif message_type == "start_round":
-                # Actually start the round with word and timer
-                if room.status == GameStatus.PLAYING:
-                    user_id = data.get("user_id")
-                    
-                    # Get current team
-                    current_team = room.teams[room.current_team_index]
-                    
-                    # ВАЖНО: Проверяем что игрок находится в ТЕКУЩЕЙ команде (кроме solo_device режима)
-                    if not room.settings.solo_device:
-                        player_in_current_team = any(
-                            p.user_id == user_id for p in current_team.players
-                        )
-                        
-                        if not player_in_current_team:
-                            print(f"[start_round] ERROR: Player {user_id} не в текущей команде {current_team.name}!")
+                handler_started = time.perf_counter()
+                # One message at a time per room, across tasks and workers (app.services.room_store)
+                async with room_store.lock(room_code):
+                    with tracing.span("handler"):
+                        room = await room_store.get(room_code)
+                        if room is None:
                             await websocket.send_json({
                                 "type": "error",
-                                "message": f"Only {current_team.name} can start the round!"
+                                "message": "Room not found"
                             })
                             continue
-                    
-                    print(f"[start_round] Player {user_id} from {current_team.name} starting round")
-                    
-                    # Reset all players' explaining status
-                    for team in room.teams:
-                        for player in team.players:
-                            player.is_explaining = False
-                    
-                    # Set requesting player as explaining
-                    for player in current_team.players:
-                        if player.user_id == user_id:
-                            player.is_explaining = True
-                            break
-                    
-                    # Broadcast updated state with current explaining team
-                    await manager.broadcast(room_code, get_game_state(room))
-                    
-                    # Send first word from word service
-                    word = word_service.get_random_word(
-                        room.mode, 
-                        room.settings.difficulty,
-                        room_code
-                    )
-                    
-                    if word:
-                        room.current_word = word  # Save current word with translation
-                        await manager.broadcast(room_code, {
-                            "type": "new_word",
-                            "word": word.word,
-                            "taboo": word.taboo_words,
-                            "translation": word.translation if room.settings.show_translations else ""
-                        })
-                    
-                    # Start timer if timed mode is enabled
-                    if room.settings.timed_mode:
-                        # Cancel existing timer if any
-                        if room_code in active_timers:
-                            active_timers[room_code].cancel()
                         
-                        # Send timer start message (client handles countdown)
-                        start_time = time.time()
-                        await manager.broadcast(room_code, {
-                            "type": "timer_start",
-                            "start_time": start_time,
-                            "duration": room.settings.round_time
-                        })
+                        room.last_activity_at = time.time()
                         
-                        # Start background monitor task
-                        timer_task = asyncio.create_task(
-                            monitor_round_timer(room_code, room.settings.round_time)
-                        )
-                        active_timers[room_code] = timer_task
-                    else:
-                        # No timer - send unlimited indicator
-                        await manager.broadcast(room_code, {
-                            "type": "timer_start",
-                            "duration": -1  # -1 indicates unlimited time
-                        })
-            
-            elif message_type == "word_guessed":
-                # Save the guessed word before moving to next
-                current_word_text = data.get("word", "")
-                current_word_taboo = data.get("taboo_words", [])
-                used_translation = data.get("used_translation", False)
-                
-                # Check if timer ended - last word needs team selection
-                if room.timer_ended:
-                    # Timer ended - save word for team selection (no score yet)
-                    if current_word_text:
-                        room.current_round_words.append(GuessedWord(
-                            word=current_word_text,
-                            taboo_words=current_word_taboo,
-                            timestamp=time.time(),
-                            used_translation=False,  # Last word always 1 point
-                            translation=room.current_word.translation if room.current_word else ""
-                        ))
-                    
-                    room.awaiting_team_selection = True
-                    # Send team selection prompt with all team names
-                    await manager.broadcast(room_code, {
-                        "type": "select_team",
-                        "teams": [{"id": t.id, "name": t.name} for t in room.teams],
-                        "last_word": current_word_text
-                    })
-                else:
-                    # Normal flow - add word and score
-                    if current_word_text:
-                        room.current_round_words.append(GuessedWord(
-                            word=current_word_text,
-                            taboo_words=current_word_taboo,
-                            timestamp=time.time(),
-                            used_translation=used_translation,
-                            translation=room.current_word.translation if room.current_word else ""
-                        ))
-                    
-                    # Increment score for the CURRENT team (by index)
-                    # 0.5 points if translation was used, 1.0 otherwise
-                    current_team = room.teams[room.current_team_index]
-                    points = 0.5 if used_translation else 1.0
-                    current_team.score += points
-                    
-                    # NOTE: Victory is checked at the end of a full cycle (in round_end handler)
-                    # Not immediately after reaching score_to_win
-                    
-                    await manager.broadcast(room_code, get_game_state(room))
-                    
-                    # Send next word
-                    word = word_service.get_random_word(
-                        room.mode,
-                        room.settings.difficulty,
-                        room_code
-                    )
-                    
-                    if word:
-                        room.current_word = word  # Save current word with translation
-                        await manager.broadcast(room_code, {
-                            "type": "new_word",
-                            "word": word.word,
-                            "taboo": word.taboo_words,
-                            "translation": word.translation if room.settings.show_translations else ""
-                        })
-            
-            elif message_type == "end_round":
-                # For unlimited mode - manually end the round
-                # Mark timer as ended (same as when timer reaches 0)
-                room.timer_ended = True
-                
-                # Notify all clients that round ended
-                await manager.broadcast(room_code, {
-                    "type": "timer_ended"
-                })
-            
-            elif message_type == "word_skip":
-                # Deduct 1 point for skip (minimum 0)
-                current_team = room.teams[room.current_team_index]
-                current_team.score = max(0, current_team.score - 1)
-                
-                # Check if timer ended - if so, skip means round ends
-                if room.timer_ended:
-                    # Timer ended and word skipped → go to round summary
-                    await manager.broadcast(room_code, {
-                        "type": "round_summary",
-                        "reason": "timeout",
-                        "guessed_words": [
-                            {
-                                "word": gw.word,
-                                "taboo_words": gw.taboo_words,
-                                "timestamp": gw.timestamp,
-                                "translation": gw.translation if room.settings.show_translations else ""
-                            }
-                            for gw in room.current_round_words
-                        ]
-                    })
-                    # Send updated game state with new score
-                    await manager.broadcast(room_code, get_game_state(room))
-                else:
-                    # Normal flow - send next word
-                    await manager.broadcast(room_code, get_game_state(room))
-                    
-                    word = word_service.get_random_word(
-                        room.mode,
-                        room.settings.difficulty,
-                        room_code
-                    )
-                    
-                    if word:
-                        room.current_word = word  # Save current word with translation
-                        await manager.broadcast(room_code, {
-                            "type": "new_word",
-                            "word": word.word,
-                            "taboo": word.taboo_words,
-                            "translation": word.translation if room.settings.show_translations else ""
-                        })
-            
-            elif message_type == "pause_game":
-                # Pause the game
-                if not room.is_paused:
-                    room.is_paused = True
-                    await manager.broadcast(room_code, {
-                        "type": "game_paused",
-                        "is_paused": True
-                    })
-            
-            elif message_type == "resume_game":
-                # Resume the game
-                if room.is_paused:
-                    room.is_paused = False
-                    await manager.broadcast(room_code, {
-                        "type": "game_resumed",
-                        "is_paused": False
-                    })
-            
-            elif message_type == "remove_word":
-                # Remove a word from guessed list and deduct point
-                word_to_remove = data.get("word")
-                if word_to_remove:
-                    # Find and remove the word
-                    room.current_round_words = [
-                        gw for gw in room.current_round_words 
-                        if gw.word != word_to_remove
-                    ]
-                    
-                    # Deduct point from current team
-                    current_team = next((t for t in room.teams if any(p.is_explaining for p in t.players)), None)
-                    if current_team and current_team.score > 0:
-                        current_team.score -= 1
-                    
-                    await manager.broadcast(room_code, {
-                        "type": "word_removed",
-                        "word": word_to_remove,
-                        "guessed_words": [
-                            {
-                                "word": gw.word,
-                                "taboo_words": gw.taboo_words,
-                                "timestamp": gw.timestamp,
-                                "translation": gw.translation if room.settings.show_translations else ""
-                            }
-                            for gw in room.current_round_words
-                        ]
-                    })
-                    await manager.broadcast(room_code, get_game_state(room))
-            
-            elif message_type == "confirm_round_end":
-                # User confirmed round end after reviewing words
-                # Clear round words and proceed to next round
-                room.current_round_words = []
-                room.is_paused = False
-                room.paused_time_left = 0
-            
-            elif message_type == "team_selected":
-                # Handle team selection for last word after timer ended
-                print(f"[team_selected] Awaiting selection: {room.awaiting_team_selection}")
-                print(f"[team_selected] Words count: {len(room.current_round_words)}")
-                if room.awaiting_team_selection:
-                    selected_team_id = data.get("team_id")
-                    print(f"[team_selected] Selected team ID: {selected_team_id}")
-                    
-                    # Find the selected team and add 1 point
-                    selected_team = next((t for t in room.teams if t.id == selected_team_id), None)
-                    if selected_team:
-                        print(f"[team_selected] Team found: {selected_team.name}, current score: {selected_team.score}")
-                        selected_team.score += 1.0  # Always 1 point for last word
-                        print(f"[team_selected] New score: {selected_team.score}")
+                        if message_type == "join_team":
+                            # Add player to team
+                            team_id = data.get("team")
+                            user_id = data.get("user_id")
+                            username = data.get("username")
+                            
+                            # Hot state is not validated by pydantic, so reject malformed joins here
+                            if team_id is None or not user_id:
+                                await websocket.send_json({
+                                    "type": "error",
+                                    "message": "team and user_id are required"
+                                })
+                                continue
+                            
+                            # Find or create team
+                            team = next((t for t in room.teams if t.id == team_id), None)
+                            if not team:
+                                team = TeamState(
+                                    id=team_id,
+                                    name=f"Team {team_id}",
+                                    players=[],
+                                    score=0
+                                )
+                                room.teams.append(team)
+                            
+                            # Remove player from other teams
+                            for t in room.teams:
+                                t.players = [p for p in t.players if p.user_id != user_id]
+                            
+                            # Add to new team
+                            team.players.append(PlayerState(
+                                user_id=user_id,
+                                username=username,
+                                is_explaining=False
+                            ))
+                            
+                            # Broadcast updated state
+                            await manager.broadcast(room_code, get_game_state(room))
                         
-                        # Reset flags
-                        room.awaiting_team_selection = False
-                        room.timer_ended = False
+                        elif message_type == "start_game":
+                            # Move from LOBBY to PLAYING, but don't start round yet
+                            if room.status == GameStatus.LOBBY:
+                                room.status = GameStatus.PLAYING
+                                room.current_round = 1
+                                
+                                # Set first explainer
+                                if room.teams and room.teams[0].players:
+                                    room.teams[0].players[0].is_explaining = True
+                                
+                                # Broadcast state - GamePage will show "Start Round" button
+                                await manager.broadcast(room_code, get_game_state(room))
                         
-                        # Send round summary
-                        print(f"[team_selected] Sending round_summary with {len(room.current_round_words)} words")
-                        await manager.broadcast(room_code, {
-                            "type": "round_summary",
-                            "reason": "timeout",
-                            "guessed_words": [
-                                {
-                                    "word": gw.word,
-                                    "taboo_words": gw.taboo_words,
-                                    "timestamp": gw.timestamp,
-                                    "translation": gw.translation if room.settings.show_translations else ""
-                                }
-                                for gw in room.current_round_words
-                            ]
-                        })
+                        elif message_type == "start_round":
+                            # Actually start the round with word and timer
+                            if room.status == GameStatus.PLAYING:
+                                user_id = data.get("user_id")
+                                
+                                # Get current team
+                                current_team = room.teams[room.current_team_index]
+                                
+                                # ВАЖНО: Проверяем что игрок находится в ТЕКУЩЕЙ команде (кроме solo_device режима)
+                                if not room.settings.solo_device:
+                                    player_in_current_team = any(
+                                        p.user_id == user_id for p in current_team.players
+                                    )
+                                    
+                                    if not player_in_current_team:
+                                        log.info("start_round_rejected", room=room_code, user_id=user_id, team=current_team.name)
+                                        await websocket.send_json({
+                                            "type": "error",
+                                            "message": f"Only {current_team.name} can start the round!"
+                                        })
+                                        continue
+                                
+                                log.debug("start_round", room=room_code, user_id=user_id, team=current_team.name)
+                                
+                                # Reset all players' explaining status
+                                for team in room.teams:
+                                    for player in team.players:
+                                        player.is_explaining = False
+                                
+                                # Set requesting player as explaining
+                                for player in current_team.players:
+                                    if player.user_id == user_id:
+                                        player.is_explaining = True
+                                        break
+                                
+                                # Broadcast updated state with current explaining team
+                                await manager.broadcast(room_code, get_game_state(room))
+                                
+                                # Send first word from word service
+                                word = word_service.get_random_word(
+                                    room.mode, 
+                                    room.settings.difficulty,
+                                    room_code
+                                )
+                                
+                                if word:
+                                    room.current_word = word  # Save current word with translation
+                                    await manager.broadcast(room_code, {
+                                        "type": "new_word",
+                                        "word": word.word,
+                                        "taboo": word.taboo_words,
+                                        "translation": word.translation if room.settings.show_translations else ""
+                                    })
+                                
+                                # Start timer if timed mode is enabled
+                                if room.settings.timed_mode:
+                                    # Send timer start message (client handles countdown)
+                                    start_time = time.time()
+                                    room.round_ends_at = start_time + room.settings.round_time
+                                    await manager.broadcast(room_code, {
+                                        "type": "timer_start",
+                                        "start_time": start_time,
+                                        "duration": room.settings.round_time
+                                    })
+                                    
+                                    # Start background monitor task (cancels existing timer if any)
+                                    schedule_round_timer(room_code, room.settings.round_time, room.round_ends_at)
+                                else:
+                                    # No timer - send unlimited indicator
+                                    await manager.broadcast(room_code, {
+                                        "type": "timer_start",
+                                        "duration": -1  # -1 indicates unlimited time
+                                    })
                         
-                        # Broadcast updated game state
-                        await manager.broadcast(room_code, get_game_state(room))
-            
-            elif message_type == "round_end":
-                print(f"[round_end] Current team index: {room.current_team_index}")
-                
-                # Cancel active timer if any
-                if room_code in active_timers:
-                    active_timers[room_code].cancel()
-                    del active_timers[room_code]
-                
-                # Clear round words and reset pause
-                room.current_round_words = []
-                room.is_paused = False
-                room.paused_time_left = 0
-                room.timer_ended = False
-                room.awaiting_team_selection = False
-                
-                # Reset all players' explaining status
-                for team in room.teams:
-                    for player in team.players:
-                        player.is_explaining = False
-                
-                # Switch to next team (round-robin)
-                room.current_team_index = (room.current_team_index + 1) % len(room.teams)
-                
-                print(f"[round_end] New team index: {room.current_team_index}")
-                print(f"[round_end] New team: {room.teams[room.current_team_index].name}")
-                
-                # Increment round counter every full cycle of teams
-                if room.current_team_index == 0:
-                    room.current_round += 1
-                    print(f"[round_end] Cycle completed! Round: {room.current_round}")
-                    
-                    # Check for winner ONLY at the end of a full cycle
-                    if room.teams:
-                        max_score = max(t.score for t in room.teams)
-                        print(f"[round_end] Max score: {max_score}, Score to win: {room.settings.score_to_win}")
+                        elif message_type == "word_guessed":
+                            # Save the guessed word before moving to next
+                            current_word_text = data.get("word", "")
+                            current_word_taboo = data.get("taboo_words", [])
+                            used_translation = data.get("used_translation", False)
+                            
+                            # Check if timer ended - last word needs team selection
+                            if room.timer_ended:
+                                # Timer ended - save word for team selection (no score yet)
+                                if current_word_text:
+                                    room.log_word("guessed")
+                                    room.current_round_words.append(GuessedWordState(
+                                        word=current_word_text,
+                                        taboo_words=current_word_taboo,
+                                        timestamp=time.time(),
+                                        used_translation=False,  # Last word always 1 point
+                                        translation=room.current_word.translation if room.current_word else ""
+                                    ))
+                                
+                                room.awaiting_team_selection = True
+                                # Send team selection prompt with all team names
+                                await manager.broadcast(room_code, {
+                                    "type": "select_team",
+                                    "teams": [{"id": t.id, "name": t.name} for t in room.teams],
+                                    "last_word": current_word_text
+                                })
+                            else:
+                                # Normal flow - add word and score
+                                if current_word_text:
+                                    room.log_word("guessed", used_translation)
+                                    room.current_round_words.append(GuessedWordState(
+                                        word=current_word_text,
+                                        taboo_words=current_word_taboo,
+                                        timestamp=time.time(),
+                                        used_translation=used_translation,
+                                        translation=room.current_word.translation if room.current_word else ""
+                                    ))
+                                
+                                # Increment score for the CURRENT team (by index)
+                                # 0.5 points if translation was used, 1.0 otherwise
+                                current_team = room.teams[room.current_team_index]
+                                points = 0.5 if used_translation else 1.0
+                                current_team.score += points
+                                
+                                # NOTE: Victory is checked at the end of a full cycle (in round_end handler)
+                                # Not immediately after reaching score_to_win
+                                
+                                await manager.broadcast(room_code, get_game_state(room))
+                                
+                                # Send next word
+                                word = word_service.get_random_word(
+                                    room.mode,
+                                    room.settings.difficulty,
+                                    room_code
+                                )
+                                
+                                if word:
+                                    room.current_word = word  # Save current word with translation
+                                    await manager.broadcast(room_code, {
+                                        "type": "new_word",
+                                        "word": word.word,
+                                        "taboo": word.taboo_words,
+                                        "translation": word.translation if room.settings.show_translations else ""
+                                    })
                         
-                        # Check if anyone reached score_to_win
-                        if max_score >= room.settings.score_to_win:
-                            # Count how many teams have the max score
-                            teams_with_max = [t for t in room.teams if t.score == max_score]
-                            print(f"[round_end] Teams with max score: {[t.name for t in teams_with_max]}")
+                        elif message_type == "end_round":
+                            # For unlimited mode - manually end the round
+                            # Mark timer as ended (same as when timer reaches 0)
+                            room.timer_ended = True
                             
-                            # Winner only if there's exactly ONE team with max score
-                            if len(teams_with_max) == 1:
-                                winner = teams_with_max[0]
-                                room.status = GameStatus.FINISHED
+                            # Notify all clients that round ended
+                            await manager.broadcast(room_code, {
+                                "type": "timer_ended"
+                            })
+                        
+                        elif message_type == "word_skip":
+                            room.log_word("skipped")
+                            
+                            # Deduct 1 point for skip (minimum 0)
+                            current_team = room.teams[room.current_team_index]
+                            current_team.score = max(0, current_team.score - 1)
+                            
+                            # Check if timer ended - if so, skip means round ends
+                            if room.timer_ended:
+                                # Timer ended and word skipped → go to round summary
+                                await manager.broadcast(room_code, {
+                                    "type": "round_summary",
+                                    "reason": "timeout",
+                                    "guessed_words": [
+                                        {
+                                            "word": gw.word,
+                                            "taboo_words": gw.taboo_words,
+                                            "timestamp": gw.timestamp,
+                                            "translation": gw.translation if room.settings.show_translations else ""
+                                        }
+                                        for gw in room.current_round_words
+                                    ]
+                                })
+                                # Send updated game state with new score
+                                await manager.broadcast(room_code, get_game_state(room))
+                            else:
+                                # Normal flow - send next word
+                                await manager.broadcast(room_code, get_game_state(room))
                                 
-                                # Cancel timer if any
-                                if room_code in active_timers:
-                                    active_timers[room_code].cancel()
-                                    del active_timers[room_code]
+                                word = word_service.get_random_word(
+                                    room.mode,
+                                    room.settings.difficulty,
+                                    room_code
+                                )
+                                
+                                if word:
+                                    room.current_word = word  # Save current word with translation
+                                    await manager.broadcast(room_code, {
+                                        "type": "new_word",
+                                        "word": word.word,
+                                        "taboo": word.taboo_words,
+                                        "translation": word.translation if room.settings.show_translations else ""
+                                    })
+                        
+                        elif message_type == "pause_game":
+                            # Pause the game
+                            if not room.is_paused:
+                                room.is_paused = True
+                                await manager.broadcast(room_code, {
+                                    "type": "game_paused",
+                                    "is_paused": True
+                                })
+                        
+                        elif message_type == "resume_game":
+                            # Resume the game
+                            if room.is_paused:
+                                room.is_paused = False
+                                await manager.broadcast(room_code, {
+                                    "type": "game_resumed",
+                                    "is_paused": False
+                                })
+                        
+                        elif message_type == "remove_word":
+                            # Remove a word from guessed list and deduct point
+                            word_to_remove = data.get("word")
+                            if word_to_remove:
+                                room.mark_word_removed(word_to_remove)
+                                
+                                # Find and remove the word
+                                room.current_round_words = [
+                                    gw for gw in room.current_round_words 
+                                    if gw.word != word_to_remove
+                                ]
+                                
+                                # Deduct point from current team
+                                current_team = next((t for t in room.teams if any(p.is_explaining for p in t.players)), None)
+                                if current_team and current_team.score > 0:
+                                    current_team.score -= 1
+                                
+                                await manager.broadcast(room_code, {
+                                    "type": "word_removed",
+                                    "word": word_to_remove,
+                                    "guessed_words": [
+                                        {
+                                            "word": gw.word,
+                                            "taboo_words": gw.taboo_words,
+                                            "timestamp": gw.timestamp,
+                                            "translation": gw.translation if room.settings.show_translations else ""
+                                        }
+                                        for gw in room.current_round_words
+                                    ]
+                                })
+                                await manager.broadcast(room_code, get_game_state(room))
+                        
+                        elif message_type == "confirm_round_end":
+                            # User confirmed round end after reviewing words
+                            # Clear round words and proceed to next round
+                            room.current_round_words = []
+                            room.is_paused = False
+                            room.paused_time_left = 0
+                        
+                        elif message_type == "team_selected":
+                            # Handle team selection for last word after timer ended
+                            if room.awaiting_team_selection:
+                                selected_team_id = data.get("team_id")
+                                
+                                # Find the selected team and add 1 point
+                                selected_team = next((t for t in room.teams if t.id == selected_team_id), None)
+                                if selected_team:
+                                    selected_team.score += 1.0  # Always 1 point for last word
+                                    log.debug("team_selected", room=room_code, team=selected_team.name,
+                                              score=selected_team.score, words=len(room.current_round_words))
+                                    
+                                    # Reset flags
+                                    room.awaiting_team_selection = False
+                                    room.timer_ended = False
+                                    
+                                    # Send round summary
+                                    await manager.broadcast(room_code, {
+                                        "type": "round_summary",
+                                        "reason": "timeout",
+                                        "guessed_words": [
+                                            {
+                                                "word": gw.word,
+                                                "taboo_words": gw.taboo_words,
+                                                "timestamp": gw.timestamp,
+                                                "translation": gw.translation if room.settings.show_translations else ""
+                                            }
+                                            for gw in room.current_round_words
+                                        ]
+                                    })
+                                    
+                                    # Broadcast updated game state
+                                    await manager.broadcast(room_code, get_game_state(room))
+                        
+                        elif message_type == "round_end":
+                            # Cancel active timer if any
+                            cancel_round_timer(room_code)
+                            room.round_ends_at = 0.0
+                            
+                            # Clear round words and reset pause
+                            room.current_round_words = []
+                            room.is_paused = False
+                            room.paused_time_left = 0
+                            room.timer_ended = False
+                            room.awaiting_team_selection = False
+                            
+                            # Reset all players' explaining status
+                            for team in room.teams:
+                                for player in team.players:
+                                    player.is_explaining = False
+                            
+                            # Switch to next team (round-robin)
+                            room.current_team_index = (room.current_team_index + 1) % len(room.teams)
+                            
+                            log.debug("round_end", room=room_code, next_team=room.teams[room.current_team_index].name)
+                            
+                            # Increment round counter every full cycle of teams
+                            if room.current_team_index == 0:
+                                room.current_round += 1
+                                
+                                # Check for winner ONLY at the end of a full cycle
+                                if room.teams:
+                                    max_score = max(t.score for t in room.teams)
+                                    
+                                    # Check if anyone reached score_to_win
+                                    if max_score >= room.settings.score_to_win:
+                                        # Count how many teams have the max score
+                                        teams_with_max = [t for t in room.teams if t.score == max_score]
+                                        
+                                        # Winner only if there's exactly ONE team with max score
+                                        if len(teams_with_max) == 1:
+                                            winner = teams_with_max[0]
+                                            room.status = GameStatus.FINISHED
+                                            room.winner = winner.name
+                                            
+                                            # Cancel timer if any
+                                            cancel_round_timer(room_code)
+                                            
+                                            log.info("game_end", room=room_code, winner=winner.name, round=room.current_round)
+                                            await manager.broadcast(room_code, {
+                                                "type": "game_end",
+                                                "winner": winner.name,
+                                                "reason": "score_reached_cycle_end",
+                                                "scores": {t.name: t.score for t in room.teams}
+                                            })
+                                            word_guess_recorder.record(room)
+                                            # Don't send round_cleared, game is over
+                                            await room_store.save(room)
+                                            continue
+                                        else:
+                                            log.debug("round_end_tie", room=room_code, score=max_score, round=room.current_round)
+                            
+                            # Check if we exceeded rounds_total (fallback for timed mode)
+                            if room.current_round > room.settings.rounds_total and room.settings.rounds_total > 0:
+                                room.status = GameStatus.FINISHED
+                                winner = max(room.teams, key=lambda t: t.score) if room.teams else None
+                                room.winner = winner.name if winner else ""
                                 
-                                print(f"[round_end] WINNER: {winner.name}")
-                                print(f"[round_end] Broadcasting game_end to {room_code}...")
                                 await manager.broadcast(room_code, {
                                     "type": "game_end",
-                                    "winner": winner.name,
-                                    "reason": "score_reached_cycle_end",
+                                    "winner": winner.name if winner else None,
                                     "scores": {t.name: t.score for t in room.teams}
                                 })
-                                print(f"[round_end] game_end broadcast complete!")
-                                # Don't send round_cleared, game is over
-                                continue
+                                word_guess_recorder.record(room)
                             else:
-                                print(f"[round_end] TIE-BREAK! Multiple teams with {max_score} points, continuing...")
-                
-                # Check if we exceeded rounds_total (fallback for timed mode)
-                if room.current_round > room.settings.rounds_total and room.settings.rounds_total > 0:
-                    room.status = GameStatus.FINISHED
-                    winner = max(room.teams, key=lambda t: t.score) if room.teams else None
-                    
-                    await manager.broadcast(room_code, {
-                        "type": "game_end",
-                        "winner": winner.name if winner else None,
-                        "scores": {t.name: t.score for t in room.teams}
-                    })
-                else:
-                    # Send clear signal that round has ended
-                    await manager.broadcast(room_code, {
-                        "type": "round_cleared"
-                    })
-                    
-                    # Prepare next round (don't start automatically)
-                    # GamePage will show "Start Round" button
-                    await manager.broadcast(room_code, get_game_state(room))
+                                # Send clear signal that round has ended
+                                await manager.broadcast(room_code, {
+                                    "type": "round_cleared"
+                                })
+                                
+                                # Prepare next round (don't start automatically)
+                                # GamePage will show "Start Round" button
+                                await manager.broadcast(room_code, get_game_state(room))
+                        
+                        # Persist mutations (no-op copy for in-memory store, write-back for Redis)
+                        await room_store.save(room)
+            finally:
+                # Runs on every path out of the message: continue, disconnect or error
+                metrics.ws_handler_seconds.observe(time.perf_counter() - handler_started, metric_type)
+                tracer.finish(trace)
     
     except WebSocketDisconnect:
         manager.disconnect(websocket, room_code)
-    except Exception as e:
-        print(f"WebSocket error: {e}")
+    except Exception:
+        log.exception("ws_error", room=room_code)
         manager.disconnect(websocket, room_code)
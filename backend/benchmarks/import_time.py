@@ -0,0 +1,69 @@
+"""
+Import-time profile of the backend: python -X importtime -c "import app.main"
+Run from backend/: python -m benchmarks.import_time [--top 15] [--budget 3.0]
+
+Prints total import time, the slowest app modules and the slowest third-party
+packages (cumulative). Exits with status 1 when the total exceeds --budget seconds,
+so CI can catch work creeping back into import time.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+MODULE = "app.main"
+
+
+def profile(module: str) -> List[Tuple[str, int, int, int]]:
+    """[(module, self_us, cumulative_us, depth)] from -X importtime"""
+    env = {**os.environ, "DATABASE_URL": os.getenv("DATABASE_URL", "sqlite:///./import_profile.db")}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"import {module} failed")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default=MODULE)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget", type=float, default=0.0, help="max total seconds (0 = report only)")
+    args = parser.parse_args()
+
+    rows = profile(args.module)
+    total = next(cumulative for name, _, cumulative, _ in rows if name == args.module) / 1e6
+
+    app_rows = sorted((r for r in rows if r[0].startswith("app")), key=lambda r: -r[2])
+    packages = {}
+    for name, _, cumulative, depth in rows:
+        top_level = name.split(".")[0]
+        if top_level != "app" and "." not in name:
+            packages[top_level] = max(packages.get(top_level, 0), cumulative)
+
+    print(f"import {args.module}: {total:.3f} s")
+    print(f"\nslowest app modules (cumulative / self, ms):")
+    for name, self_us, cumulative, _ in app_rows[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} {self_us / 1000:8.1f}  {name}")
+    print(f"\nslowest packages (cumulative, ms):")
+    for name, cumulative in sorted(packages.items(), key=lambda p: -p[1])[:args.top]:
+        print(f"  {cumulative / 1000:8.1f}  {name}")
+
+    if args.budget and total > args.budget:
+        print(f"\nFAIL: import time {total:.3f} s exceeds budget {args.budget:.3f} s")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
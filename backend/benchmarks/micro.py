@@ -0,0 +1,295 @@
+"""
+Micro-benchmarks of the backend hot paths
+Run from backend/: python -m benchmarks.micro [--filter word_draw] [--compare benchmarks/results/<commit>.json]
+
+Cases:
+  word_draw      WordService.get_random_word, per draw, across pack sizes and game lengths
+  game_state     get_game_state across room sizes
+  broadcast      ConnectionManager.broadcast to mock sockets (loopback bus)
+  auth           get_current_user: JWT decode + user lookup (SQLite), and a principal cache hit
+  room_create    POST /rooms/create handler with the in-memory store already holding N rooms
+
+Each case runs for --min-time seconds, --repeat times; the median and best time per
+operation are reported. Results are written as JSON (default
+benchmarks/results/<git commit>.json). --compare reads an earlier result file, flags
+cases whose median is more than --threshold slower and exits with status 1 if any are.
+Compare runs from the same machine: absolute times differ between hosts.
+"""
+import os
+import tempfile
+
+# Isolated, quiet process state before any app module is imported
+BENCH_DIR = tempfile.mkdtemp(prefix="aliby-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{BENCH_DIR}/bench.db"
+os.environ["REDIS_URL"] = ""
+os.environ["ROOM_JOURNAL_DIR"] = ""
+os.environ["TRACE_FILE"] = ""
+os.environ["TRACE_OTLP_URL"] = ""
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+class Case:
+    def __init__(self, name: str, op: Callable, ops_per_call: int = 1, is_async: bool = False,
+                 setup: Optional[Callable] = None, teardown: Optional[Callable] = None):
+        self.name = name
+        self.op = op
+        self.ops_per_call = ops_per_call
+        self.is_async = is_async
+        self.setup = setup  # run before measuring, not timed
+        self.teardown = teardown
+
+
+def measure(case: Case, min_time: float, repeat: int, loop: asyncio.AbstractEventLoop) -> dict:
+    async def run_async() -> float:
+        calls = 0
+        started = time.perf_counter()
+        while True:
+            await case.op()
+            calls += 1
+            elapsed = time.perf_counter() - started
+            if elapsed >= min_time:
+                return elapsed / (calls * case.ops_per_call)
+
+    def run_sync() -> float:
+        calls = 0
+        started = time.perf_counter()
+        while True:
+            case.op()
+            calls += 1
+            elapsed = time.perf_counter() - started
+            if elapsed >= min_time:
+                return elapsed / (calls * case.ops_per_call)
+
+    times = [loop.run_until_complete(run_async()) if case.is_async else run_sync() for _ in range(repeat)]
+    return {
+        "median_us": round(statistics.median(times) * 1e6, 3),
+        "best_us": round(min(times) * 1e6, 3),
+        "repeat": repeat,
+    }
+
+
+# Cases
+
+def word_draw_cases() -> List[Case]:
+    from app.models import Difficulty, GameMode
+    from app.services.word_service import WordService
+
+    cases = []
+    for pool in (100, 1000, 10000):
+        service = WordService()
+        service.packs = {GameMode.ALIAS: {"medium": [
+            {"word": f"word{i}", "taboo_words": [], "translation": ""} for i in range(pool)
+        ]}}
+        for game in (10, 100, 1000):
+            def play(service=service, game=game):
+                for _ in range(game):
+                    service.get_random_word(GameMode.ALIAS, Difficulty.MEDIUM, "BNCH")
+                service.clear_room_words("BNCH")
+            cases.append(Case(f"word_draw[pool={pool},game={game}]", play, ops_per_call=game))
+    return cases
+
+
+def make_room(code: str, teams: int, players_per_team: int):
+    import uuid
+    from app.models import GameMode, GameStatus, GameSettings
+    from app.room_state import RoomState, SettingsState, TeamState, PlayerState
+
+    return RoomState(
+        id=uuid.uuid4(),
+        room_code=code,
+        mode=GameMode.ALIAS,
+        status=GameStatus.PLAYING,
+        teams=[
+            TeamState(id=t + 1, name=f"Team {t + 1}", score=0, players=[
+                PlayerState(user_id=f"u{t}-{p}", username=f"player{t}-{p}", is_explaining=False)
+                for p in range(players_per_team)
+            ])
+            for t in range(teams)
+        ],
+        current_team_index=0,
+        settings=SettingsState(**GameSettings().model_dump()),
+        host_id="host",
+    )
+
+
+def game_state_cases() -> List[Case]:
+    from app.websocket import get_game_state
+
+    cases = []
+    for teams, players in ((2, 2), (2, 6), (4, 10)):
+        room = make_room("BNCH", teams, players)
+        cases.append(Case(f"game_state[players={teams * players}]", lambda room=room: get_game_state(room)))
+    return cases
+
+
+class MockSocket:
+    """Accepts sends like a WebSocket with an instantly draining buffer"""
+
+    def __init__(self):
+        self.sent = 0
+
+    async def send_text(self, text: str):
+        self.sent += 1
+
+    async def send_json(self, data):
+        self.sent += 1
+
+
+def broadcast_cases() -> List[Case]:
+    from app.websocket import ConnectionManager, get_game_state
+
+    cases = []
+    message = get_game_state(make_room("BNCH", 2, 3))
+    for sockets in (2, 10, 50):
+        manager = ConnectionManager()
+        manager.active_connections["BNCH"] = {MockSocket() for _ in range(sockets)}
+        cases.append(Case(f"broadcast[sockets={sockets}]",
+                          lambda manager=manager: manager.broadcast("BNCH", message), is_async=True))
+    return cases
+
+
+def auth_cases(loop: asyncio.AbstractEventLoop) -> List[Case]:
+    from fastapi.security import HTTPAuthorizationCredentials
+    from app.auth import create_access_token, get_current_user, principal_cache
+    from app.database import AsyncSessionLocal, SessionLocal
+    from app.db_models import User
+    from app.migrate import main as migrate
+
+    migrate()
+    with SessionLocal() as db:
+        user = User(username="bench", email="bench@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token({"sub": str(user_id)}))
+    session = AsyncSessionLocal()
+
+    async def lookup():
+        principal_cache.invalidate_token(credentials.credentials)
+        await get_current_user(credentials, session)
+
+    async def cached():
+        await get_current_user(credentials, session)
+
+    return [
+        Case("auth[jwt_decode+user_lookup]", lookup, is_async=True),
+        Case("auth[principal_cache_hit]", cached, is_async=True,
+             teardown=lambda: loop.run_until_complete(session.close())),
+    ]
+
+
+def room_create_cases(loop: asyncio.AbstractEventLoop) -> List[Case]:
+    from app.api.rooms import create_room
+
+    cases = []
+    for occupancy in (0, 10000, 100000):
+        def fill(occupancy=occupancy):
+            # Rooms created while measuring stay, so occupancy grows slightly during the case
+            from app.services.room_store import room_store
+            while len(room_store.rooms) < occupancy:
+                loop.run_until_complete(create_room())
+        cases.append(Case(f"room_create[occupancy={occupancy}]", create_room, is_async=True, setup=fill))
+    return cases
+
+
+# Runner
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_cases(pattern: str, min_time: float, repeat: int) -> Dict[str, dict]:
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    groups = {
+        "word_draw": word_draw_cases,
+        "game_state": game_state_cases,
+        "broadcast": broadcast_cases,
+        "auth": lambda: auth_cases(loop),
+        "room_create": lambda: room_create_cases(loop),
+    }
+    results = {}
+    for group, build in groups.items():
+        if pattern and pattern not in group:
+            continue
+        for case in build():
+            if case.setup is not None:
+                case.setup()
+            results[case.name] = measure(case, min_time, repeat, loop)
+            if case.teardown is not None:
+                case.teardown()
+            print(f"{case.name:42} {results[case.name]['median_us']:12.3f} us  (best {results[case.name]['best_us']:.3f})")
+    loop.close()
+    return results
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    regressions = []
+    print(f"\n{'case':42} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        change = current["median_us"] / previous["median_us"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:42} {previous['median_us']:10.3f}us {current['median_us']:10.3f}us {change:+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backend micro-benchmarks")
+    parser.add_argument("--filter", default="", help="run only groups whose name contains this")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per measurement")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="result file (default benchmarks/results/<git commit>.json)")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="relative slowdown flagged as regression")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    results = run_cases(args.filter, args.min_time, args.repeat)
+    document = {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "min_time": args.min_time,
+        "results": results,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(document, indent=2) + "\n")
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        print(f"Compared with {baseline.get('commit', args.compare)} (threshold {args.threshold:+.0%})")
+        regressions = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) slower than the threshold")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
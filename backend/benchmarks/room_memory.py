@@ -0,0 +1,101 @@
+"""
+Memory per room: pydantic GameRoom vs slotted RoomState
+Run from backend/: python -m benchmarks.room_memory [--rooms 10000]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from app.models import GameRoom, GameMode, Team, Player, GuessedWord, Word
+from app.room_state import RoomState, TeamState, PlayerState, GuessedWordState, WordState
+
+TEAMS = 2
+PLAYERS_PER_TEAM = 3
+GUESSED_WORDS = 15
+TABOO = ["one", "two", "three", "four", "five"]  # Shared, like word pack lists
+
+
+def make_pydantic_room(i: int) -> GameRoom:
+    return GameRoom(
+        room_code=f"R{i:05d}",
+        mode=GameMode.ALIAS,
+        host_id=f"host-{i}",
+        teams=[
+            Team(
+                id=t + 1,
+                name=f"Team {t + 1}",
+                players=[Player(user_id=f"u{i}-{t}-{p}", username=f"player{p}") for p in range(PLAYERS_PER_TEAM)],
+            )
+            for t in range(TEAMS)
+        ],
+        current_round_words=[
+            GuessedWord(word=f"word{w}", taboo_words=TABOO, timestamp=time.time(), translation="slovo")
+            for w in range(GUESSED_WORDS)
+        ],
+        current_word=Word(word="current", taboo_words=TABOO, translation="tekushchee"),
+    )
+
+
+def make_slotted_room(i: int) -> RoomState:
+    return RoomState(
+        room_code=f"R{i:05d}",
+        mode=GameMode.ALIAS,
+        host_id=f"host-{i}",
+        teams=[
+            TeamState(
+                id=t + 1,
+                name=f"Team {t + 1}",
+                players=[PlayerState(f"u{i}-{t}-{p}", f"player{p}") for p in range(PLAYERS_PER_TEAM)],
+            )
+            for t in range(TEAMS)
+        ],
+        current_round_words=[
+            GuessedWordState(f"word{w}", TABOO, time.time(), False, "slovo")
+            for w in range(GUESSED_WORDS)
+        ],
+        current_word=WordState("current", TABOO, "tekushchee"),
+    )
+
+
+def measure(factory, count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    rooms = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del rooms
+    return (after - before) / count
+
+
+def mutation_cost(room, count: int = 100_000) -> float:
+    """Score bump + guessed word append, the word_guessed hot path"""
+    cls = GuessedWord if isinstance(room, GameRoom) else GuessedWordState
+    started = time.perf_counter()
+    for _ in range(count):
+        room.teams[0].score += 1
+        if cls is GuessedWord:
+            room.current_round_words.append(GuessedWord(word="w", taboo_words=TABOO, timestamp=0.0))
+        else:
+            room.current_round_words.append(GuessedWordState("w", TABOO, 0.0))
+        room.current_round_words.pop()
+    return (time.perf_counter() - started) / count * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rooms", type=int, default=10_000)
+    args = parser.parse_args()
+
+    pydantic_bytes = measure(make_pydantic_room, args.rooms)
+    slotted_bytes = measure(make_slotted_room, args.rooms)
+    print(f"Rooms: {args.rooms} ({TEAMS} teams x {PLAYERS_PER_TEAM} players, {GUESSED_WORDS} guessed words)")
+    print(f"pydantic GameRoom: {pydantic_bytes:10.0f} bytes/room  {pydantic_bytes * args.rooms / 2**20:8.1f} MiB total")
+    print(f"slotted RoomState: {slotted_bytes:10.0f} bytes/room  {slotted_bytes * args.rooms / 2**20:8.1f} MiB total")
+    print(f"reduction:         {100 * (1 - slotted_bytes / pydantic_bytes):10.1f} %")
+    print(f"word_guessed mutation: pydantic {mutation_cost(make_pydantic_room(0)):.0f} ns, "
+          f"slotted {mutation_cost(make_slotted_room(0)):.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
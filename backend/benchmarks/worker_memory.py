@@ -0,0 +1,86 @@
+"""
+Memory per worker of the prefork launcher, with and without preloading in the master
+Run from backend/ (Linux): python -m benchmarks.worker_memory [--workers 4]
+
+Starts python -m app.serve twice (--no-preload, then default), waits until every
+worker is ready, and reads /proc/<pid>/smaps_rollup of each worker. RSS counts
+shared pages in full; PSS splits them between the processes sharing them, and
+private memory is what each extra worker really costs.
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+FIELDS = ("Rss", "Pss", "Private_Clean", "Private_Dirty")
+
+
+def smaps_rollup(pid: int) -> dict:
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if name in FIELDS:
+                values[name] = int(rest.split()[0])  # kB
+    return values
+
+
+def children(pid: int) -> list:
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(p) for p in f.read().split()]
+
+
+def wait_ready(port: int, workers: int, timeout: float = 60):
+    """Poll /ready until it has answered 200 often enough to have hit every worker"""
+    deadline = time.monotonic() + timeout
+    ok = 0
+    while ok < workers * 5:
+        if time.monotonic() > deadline:
+            raise SystemExit("workers did not become ready")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/ready", timeout=1) as response:
+                ok += response.status == 200
+        except Exception:
+            time.sleep(0.2)
+
+
+def measure(workers: int, port: int, preload: bool) -> list:
+    args = [sys.executable, "-m", "app.serve", "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers)]
+    if not preload:
+        args.append("--no-preload")
+    env = {**os.environ, "LOG_LEVEL": "WARNING"}
+    master = subprocess.Popen(args, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_ready(port, workers)
+        time.sleep(1)  # let warm-up allocations settle
+        return [smaps_rollup(pid) for pid in children(master.pid)]
+    finally:
+        master.send_signal(signal.SIGTERM)
+        master.wait(timeout=30)
+
+
+def report(label: str, samples: list):
+    n = len(samples)
+    avg = {f: sum(s[f] for s in samples) / n / 1024 for f in FIELDS}
+    private = avg["Private_Clean"] + avg["Private_Dirty"]
+    print(f"{label:12} workers={n}  rss {avg['Rss']:7.1f} MB  pss {avg['Pss']:7.1f} MB  private {private:7.1f} MB")
+    return avg["Pss"], private
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8199)
+    args = parser.parse_args()
+
+    base_pss, base_private = report("no preload", measure(args.workers, args.port, preload=False))
+    pss, private = report("preload", measure(args.workers, args.port, preload=True))
+    print(f"preloading changes per-worker pss by {100 * (pss / base_pss - 1):+.1f} %, "
+          f"private memory by {100 * (private / base_private - 1):+.1f} %")
+
+
+if __name__ == "__main__":
+    main()
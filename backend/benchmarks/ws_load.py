@@ -0,0 +1,355 @@
+"""
+WebSocket load generator: N rooms x M players playing scripted games against a live server
+Run from backend/ with the stack up (docker compose up):
+
+    python -m benchmarks.ws_load --rooms 500 --players 6 --duration 60 --container aliby-game-backend-1
+
+Each room is created through POST /rooms/create; its players connect, join the two
+teams alternately and the host starts the game. The first player of the current team
+then starts a round, guesses or skips words at --actions-per-second (--skip-ratio of
+them skips) and ends the round after --words-per-round words; the other team plays next.
+
+Latency is measured from the moment a client sends an action to the moment each player
+of the room receives the broadcast it causes (new_word after start_round, word_guessed
+and word_skip; game_state after join_team and round_end). A player that has not received
+it within --timeout counts as a dropped message. Server resource usage comes from
+/metrics (event-loop lag, open sockets, refused work; needs --cluster-secret) and, with --pid or --container,
+from the CPU and memory of the server process(es).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import resource
+import subprocess
+import time
+import urllib.request
+from typing import Dict, List, Optional
+
+import websockets
+
+OVERLOADED_CLOSE_CODE = 1013
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+class Results:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}  # {action: [seconds]}
+        self.actions = 0
+        self.dropped = 0
+        self.connect_failures = 0
+        self.refused = 0  # sockets closed with 1013 (server overloaded)
+        self.create_failures = 0
+        self.rooms_playing = 0
+        self.server_samples: List[dict] = []
+
+    def summary(self) -> dict:
+        per_action = {}
+        everything = []
+        for action, values in sorted(self.latencies.items()):
+            values.sort()
+            everything.extend(values)
+            per_action[action] = latency_summary(values)
+        everything.sort()
+        return {
+            "actions": self.actions,
+            "deliveries": len(everything),
+            "dropped": self.dropped,
+            "rooms_playing": self.rooms_playing,
+            "create_failures": self.create_failures,
+            "connect_failures": self.connect_failures,
+            "refused": self.refused,
+            "latency": latency_summary(everything),
+            "latency_by_action": per_action,
+        }
+
+
+def latency_summary(values: List[float]) -> dict:
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+        "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+        "p999_ms": round(percentile(values, 0.999) * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+    }
+
+
+class Player:
+    def __init__(self, room: "Room", index: int):
+        self.room = room
+        self.user_id = f"load-{room.code}-{index}"
+        self.team = index % 2 + 1
+        self.ws = None
+        self.reader: Optional[asyncio.Task] = None
+
+    async def connect(self):
+        self.ws = await websockets.connect(f"{self.room.args.ws_url}/ws/game/{self.room.code}",
+                                           open_timeout=self.room.args.timeout, max_size=None)
+        self.reader = asyncio.create_task(self.read())
+
+    async def read(self):
+        try:
+            async for raw in self.ws:
+                self.room.received(self, json.loads(raw), time.perf_counter())
+        except websockets.ConnectionClosed as e:
+            if e.rcvd is not None and e.rcvd.code == OVERLOADED_CLOSE_CODE:
+                self.room.results.refused += 1
+        finally:
+            self.room.players.discard(self)
+
+    async def send(self, message: dict):
+        await self.ws.send(json.dumps(message))
+
+
+class Room:
+    """One scripted game; one action in flight at a time"""
+
+    def __init__(self, code: str, args, results: Results):
+        self.code = code
+        self.args = args
+        self.results = results
+        self.players = set()
+        self.pending: Optional[dict] = None
+        self.current_word = ""
+
+    def received(self, player: Player, message: dict, now: float):
+        if message.get("type") == "new_word":
+            self.current_word = message.get("word", "")
+        pending = self.pending
+        if pending and message.get("type") == pending["expect"] and player in pending["waiting"]:
+            pending["waiting"].discard(player)
+            self.results.latencies.setdefault(pending["action"], []).append(now - pending["sent_at"])
+            if not pending["waiting"]:
+                pending["done"].set()
+
+    async def act(self, player: Player, message: dict, expect: str):
+        waiting = set(self.players)
+        self.pending = pending = {
+            "action": message["type"], "expect": expect, "waiting": waiting,
+            "done": asyncio.Event(), "sent_at": time.perf_counter(),
+        }
+        self.results.actions += 1
+        await player.send(message)
+        try:
+            await asyncio.wait_for(pending["done"].wait(), self.args.timeout)
+        except asyncio.TimeoutError:
+            self.results.dropped += len(waiting)
+        self.pending = None
+
+    async def pause(self):
+        rate = self.args.actions_per_second
+        await asyncio.sleep(random.expovariate(rate) if rate > 0 else 0)
+
+    async def play(self, deadline: float):
+        members: List[Player] = []
+        for i in range(self.args.players):
+            player = Player(self, i)
+            try:
+                await player.connect()
+            except Exception:
+                self.results.connect_failures += 1
+                continue
+            members.append(player)
+            self.players.add(player)
+            await self.act(player, {"type": "join_team", "team": player.team, "user_id": player.user_id,
+                                    "username": player.user_id}, "game_state")
+        teams = {team: [p for p in members if p.team == team] for team in (1, 2)}
+        if not teams[1] or not teams[2]:
+            return
+        self.results.rooms_playing += 1
+        await self.act(members[0], {"type": "start_game"}, "game_state")
+        team = 1
+        while time.monotonic() < deadline and self.players:
+            explainer = teams[team][0]
+            await self.act(explainer, {"type": "start_round", "user_id": explainer.user_id}, "new_word")
+            for _ in range(self.args.words_per_round):
+                await self.pause()
+                if time.monotonic() >= deadline:
+                    break
+                action = "word_skip" if random.random() < self.args.skip_ratio else "word_guessed"
+                await self.act(explainer, {"type": action, "word": self.current_word}, "new_word")
+            await self.act(explainer, {"type": "round_end"}, "game_state")
+            team = 2 if team == 1 else 1
+
+    async def close(self):
+        for player in list(self.players):
+            await player.ws.close()
+
+
+def create_room(args) -> str:
+    # Neither a score nor a round limit ends the game before --duration; once over, every action would time out
+    query = (f"timed_mode={'true' if args.timed else 'false'}&round_time={args.round_time}"
+             f"&score_to_win=1000000&rounds_total=0")
+    request = urllib.request.Request(f"{args.base_url}/rooms/create?{query}", method="POST")
+    with urllib.request.urlopen(request, timeout=args.timeout) as response:
+        return json.loads(response.read())["room_code"]
+
+
+def scrape_metrics(base_url: str, cluster_secret: str) -> dict:
+    """Sum of each aliby_* series over workers"""
+    values: Dict[str, float] = {}
+    request = urllib.request.Request(f"{base_url}/metrics", headers={"X-Cluster-Secret": cluster_secret})
+    with urllib.request.urlopen(request, timeout=5) as response:
+        for line in response.read().decode().splitlines():
+            if line.startswith("#") or "_bucket" in line:
+                continue
+            name, _, value = line.rpartition(" ")
+            key = re.sub(r'worker="[^"]*",?', "", name).replace("{}", "")
+            values[key] = values.get(key, 0.0) + float(value)
+    return values
+
+
+def process_tree(pid: int) -> List[int]:
+    pids = [pid]
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            for child in f.read().split():
+                pids.extend(process_tree(int(child)))
+    except OSError:
+        pass
+    return pids
+
+
+def proc_usage(pid: int) -> dict:
+    """CPU seconds and RSS of a process and its children (prefork master + workers)"""
+    ticks = os.sysconf("SC_CLK_TCK")
+    cpu, rss = 0.0, 0
+    for p in process_tree(pid):
+        try:
+            with open(f"/proc/{p}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            cpu += (int(fields[11]) + int(fields[12])) / ticks  # utime + stime
+            with open(f"/proc/{p}/status") as f:
+                rss += next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+        except (OSError, StopIteration):
+            continue
+    return {"cpu_seconds": cpu, "rss_mb": rss / 1024}
+
+
+def container_usage(name: str) -> dict:
+    output = subprocess.run(["docker", "stats", "--no-stream", "--format", "{{json .}}", name],
+                            capture_output=True, text=True, timeout=10).stdout
+    stats = json.loads(output)
+    return {"cpu_percent": float(stats["CPUPerc"].rstrip("%")), "memory": stats["MemUsage"].split("/")[0].strip()}
+
+
+async def sample_server(args, results: Results, stop: asyncio.Event):
+    previous = None
+    while not stop.is_set():
+        sample = {"t": round(time.monotonic(), 1)}
+        try:
+            metrics = await asyncio.to_thread(scrape_metrics, args.base_url, args.cluster_secret)
+            sample["loop_lag_ms"] = round(metrics.get("aliby_loop_lag_smoothed_seconds", 0.0) * 1000, 2)
+            sample["ws_connections"] = int(metrics.get("aliby_ws_connections", 0))
+            sample["refused"] = int(sum(v for k, v in metrics.items() if k.startswith("aliby_admission_rejected")))
+        except Exception:
+            pass
+        if args.pid:
+            usage = proc_usage(args.pid)
+            if previous is not None:
+                sample["cpu_percent"] = round(100 * (usage["cpu_seconds"] - previous[0]) / (time.monotonic() - previous[1]), 1)
+            previous = (usage["cpu_seconds"], time.monotonic())
+            sample["rss_mb"] = round(usage["rss_mb"], 1)
+        if args.container:
+            try:
+                sample.update(await asyncio.to_thread(container_usage, args.container))
+            except Exception:
+                pass
+        results.server_samples.append(sample)
+        try:
+            await asyncio.wait_for(stop.wait(), args.sample_interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+def server_summary(samples: List[dict]) -> dict:
+    summary = {}
+    for key in ("loop_lag_ms", "ws_connections", "cpu_percent", "rss_mb", "refused"):
+        values = [s[key] for s in samples if key in s]
+        if values:
+            summary[key] = {"max": max(values), "avg": round(sum(values) / len(values), 2)}
+    return summary
+
+
+async def run(args) -> dict:
+    results = Results()
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_server(args, results, stop))
+    started = time.monotonic()
+    deadline = started + args.ramp + args.duration
+    rooms: List[Room] = []
+    tasks = []
+    for i in range(args.rooms):
+        try:
+            code = await asyncio.to_thread(create_room, args)
+        except Exception:
+            results.create_failures += 1
+            continue
+        room = Room(code, args, results)
+        rooms.append(room)
+        tasks.append(asyncio.create_task(room.play(deadline)))
+        # Spread room starts over the ramp-up period
+        await asyncio.sleep(max(started + args.ramp * (i + 1) / args.rooms - time.monotonic(), 0))
+    await asyncio.gather(*tasks, return_exceptions=True)
+    elapsed = time.monotonic() - started
+    stop.set()
+    await sampler
+    await asyncio.gather(*(room.close() for room in rooms), return_exceptions=True)
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    summary = results.summary()
+    summary["seconds"] = round(elapsed, 1)
+    summary["actions_per_second"] = round(results.actions / elapsed, 1) if elapsed else 0.0
+    summary["client_cpu_percent"] = round(100 * (usage.ru_utime + usage.ru_stime) / elapsed, 1) if elapsed else 0.0
+    summary["server"] = server_summary(results.server_samples)
+    return summary
+
+
+def raise_fd_limit():
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WebSocket load generator")
+    parser.add_argument("--base-url", default="http://localhost:8050")
+    parser.add_argument("--ws-url", default=None, help="default: base URL with ws://")
+    parser.add_argument("--rooms", type=int, default=100)
+    parser.add_argument("--players", type=int, default=6, help="players per room, split into two teams")
+    parser.add_argument("--duration", type=float, default=60, help="seconds of play after ramp-up")
+    parser.add_argument("--ramp", type=float, default=10, help="seconds over which rooms are started")
+    parser.add_argument("--actions-per-second", type=float, default=0.5, help="guess/skip rate per room")
+    parser.add_argument("--skip-ratio", type=float, default=0.25)
+    parser.add_argument("--words-per-round", type=int, default=10)
+    parser.add_argument("--timed", action="store_true", help="timed rounds (timer_update broadcasts every second)")
+    parser.add_argument("--round-time", type=int, default=600)
+    parser.add_argument("--timeout", type=float, default=5, help="seconds before a missing broadcast counts as dropped")
+    parser.add_argument("--pid", type=int, help="server process to sample CPU/RSS of (with its workers)")
+    parser.add_argument("--container", help="docker container to sample with docker stats")
+    parser.add_argument("--sample-interval", type=float, default=2)
+    parser.add_argument("--cluster-secret", default=os.getenv("CLUSTER_SECRET", ""),
+                        help="X-Cluster-Secret for /metrics (default: $CLUSTER_SECRET)")
+    parser.add_argument("--json", help="write the summary to this file")
+    args = parser.parse_args()
+    args.ws_url = args.ws_url or args.base_url.replace("http", "ws", 1)
+
+    raise_fd_limit()
+    summary = asyncio.run(run(args))
+    print(json.dumps(summary, indent=2))
+    if summary["client_cpu_percent"] > 90:
+        print("warning: the load generator itself is CPU-bound; latencies include client delay")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
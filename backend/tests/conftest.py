@@ -0,0 +1,34 @@
+"""
+Unit tests. Run from backend/: python -m pytest tests
+
+App modules read their configuration from the environment at import time, so an
+isolated, Redis-free setup is put in place before any of them is imported.
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='aliby-tests-')}/test.db"
+os.environ["REDIS_URL"] = ""
+os.environ["ROOM_JOURNAL_DIR"] = ""
+os.environ["TRACE_FILE"] = ""
+os.environ["TRACE_OTLP_URL"] = ""
+
+import pytest
+from app.models import GameMode
+from app.room_state import RoomState, TeamState
+
+
+def new_room(code: str = "ABCD") -> RoomState:
+    return RoomState(
+        room_code=code,
+        mode=GameMode.ALIAS,
+        host_id="host",
+        teams=[TeamState(id=1, name="Team 1"), TeamState(id=2, name="Team 2")],
+    )
+
+
+@pytest.fixture
+def make_room():
+    return new_room
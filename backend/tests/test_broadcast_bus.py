@@ -0,0 +1,102 @@
+import asyncio
+import json
+
+import fakeredis
+import pytest
+
+from app.services import broadcast_bus as bus_module
+from app.services.broadcast_bus import RedisBroadcastBus
+
+
+class Collector:
+    def __init__(self):
+        self.received = []
+        self.arrived = asyncio.Event()
+
+    async def deliver(self, room_code, message):
+        self.received.append((room_code, message["type"]))
+        self.arrived.set()
+
+    async def wait_for(self, count: int):
+        while len(self.received) < count:
+            self.arrived.clear()
+            await asyncio.wait_for(self.arrived.wait(), 2)
+
+
+def test_events_reach_other_workers_only():
+    async def run():
+        server = fakeredis.FakeServer()
+        first = RedisBroadcastBus(fakeredis.FakeAsyncRedis(server=server))
+        second = RedisBroadcastBus(fakeredis.FakeAsyncRedis(server=server))
+        first_got, second_got = Collector(), Collector()
+        await first.start(first_got.deliver)
+        await second.start(second_got.deliver)
+
+        first.publish("ROOM", {"type": "game_state"})
+        first.publish("ROOM", {"type": "new_word"})
+        await second_got.wait_for(2)
+        await asyncio.sleep(0.05)
+        await first.stop()
+        await second.stop()
+        return first_got.received, second_got.received
+
+    first_received, second_received = asyncio.run(run())
+    assert second_received == [("ROOM", "game_state"), ("ROOM", "new_word")]
+    assert first_received == []  # the publisher already delivered to its own sockets
+
+
+class FlakyPubSub:
+    """Yields the given events, then fails (or waits forever if it is the last one)"""
+
+    def __init__(self, events, fail: bool):
+        self.events = events
+        self.fail = fail
+        self.closed = False
+
+    async def subscribe(self, channel):
+        pass
+
+    async def unsubscribe(self, channel):
+        pass
+
+    async def aclose(self):
+        self.closed = True
+
+    async def listen(self):
+        for event in self.events:
+            yield {"type": "message", "data": json.dumps({"origin": "other", "events": [event]})}
+        if self.fail:
+            raise ConnectionError("Connection reset by peer")
+        await asyncio.Event().wait()
+
+
+class FlakyRedis:
+    def __init__(self, *pubsubs):
+        self.pubsubs = list(pubsubs)
+        self.created = []
+
+    def pubsub(self, ignore_subscribe_messages=True):
+        pubsub = self.pubsubs.pop(0)
+        self.created.append(pubsub)
+        return pubsub
+
+
+def test_subscription_is_reestablished_after_a_disconnect(monkeypatch):
+    monkeypatch.setattr(bus_module, "BROADCAST_RETRY_MIN", 0.01)
+    redis = FlakyRedis(
+        FlakyPubSub([["ROOM", {"type": "timer_update"}]], fail=True),
+        FlakyPubSub([["ROOM", {"type": "timer_ended"}]], fail=False),
+    )
+
+    async def run():
+        bus = RedisBroadcastBus(redis)
+        got = Collector()
+        await bus.start(got.deliver)
+        await got.wait_for(2)
+        await bus.stop()
+        return bus, got.received
+
+    bus, received = asyncio.run(run())
+    assert received == [("ROOM", "timer_update"), ("ROOM", "timer_ended")]
+    assert bus.resubscribes == 1
+    assert all(pubsub.closed for pubsub in redis.created)
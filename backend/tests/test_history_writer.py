@@ -0,0 +1,48 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.migrate import main as migrate
+from app.services.history_writer import HistoryWriter
+
+
+@pytest.fixture(scope="module", autouse=True)
+def schema():
+    migrate()
+
+
+def game_row(user_id: int, winner="Team 1") -> dict:
+    return {
+        "user_id": user_id,
+        "room_code": "ABCD",
+        "played_at": datetime.utcnow(),
+        "teams": [],
+        "winner": winner,
+        "final_scores": {"Team 1": 3},
+        "guessed_words": [],
+        "guessed_words_count": 0,
+        "score": 3.0,
+        "won": True,
+    }
+
+
+def test_bad_row_fails_only_its_own_save():
+    async def run():
+        writer = HistoryWriter()
+        writer.start()
+        results = await asyncio.gather(
+            writer.submit(game_row(1)),
+            writer.submit(game_row(2, winner=None)),  # violates NOT NULL
+            writer.submit(game_row(3)),
+            return_exceptions=True,
+        )
+        await writer.stop()
+        return writer, results
+
+    writer, (first, bad, third) = asyncio.run(run())
+    assert isinstance(first, int) and isinstance(third, int) and first != third
+    assert isinstance(bad, IntegrityError)
+    assert writer.stats()["rows_written"] == 2
+    assert writer.stats()["failed"] == 1
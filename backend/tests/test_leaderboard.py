@@ -0,0 +1,110 @@
+import asyncio
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.api.history import SaveGameRequest, credit_user, save_game
+from app.auth import AuthenticatedUser
+from app.database import AsyncSessionLocal
+from app.db_models import LeaderboardRollup
+from app.migrate import main as migrate
+from app.models import GameStatus
+from app.room_state import PlayerState
+from app.services import leaderboard
+from app.services.room_store import room_store
+
+
+@pytest.fixture(scope="module", autouse=True)
+def schema():
+    migrate()
+
+
+def finished_room(make_room, code: str):
+    room = make_room(code)
+    room.teams[0].players.append(PlayerState("p1", "alice"))
+    room.teams[1].players.append(PlayerState("p2", "bob"))
+    room.teams[0].score, room.teams[1].score = 30, 12
+    room.status = GameStatus.FINISHED
+    room.winner = "Team 1"
+    return room
+
+
+def test_result_comes_from_the_room_and_is_credited_once(make_room):
+    alice = AuthenticatedUser(id=1, username="alice", email="alice@example.com")
+
+    async def run():
+        await room_store.save(finished_room(make_room, "LDB1"))
+        result = await credit_user("LDB1", alice)
+        with pytest.raises(HTTPException) as again:
+            await credit_user("LDB1", alice)
+        return result, again.value
+
+    result, again = asyncio.run(run())
+    assert (result["score"], result["won"], result["winner"]) == (30, True, "Team 1")
+    assert result["final_scores"] == {"Team 1": 30, "Team 2": 12}
+    assert again.status_code == 409
+
+
+def test_unfinished_game_is_not_credited(make_room):
+    bob = AuthenticatedUser(id=2, username="bob", email="bob@example.com")
+
+    async def run():
+        await room_store.save(make_room("LDB2"))
+        with pytest.raises(HTTPException) as lobby:
+            await credit_user("LDB2", bob)
+        with pytest.raises(HTTPException) as missing:
+            await credit_user("NONE", bob)
+        return lobby.value, missing.value
+
+    lobby, missing = asyncio.run(run())
+    assert lobby.status_code == missing.status_code == 404
+
+
+def test_prune_keeps_current_periods():
+    now = datetime(2026, 3, 18, 12)
+    old = now.date() - timedelta(days=leaderboard.LEADERBOARD_RETENTION_DAYS + 1)
+    rows = [
+        ("day", now.date()),
+        ("day", old),
+        ("week", leaderboard.period_start("week", now)),
+        ("week", old),
+        ("all", leaderboard.ALL_TIME_START),
+    ]
+
+    async def run():
+        async with AsyncSessionLocal() as db:
+            db.add_all([
+                LeaderboardRollup(period=period, period_start=start, user_id=9, score=1, games_played=1, wins=0)
+                for period, start in rows
+            ])
+            await db.commit()
+            deleted = await leaderboard.prune(db, now)
+            await db.commit()
+            kept = (await db.execute(
+                select(LeaderboardRollup.period, LeaderboardRollup.period_start)
+                .where(LeaderboardRollup.user_id == 9)
+            )).all()
+        return deleted, set(kept)
+
+    deleted, kept = asyncio.run(run())
+    assert deleted == 2
+    assert kept == {rows[0], rows[2], rows[4]}
+    assert all(isinstance(start, date) for _, start in kept)
+
+
+def test_save_after_the_room_is_gone_returns_404(make_room):
+    alice = AuthenticatedUser(id=1, username="alice", email="alice@example.com")
+
+    async def run():
+        await room_store.save(finished_room(make_room, "LDB3"))
+        await room_store.delete("LDB3")  # evicted after ROOM_FINISHED_TTL
+        with pytest.raises(HTTPException) as gone:
+            await save_game(SaveGameRequest(room_code="LDB3", guessed_words=[]), None, alice)
+        return gone.value
+
+    gone = asyncio.run(run())
+    assert gone.status_code == 404
+    assert gone.detail == "No finished game in this room"
+    assert set(SaveGameRequest.model_fields) == {"room_code", "guessed_words"}
@@ -0,0 +1,69 @@
+import json
+import logging
+
+import pytest
+
+from app import log as log_module
+from app.log import EventQueueHandler, JsonFormatter, TextFormatter, get_logger, parse_pairs
+
+
+class Capture(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def captured():
+    """Records of the test.log logger, kept out of the global queue"""
+    logger = logging.getLogger("test.log")
+    handler = Capture()
+    logger.handlers, logger.propagate = [handler], False
+    logger.setLevel(logging.INFO)
+    yield handler.records
+    logger.handlers, logger.propagate = [], True
+
+
+def test_parse_pairs():
+    assert parse_pairs(" ws_connect=0.01, app.websocket = WARNING,,broken") == {
+        "ws_connect": "0.01", "app.websocket": "WARNING",
+    }
+
+
+def test_sampled_events_keep_every_nth(captured, monkeypatch):
+    monkeypatch.setattr(log_module, "sample_every", {"noisy": 3})
+    monkeypatch.setattr(log_module, "sample_counts", {})
+    log = get_logger("test.log")
+    for i in range(7):
+        log.info("noisy", i=i)
+    log.debug("noisy", i=99)  # disabled level: neither logged nor counted
+    log.info("quiet", i=0)
+
+    assert [(r.msg, r.fields) for r in captured] == [
+        ("noisy", {"i": 0, "sample_every": 3}),
+        ("noisy", {"i": 3, "sample_every": 3}),
+        ("noisy", {"i": 6, "sample_every": 3}),
+        ("quiet", {"i": 0}),
+    ]
+    assert log_module.sample_counts == {"noisy": 7}
+
+
+def test_records_format_as_json_and_text(captured):
+    log = get_logger("test.log")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        log.exception("write_failed", room="ABCD", rows=3)
+    record = EventQueueHandler(None).prepare(captured[0])
+
+    entry = json.loads(JsonFormatter().format(record))
+    assert {k: entry[k] for k in ("level", "logger", "event", "room", "rows")} == {
+        "level": "error", "logger": "test.log", "event": "write_failed", "room": "ABCD", "rows": 3,
+    }
+    assert "ValueError: boom" in entry["exc"] and record.exc_info is None
+
+    line = TextFormatter().format(record)
+    assert "ERROR test.log write_failed room=ABCD rows=3\n" in line and line.endswith("ValueError: boom")
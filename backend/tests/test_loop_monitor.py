@@ -0,0 +1,62 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.api import rooms
+from app.services import loop_monitor as monitor_module
+from app.services.loop_monitor import LoopMonitor, loop_monitor
+
+
+def test_admission_closes_on_lag_and_reopens_below_half(monkeypatch):
+    monkeypatch.setattr(monitor_module, "LOOP_OVERLOAD_LAG", 0.1)
+    monitor = LoopMonitor()
+
+    monitor.record(0.4)  # smoothed: 0.08
+    assert monitor.admit("ws_connect")
+    monitor.record(0.4)  # 0.144
+    assert monitor.overloaded
+    assert not monitor.admit("ws_connect") and not monitor.admit("room_create")
+
+    while monitor.smoothed_lag >= 0.05:
+        assert monitor.overloaded  # stays closed between half the threshold and the threshold
+        monitor.record(0.0)
+    assert not monitor.overloaded and monitor.admit("ws_connect")
+    assert monitor.rejected == {"ws_connect": 1, "room_create": 1}
+
+
+def test_admission_control_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(monitor_module, "LOOP_OVERLOAD_LAG", 0)
+    monitor = LoopMonitor()
+    for _ in range(10):
+        monitor.record(5.0)
+    assert monitor.admit("room_create") and monitor.rejected == {}
+
+
+def test_blocking_call_is_measured_and_reported_once(monkeypatch):
+    monkeypatch.setattr(monitor_module, "LOOP_LAG_INTERVAL", 0.02)
+    monkeypatch.setattr(monitor_module, "LOOP_STALL_THRESHOLD", 0.1)
+    monkeypatch.setattr(monitor_module, "LOOP_OVERLOAD_LAG", 0)
+
+    async def run():
+        monitor = LoopMonitor()
+        monitor.start()
+        await asyncio.sleep(0.05)
+        time.sleep(0.3)  # blocks every coroutine of the loop
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+        return monitor
+
+    monitor = asyncio.run(run())
+    assert monitor.stalls == 1
+    assert monitor.lag < 0.1 and monitor.smoothed_lag > 0.02
+
+
+def test_room_creation_is_refused_while_overloaded(monkeypatch):
+    monkeypatch.setattr(loop_monitor, "overloaded", True)
+    monkeypatch.setattr(loop_monitor, "rejected", {})
+    with pytest.raises(HTTPException) as refused:
+        asyncio.run(rooms.create_room())
+    assert refused.value.status_code == 503 and refused.value.headers == {"Retry-After": "1"}
+    assert loop_monitor.rejected == {"room_create": 1}
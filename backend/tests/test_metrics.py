@@ -0,0 +1,73 @@
+import asyncio
+import os
+import socket
+
+from app import metrics
+from app.metrics import Counter, CounterFunc, GaugeFunc, Histogram, MetricsServer, Registry
+
+
+def test_registry_renders_the_exposition_format():
+    registry = Registry()
+    messages = registry.register(Counter("t_messages_total", "Messages", ("type",)))
+    rooms = registry.register(GaugeFunc("t_rooms", "Rooms", lambda: {"lobby": 2, "playing": 1}, ("status",)))
+    registry.register(CounterFunc("t_shed_total", "Shed", lambda: 4))
+    latency = registry.register(Histogram("t_seconds", "Latency", buckets=(0.1, 1.0)))
+
+    messages.inc('say "hi"\n')
+    messages.inc("join", amount=2)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value)
+
+    worker = f'worker="{os.getpid()}"'
+    assert registry.render().splitlines() == [
+        "# HELP t_messages_total Messages",
+        "# TYPE t_messages_total counter",
+        f't_messages_total{{{worker},type="join"}} 2',
+        f't_messages_total{{{worker},type="say \\"hi\\"\\n"}} 1',
+        "# HELP t_rooms Rooms",
+        "# TYPE t_rooms gauge",
+        f't_rooms{{{worker},status="lobby"}} 2',
+        f't_rooms{{{worker},status="playing"}} 1',
+        "# HELP t_shed_total Shed",
+        "# TYPE t_shed_total counter",
+        f"t_shed_total{{{worker}}} 4",
+        "# HELP t_seconds Latency",
+        "# TYPE t_seconds histogram",
+        # Upper bounds are inclusive: 0.1 falls in le="0.1"
+        f't_seconds_bucket{{{worker},le="0.1"}} 2',
+        f't_seconds_bucket{{{worker},le="1"}} 3',
+        f't_seconds_bucket{{{worker},le="+Inf"}} 4',
+        f"t_seconds_sum{{{worker}}} 3.65",
+        f"t_seconds_count{{{worker}}} 4",
+    ]
+    assert rooms.kind == "gauge"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_metrics_server_serves_the_registry_on_its_slot_port(monkeypatch):
+    base = free_port() - 1
+    monkeypatch.setattr(metrics, "METRICS_PORT", base)
+    monkeypatch.setattr(metrics, "METRICS_HOST", "127.0.0.1")
+
+    async def run():
+        server = MetricsServer()
+        await server.start(slot=1)
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", base + 1)
+            writer.write(b"GET /metrics HTTP/1.1\r\nHost: worker\r\n\r\n")
+            response = await reader.read()
+            writer.close()
+        finally:
+            await server.stop()
+        return response.decode(), server.server
+
+    response, stopped = asyncio.run(run())
+    head, _, body = response.partition("\r\n\r\n")
+    assert head.startswith("HTTP/1.1 200 OK") and f"Content-Length: {len(body.encode())}" in head
+    assert "# TYPE aliby_ws_messages_received_total counter" in body
+    assert stopped is None
@@ -0,0 +1,84 @@
+import pytest
+from alembic import command
+from sqlalchemy import create_engine, inspect, text
+
+from app import database, migrate
+
+# Objects create_all added on top of the baseline at commits that predate migrations
+CREATE_ALL_SNAPSHOTS = {
+    "user-035": [
+        "ALTER TABLE game_history ADD COLUMN guessed_words_count INTEGER DEFAULT '0' NOT NULL",
+        "CREATE INDEX ix_game_history_user_played_at ON game_history (user_id, played_at, id)",
+    ],
+}
+CREATE_ALL_SNAPSHOTS["user-036"] = CREATE_ALL_SNAPSHOTS["user-035"] + [
+    "ALTER TABLE game_history ADD COLUMN score FLOAT DEFAULT '0' NOT NULL",
+    "ALTER TABLE game_history ADD COLUMN won BOOLEAN DEFAULT 0 NOT NULL",
+    "CREATE TABLE leaderboard_rollups (period VARCHAR(8) NOT NULL, period_start DATE NOT NULL, "
+    "user_id INTEGER NOT NULL REFERENCES users (id), score FLOAT NOT NULL, games_played INTEGER NOT NULL, "
+    "wins INTEGER NOT NULL, PRIMARY KEY (period, period_start, user_id))",
+    "CREATE INDEX ix_leaderboard_rollups_rank ON leaderboard_rollups (period, period_start, score, user_id)",
+]
+CREATE_ALL_SNAPSHOTS["user-037"] = CREATE_ALL_SNAPSHOTS["user-036"] + [
+    "CREATE TABLE user_stats (user_id INTEGER NOT NULL REFERENCES users (id), total_score FLOAT NOT NULL, "
+    "games_played INTEGER NOT NULL, wins INTEGER NOT NULL, words_guessed INTEGER NOT NULL, updated_at DATETIME, "
+    "PRIMARY KEY (user_id))",
+]
+CREATE_ALL_SNAPSHOTS["user-040"] = CREATE_ALL_SNAPSHOTS["user-037"] + [
+    "CREATE TABLE pack_words (id BIGINT NOT NULL, mode VARCHAR(8) NOT NULL, word VARCHAR(100) NOT NULL, "
+    "tier VARCHAR(8) NOT NULL, guess_rate FLOAT, samples INTEGER NOT NULL, suggested_tier VARCHAR(8), "
+    "PRIMARY KEY (id), CONSTRAINT uq_pack_words_mode_word UNIQUE (mode, word))",
+    "CREATE TABLE word_guesses (id INTEGER NOT NULL, word_id BIGINT NOT NULL REFERENCES pack_words (id), "
+    "room_code VARCHAR(10) NOT NULL, played_at DATETIME NOT NULL, tier VARCHAR(8) NOT NULL, "
+    "outcome VARCHAR(8) NOT NULL, used_translation BOOLEAN NOT NULL, PRIMARY KEY (id))",
+    "CREATE INDEX ix_word_guesses_word_outcome ON word_guesses (word_id, outcome)",
+    "CREATE INDEX ix_word_guesses_tier_outcome ON word_guesses (tier, outcome)",
+]
+
+
+@pytest.fixture
+def use_database(monkeypatch, tmp_path):
+    def use(name: str):
+        engine = create_engine(f"sqlite:///{tmp_path / name}.db")
+        monkeypatch.setattr(database, "engine", engine)
+        monkeypatch.setattr(migrate, "engine", engine)
+        return engine
+
+    return use
+
+
+def schema_of(engine):
+    inspector = inspect(engine)
+    return {
+        table: (
+            sorted(column["name"] for column in inspector.get_columns(table)),
+            sorted(index["name"] for index in inspector.get_indexes(table)),
+        )
+        for table in inspector.get_table_names()
+    }
+
+
+@pytest.mark.parametrize("snapshot", CREATE_ALL_SNAPSHOTS)
+def test_create_all_schema_upgrades_to_head(snapshot, use_database):
+    fresh = use_database("fresh")
+    migrate.main()
+    expected = schema_of(fresh)
+
+    old = use_database(snapshot)
+    command.upgrade(migrate.alembic_config(), migrate.BASELINE_REVISION)
+    with old.begin() as connection:
+        connection.execute(text("DROP TABLE alembic_version"))
+        for statement in CREATE_ALL_SNAPSHOTS[snapshot]:
+            connection.execute(text(statement))
+        connection.execute(text(
+            "INSERT INTO users (id, username, email, hashed_password) VALUES (1, 'alice', 'a@example.com', 'x')"
+        ))
+        connection.execute(text(
+            "INSERT INTO game_history (user_id, room_code, teams, winner, final_scores, guessed_words) "
+            "VALUES (1, 'ROOM', '[]', 'Team 1', '{}', '[\"cat\", \"dog\"]')"
+        ))
+
+    migrate.main()
+    assert schema_of(old) == expected
+    with old.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM game_history")).scalar() == 1
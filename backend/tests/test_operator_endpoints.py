@@ -0,0 +1,24 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import cluster
+from app.main import app
+
+# Worker internals: answered on the app port only with the cluster secret
+OPERATOR_ENDPOINTS = ["/db/pool", "/auth/hasher", "/rooms/stats", "/metrics", "/internal/profile?seconds=0.05"]
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", OPERATOR_ENDPOINTS)
+def test_operator_endpoint_requires_the_cluster_secret(path, client, monkeypatch):
+    monkeypatch.setattr(cluster, "CLUSTER_SECRET", "")
+    assert client.get(path, headers={"X-Cluster-Secret": ""}).status_code == 404
+
+    monkeypatch.setattr(cluster, "CLUSTER_SECRET", "s3")
+    assert client.get(path).status_code == 403
+    assert client.get(path, headers={"X-Cluster-Secret": "wrong"}).status_code == 403
+    assert client.get(path, headers={"X-Cluster-Secret": "s3"}).status_code == 200
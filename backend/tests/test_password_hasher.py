@@ -0,0 +1,54 @@
+import asyncio
+import hashlib
+
+import pytest
+
+from app.services import password_hasher as hasher_module
+from app.services.password_hasher import PasswordHasher, PasswordHasherBusy
+
+ROUNDS = 4  # bcrypt's minimum cost keeps the tests fast
+
+
+@pytest.fixture
+def hasher(monkeypatch):
+    monkeypatch.setattr(hasher_module, "PASSWORD_BCRYPT_ROUNDS", ROUNDS)
+    monkeypatch.setattr(hasher_module, "PASSWORD_HASH_NICE", 0)
+    hasher = PasswordHasher(workers=1, max_pending=2)
+    yield hasher
+    hasher.stop()
+
+
+def test_legacy_and_low_cost_hashes_are_upgraded():
+    legacy = hashlib.sha256(b"secret").hexdigest()
+    valid, upgraded = hasher_module._verify("secret", legacy, ROUNDS)
+    assert valid and upgraded.startswith(f"$2b${ROUNDS:02d}$")
+    assert hasher_module._verify("secret", upgraded, ROUNDS) == (True, None)
+    assert hasher_module._verify("wrong", legacy, ROUNDS) == (False, None)
+
+    # A bcrypt hash of another cost is replaced by one at the configured cost
+    cheap = hasher_module._bcrypt_hash("secret", ROUNDS + 1)
+    valid, upgraded = hasher_module._verify("secret", cheap, ROUNDS)
+    assert valid and upgraded.startswith(f"$2b${ROUNDS:02d}$")
+    assert hasher_module._verify("secret", "not a hash", ROUNDS) == (False, None)
+
+
+def test_requests_beyond_the_pending_limit_are_shed(hasher):
+    async def run():
+        return await asyncio.gather(*(hasher.hash(f"p{i}") for i in range(4)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert [isinstance(r, PasswordHasherBusy) for r in results] == [False, False, True, True]
+    stats = hasher.stats()
+    assert (stats["completed"], stats["shed"], stats["peak_pending"], stats["pending"]) == (2, 2, 2, 0)
+
+
+def test_verify_counts_upgrades(hasher):
+    async def run():
+        valid, upgraded = await hasher.verify("secret", hashlib.sha256(b"secret").hexdigest())
+        again = await hasher.verify("secret", upgraded)
+        await hasher.verify_dummy("secret")
+        return valid, again
+
+    valid, again = asyncio.run(run())
+    assert valid and again == (True, None)
+    assert hasher.stats()["upgraded"] == 1
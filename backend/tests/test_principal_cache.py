@@ -0,0 +1,57 @@
+import time
+
+from app.auth import AuthenticatedUser, PrincipalCache
+
+
+def principal(user_id: int) -> AuthenticatedUser:
+    return AuthenticatedUser(id=user_id, username=f"user{user_id}", email=f"user{user_id}@example.com")
+
+
+def far_future() -> float:
+    return time.time() + 3600
+
+
+def test_entry_expires_with_ttl_or_token():
+    cache = PrincipalCache(max_entries=10, ttl=0.05)
+    cache.put("ttl", principal(1), far_future())
+    cache.put("token-expired", principal(2), time.time() - 1)
+
+    assert cache.get("ttl") == principal(1)
+    assert cache.get("token-expired") is None
+    time.sleep(0.06)
+    assert cache.get("ttl") is None
+    assert cache.entries == {}  # expired entries are dropped when seen
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PrincipalCache(max_entries=2, ttl=60)
+    cache.put("a", principal(1), far_future())
+    cache.put("b", principal(2), far_future())
+    cache.get("a")  # b is now the least recently used
+    cache.put("c", principal(3), far_future())
+
+    assert cache.get("b") is None
+    assert cache.get("a") == principal(1) and cache.get("c") == principal(3)
+    assert len(cache.entries) == 2
+
+
+def test_disabled_cache_keeps_nothing():
+    cache = PrincipalCache(max_entries=0, ttl=60)
+    cache.put("a", principal(1), far_future())
+    assert cache.get("a") is None
+
+
+def test_invalidation_by_token_and_by_user():
+    cache = PrincipalCache(max_entries=10, ttl=60)
+    cache.put("phone", principal(1), far_future())
+    cache.put("laptop", principal(1), far_future())
+    cache.put("other", principal(2), far_future())
+
+    cache.invalidate_token("phone")
+    assert cache.get("phone") is None and cache.get("laptop") == principal(1)
+
+    cache.invalidate_user(1)
+    assert cache.get("laptop") is None
+    assert cache.get("other") == principal(2)
+    cache.invalidate_token("never-cached")  # no-op
@@ -0,0 +1,32 @@
+from app import database
+from app.database import ReadRouter
+
+
+def test_expired_pins_are_evicted(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(database.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(database, "DB_READ_YOUR_WRITES_WINDOW", 5)
+    router = ReadRouter()
+    for user_id in range(100):
+        router.pin_user(user_id)
+    assert router.is_pinned(42)
+
+    now[0] += 6
+    router.pin_user(1000)
+    assert list(router.pinned_until) == [1000]
+    assert not router.is_pinned(42)
+    assert router.stats()["pinned_users"] == 1
+
+
+def test_repinning_extends_the_window(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(database.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(database, "DB_READ_YOUR_WRITES_WINDOW", 5)
+    router = ReadRouter()
+    router.pin_user(1)
+    router.pin_user(2)
+    now[0] += 3
+    router.pin_user(1)
+    now[0] += 3
+    assert router.stats()["pinned_users"] == 1
+    assert router.is_pinned(1) and not router.is_pinned(2)
@@ -0,0 +1,65 @@
+import asyncio
+
+import fakeredis
+import pytest
+
+from app.services.room_codes import (
+    FeistelPermutation, LocalCodeCounter, RedisCodeCounter, RoomCodeAllocator, RoomCodesExhausted,
+)
+
+
+@pytest.mark.parametrize("size", [2, 3, 26, 676, 1000, 17576])
+def test_feistel_permutation_is_a_bijection(size):
+    permutation = FeistelPermutation(size, "test-key")
+    assert sorted(permutation.permute(i) for i in range(size)) == list(range(size))
+
+
+def test_feistel_permutation_depends_on_key():
+    first = [FeistelPermutation(676, "key-a").permute(i) for i in range(20)]
+    second = [FeistelPermutation(676, "key-b").permute(i) for i in range(20)]
+    assert first != second
+
+
+def test_allocator_issues_every_code_once_then_is_exhausted():
+    async def run():
+        allocator = RoomCodeAllocator(LocalCodeCounter(), length=2, key="test")
+        codes = [await allocator.allocate() for _ in range(allocator.space)]
+        assert len(set(codes)) == allocator.space
+        with pytest.raises(RoomCodesExhausted):
+            await allocator.allocate()
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("redis_counter", [False, True])
+def test_rejected_free_codes_are_kept(redis_counter):
+    async def run():
+        if redis_counter:
+            counter = RedisCodeCounter(fakeredis.FakeAsyncRedis(), 2)
+        else:
+            counter = LocalCodeCounter()
+        allocator = RoomCodeAllocator(counter, length=2, key="test")
+        taken = await allocator.allocate()
+        await allocator.release(taken)
+        # Still in use (e.g. the room was not deleted yet): skipped, but not lost
+        other = await allocator.allocate(accept=lambda code: asyncio.sleep(0, code != taken))
+        assert other != taken
+        assert await counter.free_count() == 1
+        stats = await allocator.stats()
+        assert stats["counter_position"] - stats["free_list"] == 1  # only `other` is in use
+        # Usable again once the caller accepts it
+        assert await allocator.allocate() == taken
+        assert await counter.free_count() == 0
+
+    asyncio.run(run())
+
+
+def test_released_code_is_queued_once():
+    async def run():
+        allocator = RoomCodeAllocator(LocalCodeCounter(), length=2, key="test")
+        code = await allocator.allocate()
+        await allocator.release(code)
+        await allocator.release(code)
+        assert await allocator.counter.free_count() == 1
+
+    asyncio.run(run())
@@ -0,0 +1,101 @@
+import asyncio
+import os
+import time
+
+from app.services.room_store import InMemoryRoomStore  # before room_journal, as the app imports them
+from app.services import room_journal
+from app.services.room_journal import JournaledRoomStore
+
+
+def journaled(directory) -> JournaledRoomStore:
+    return JournaledRoomStore(InMemoryRoomStore(), str(directory))
+
+
+def test_recovery_stops_at_a_torn_record(tmp_path, make_room):
+    saved = {code: make_room(code) for code in ("AAAA", "BBBB", "CCCC")}
+
+    async def write():
+        store = journaled(tmp_path)
+        await store.recover()
+        for room in saved.values():
+            await store.save(room)
+            await store.flush()
+        await store.delete("AAAA")
+        await store.stop()
+
+    async def recover():
+        store = journaled(tmp_path)
+        rooms = await store.recover()
+        await store.stop()
+        return rooms
+
+    asyncio.run(write())
+    # Crash in the middle of the last record (the deletion of AAAA)
+    log_path = tmp_path / "rooms.log"
+    os.truncate(log_path, log_path.stat().st_size - 5)
+
+    rooms = asyncio.run(recover())
+    assert sorted(room.room_code for room in rooms) == ["AAAA", "BBBB", "CCCC"]
+    for room in rooms:
+        assert room.to_dict() == saved[room.room_code].to_dict()
+
+
+def test_recovery_replays_snapshot_then_log(tmp_path, make_room):
+    async def run():
+        store = journaled(tmp_path)
+        await store.recover()
+        await store.save(make_room("AAAA"))
+        await store.save(make_room("BBBB"))
+        await store.snapshot()
+        await store.delete("AAAA")
+        await store.save(make_room("CCCC"))
+        await store.stop()
+
+        recovered = journaled(tmp_path)
+        rooms = await recovered.recover()
+        await recovered.stop()
+        return sorted(room.room_code for room in rooms)
+
+    assert asyncio.run(run()) == ["BBBB", "CCCC"]
+
+
+def test_idle_tail_is_fsynced(tmp_path, make_room, monkeypatch):
+    synced = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(room_journal.os, "fsync", lambda fd: synced.append(fd) or real_fsync(fd))
+    monkeypatch.setattr(room_journal, "JOURNAL_FSYNC_INTERVAL", 3600)
+
+    async def run():
+        store = journaled(tmp_path)
+        await store.recover()
+        store.last_fsync = time.monotonic()
+        await store.save(make_room("AAAA"))
+        await store.flush()
+        assert synced == [] and store.unsynced
+        # No further writes: the next flush after the interval still syncs the tail
+        store.last_fsync -= 3600
+        await store.flush()
+        assert len(synced) == 1 and not store.unsynced
+        await store.stop()
+
+    asyncio.run(run())
+
+
+def test_second_process_does_not_write_a_locked_journal(tmp_path, make_room):
+    async def run():
+        owner = journaled(tmp_path)
+        await owner.recover()
+        other = journaled(tmp_path)
+        assert await other.recover() == []
+        assert not other.enabled
+        await other.save(make_room("AAAA"))
+        assert other.dirty == {}
+        await other.stop()
+        await owner.stop()
+        # Released on stop: the next process journals again
+        again = journaled(tmp_path)
+        await again.recover()
+        assert again.enabled
+        await again.stop()
+
+    asyncio.run(run())
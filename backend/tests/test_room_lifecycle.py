@@ -0,0 +1,50 @@
+import asyncio
+import time
+
+from app.services.room_lifecycle import RoomLifecycleManager
+from app.services.room_store import room_store
+
+
+def test_eviction_waits_for_a_handler_holding_the_room(make_room):
+    async def run():
+        lifecycle = RoomLifecycleManager()
+        room = make_room("IDLE")
+        room.last_activity_at = 0  # long expired
+        await room_store.save(room)
+        handler_has_room = asyncio.Event()
+
+        async def handler():
+            async with room_store.lock("IDLE"):
+                current = await room_store.get("IDLE")
+                handler_has_room.set()
+                await asyncio.sleep(0.01)
+                current.last_activity_at = time.time()
+                await room_store.save(current)
+
+        task = asyncio.create_task(handler())
+        await handler_has_room.wait()
+        await lifecycle.sweep()
+        await task
+        return lifecycle
+
+    lifecycle = asyncio.run(run())
+    # The message refreshed the room, so the sweep kept it
+    assert asyncio.run(room_store.exists("IDLE"))
+    assert sum(lifecycle.evictions.values()) == 0
+    asyncio.run(room_store.delete("IDLE"))
+
+
+def test_evicted_room_stays_deleted(make_room):
+    async def run():
+        lifecycle = RoomLifecycleManager()
+        room = make_room("GONE")
+        room.last_activity_at = 0
+        await room_store.save(room)
+        await lifecycle.sweep()
+        # A handler that arrives after the eviction finds no room to save
+        async with room_store.lock("GONE"):
+            assert await room_store.get("GONE") is None
+        return lifecycle
+
+    lifecycle = asyncio.run(run())
+    assert lifecycle.evictions["lobby"] == 1
@@ -0,0 +1,116 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException, Response
+
+from app.api import cluster
+from app.services import room_lifecycle
+from app.services.room_router import HashRing, RoomRouter, parse_cluster_nodes, room_router
+from app.services.room_store import InMemoryRoomStore
+
+NODES = {"node1": "http://backend1:8000", "node2": "http://backend2:8000"}
+CODES = [f"R{i:03d}" for i in range(1000)]
+REAL_ASYNC_CLIENT = httpx.AsyncClient
+
+
+def test_parse_cluster_nodes():
+    spec = " node1=http://backend1:8000/ , node2=http://backend2:8000,,"
+    assert parse_cluster_nodes(spec) == NODES
+
+
+def test_ring_owner_is_stable_and_moves_few_keys():
+    two = HashRing(["node1", "node2"])
+    again = HashRing(["node2", "node1"])
+    three = HashRing(["node1", "node2", "node3"])
+
+    assert all(two.get_node(code) == again.get_node(code) for code in CODES)
+    moved = [code for code in CODES if two.get_node(code) != three.get_node(code)]
+    # Only keys taken over by the new node move, roughly a third of them
+    assert all(three.get_node(code) == "node3" for code in moved)
+    assert 200 < len(moved) < 500
+
+
+def test_router_without_cluster_owns_everything():
+    router = RoomRouter("local", {})
+    assert not router.clustered
+    assert all(router.is_local(code) for code in CODES[:50])
+    assert router.moved_rooms(CODES[:50]) == []
+
+
+@pytest.fixture
+def clustered(monkeypatch):
+    """The global router as node1 of NODES with an empty store; returns the store"""
+    store = InMemoryRoomStore()
+    monkeypatch.setattr(cluster, "room_store", store)
+    monkeypatch.setattr(room_lifecycle, "room_store", store)
+    saved = (room_router.node_id, dict(room_router.node_urls), set(room_router.retained))
+    room_router.node_id = "node1"
+    room_router.set_nodes({"node1": NODES["node1"]})
+    monkeypatch.setattr(cluster, "CLUSTER_SECRET", "s3")
+    yield store
+    room_router.node_id, room_router.retained = saved[0], saved[2]
+    room_router.set_nodes(saved[1])
+
+
+def mock_client(monkeypatch, handler):
+    monkeypatch.setattr(cluster.httpx, "AsyncClient",
+                        lambda **kwargs: REAL_ASYNC_CLIENT(transport=httpx.MockTransport(handler), **kwargs))
+
+
+def codes_moving_to_node2(count: int):
+    ring = HashRing(["node1", "node2"])
+    return [code for code in CODES if ring.get_node(code) == "node2"][:count]
+
+
+def test_failed_handoff_keeps_the_room_here(make_room, clustered, monkeypatch):
+    good, bad = codes_moving_to_node2(2)
+    imported = []
+
+    def handler(request: httpx.Request):
+        code = request.read().decode()
+        if f'"{bad}"' in code:
+            raise httpx.ConnectError("connection refused", request=request)
+        imported.append(good)
+        return httpx.Response(200, json={"status": "imported"})
+
+    mock_client(monkeypatch, handler)
+
+    async def run():
+        await clustered.save(make_room(good))
+        await clustered.save(make_room(bad))
+        response = Response()
+        report = await cluster.update_cluster_nodes(cluster.ClusterNodesRequest(nodes=NODES), response)
+        return report, response.status_code, await clustered.exists(good), await clustered.exists(bad)
+
+    report, status_code, good_exists, bad_exists = asyncio.run(run())
+    assert report["handed_off"] == [good] and imported == [good]
+    assert [f["room_code"] for f in report["failed"]] == [bad]
+    assert "ConnectError" in report["failed"][0]["error"]
+    assert status_code == 207
+    assert not good_exists and bad_exists
+    # The stranded room is still served here, the handed-off one is routed to node2
+    assert room_router.is_local(bad) and not room_router.is_local(good)
+
+    # The next membership update retries it
+    mock_client(monkeypatch, lambda request: httpx.Response(200, json={"status": "imported"}))
+    retry = asyncio.run(cluster.update_cluster_nodes(cluster.ClusterNodesRequest(nodes=NODES), Response()))
+    assert retry["handed_off"] == [bad] and retry["failed"] == []
+    assert not room_router.is_local(bad) and bad not in room_router.retained
+
+
+def test_node_list_without_this_node_needs_drain(make_room, clustered, monkeypatch):
+    only_node2 = {"node2": NODES["node2"]}
+    with pytest.raises(HTTPException) as rejected:
+        asyncio.run(cluster.update_cluster_nodes(cluster.ClusterNodesRequest(nodes=only_node2), Response()))
+    assert rejected.value.status_code == 400
+    assert room_router.node_urls == {"node1": NODES["node1"]}
+
+    mock_client(monkeypatch, lambda request: httpx.Response(200, json={"status": "imported"}))
+
+    async def drain():
+        await clustered.save(make_room("ROOM"))
+        return await cluster.update_cluster_nodes(
+            cluster.ClusterNodesRequest(nodes=only_node2, drain=True), Response())
+
+    assert asyncio.run(drain())["handed_off"] == ["ROOM"]
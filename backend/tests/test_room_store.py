@@ -0,0 +1,132 @@
+import asyncio
+
+import fakeredis
+import pytest
+
+from app.models import Difficulty, GameStatus
+from app.room_state import GuessedWordState, PlayerState, RoomState, WordEventState, WordState
+from app.services import room_store as room_store_module
+from app.services.room_store import InMemoryRoomStore, RedisRoomStore, RoomLockTimeout, ROOM_LOCK_PREFIX
+
+
+def redis_stores(count: int):
+    """Stores of `count` workers sharing one Redis server"""
+    server = fakeredis.FakeServer()
+    return [RedisRoomStore(fakeredis.FakeAsyncRedis(server=server)) for _ in range(count)]
+
+
+async def add_points(store, room_code: str, times: int):
+    """get -> mutate -> save with a yield in between, like a game handler"""
+    for _ in range(times):
+        async with store.lock(room_code):
+            room = await store.get(room_code)
+            await asyncio.sleep(0)
+            room.teams[0].score += 1
+            await store.save(room)
+
+
+def test_redis_round_trip(make_room):
+    async def run():
+        store, = redis_stores(1)
+        room = make_room("ROOM")
+        room.teams[0].score = 3.5
+        await store.save(room)
+
+        loaded = await store.get("ROOM")
+        assert loaded.to_dict() == room.to_dict()
+        assert await store.exists("ROOM")
+        assert await store.room_codes() == ["ROOM"]
+
+        await store.delete("ROOM")
+        assert await store.get("ROOM") is None
+        assert not await store.exists("ROOM")
+        assert await store.room_codes() == []
+
+    asyncio.run(run())
+
+
+def test_stored_room_loads_like_the_validated_one(make_room):
+    room = make_room("ROOM")
+    room.status = GameStatus.PLAYING
+    room.settings.difficulty = Difficulty.HARD
+    room.teams[0].players.append(PlayerState("p1", "alice", True))
+    room.teams[0].score = 2.5
+    room.current_round_words.append(GuessedWordState("cat", ["pet"], 1.5, True, "kot"))
+    room.current_word = WordState("dog", ["bark"], "sobaka", "animals", "easy")
+    room.word_log.append(WordEventState("cat", "easy", "guessed", True, 1.5))
+    room.round_ends_at, room.winner, room.credited_users = 99.5, "Team 1", [7]
+    raw = RedisRoomStore.serialize(room)
+
+    assert RoomState.from_stored(raw) == room == RoomState.from_dict(raw)
+
+    # A room stored before newer fields existed gets GameRoom's defaults
+    old = room.to_dict()
+    for name in ("word_log", "winner", "credited_users", "round_ends_at", "current_word"):
+        del old[name]
+    old["settings"].pop("room_password")
+    loaded = RoomState.from_stored(old)
+    assert loaded == RoomState.from_dict(old)
+    assert (loaded.word_log, loaded.winner, loaded.current_word, loaded.settings.room_password) == ([], "", None, "")
+
+
+def test_redis_lock_keeps_concurrent_updates_across_workers(make_room):
+    async def run():
+        first, second = redis_stores(2)
+        await first.save(make_room("ROOM"))
+        await asyncio.gather(
+            add_points(first, "ROOM", 20),
+            add_points(first, "ROOM", 20),
+            add_points(second, "ROOM", 20),
+        )
+        assert (await second.get("ROOM")).teams[0].score == 60
+        assert not await first.redis.exists(ROOM_LOCK_PREFIX + "ROOM")
+        assert first.locks.locks == {}
+
+    asyncio.run(run())
+
+
+def test_redis_lock_released_on_error(make_room):
+    async def run():
+        store, = redis_stores(1)
+        with pytest.raises(RuntimeError):
+            async with store.lock("ROOM"):
+                raise RuntimeError("handler failed")
+        async with store.lock("ROOM"):
+            pass
+
+    asyncio.run(run())
+
+
+def test_redis_lock_times_out_while_held_elsewhere(monkeypatch):
+    async def run():
+        first, second = redis_stores(2)
+        monkeypatch.setattr(room_store_module, "ROOM_LOCK_TIMEOUT", 0.05)
+        async with first.lock("ROOM"):
+            with pytest.raises(RoomLockTimeout):
+                async with second.lock("ROOM"):
+                    pass
+
+    asyncio.run(run())
+
+
+def test_redis_unlock_leaves_a_lock_taken_after_expiry():
+    async def run():
+        first, second = redis_stores(2)
+        key = ROOM_LOCK_PREFIX + "ROOM"
+        async with first.lock("ROOM"):
+            # Our lock expired and another worker took it
+            await first.redis.set(key, b"other-token")
+        assert await second.redis.get(key) == b"other-token"
+
+    asyncio.run(run())
+
+
+def test_memory_lock_keeps_concurrent_updates(make_room):
+    async def run():
+        store = InMemoryRoomStore()
+        await store.save(make_room("ROOM"))
+        await asyncio.gather(*(add_points(store, "ROOM", 10) for _ in range(3)))
+        assert (await store.get("ROOM")).teams[0].score == 30
+        assert store.locks.locks == {}
+
+    asyncio.run(run())
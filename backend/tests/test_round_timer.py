@@ -0,0 +1,92 @@
+import asyncio
+import time
+
+import fakeredis
+import pytest
+
+from app import websocket
+from app.models import GameStatus
+from app.services.room_store import RedisRoomStore
+
+
+@pytest.fixture
+def workers(monkeypatch):
+    """Two workers' stores on one Redis; the timer runs on the first. Returns (stores, sent)."""
+    server = fakeredis.FakeServer()
+    stores = [RedisRoomStore(fakeredis.FakeAsyncRedis(server=server)) for _ in range(2)]
+    sent = []
+
+    async def broadcast(room_code, message):
+        sent.append(message["type"])
+
+    monkeypatch.setattr(websocket, "room_store", stores[0])
+    monkeypatch.setattr(websocket.manager, "broadcast", broadcast)
+    return stores, sent
+
+
+def playing_room(make_room, seconds: int):
+    room = make_room("TIME")
+    room.status = GameStatus.PLAYING
+    room.round_ends_at = time.time() + seconds
+    return room
+
+
+def test_timer_stops_when_another_worker_ends_the_round(make_room, workers):
+    (first, second), sent = workers
+
+    async def run():
+        room = playing_room(make_room, 3)
+        await first.save(room)
+        websocket.schedule_round_timer("TIME", 3, room.round_ends_at)
+        task = websocket.active_timers["TIME"]
+
+        # round_end handled on the other worker: its cancel_round_timer finds no local task
+        async with second.lock("TIME"):
+            other = await second.get("TIME")
+            other.round_ends_at = 0.0
+            await second.save(other)
+
+        await asyncio.wait_for(task, 2)
+        return await first.get("TIME")
+
+    room = asyncio.run(run())
+    assert sent == []
+    assert not room.timer_ended
+    assert "TIME" not in websocket.active_timers
+
+
+def test_timer_of_a_replaced_round_does_not_end_the_new_one(make_room, workers):
+    (first, second), sent = workers
+
+    async def run():
+        room = playing_room(make_room, 1)
+        await first.save(room)
+        websocket.schedule_round_timer("TIME", 1, room.round_ends_at)
+        task = websocket.active_timers["TIME"]
+
+        async with second.lock("TIME"):
+            other = await second.get("TIME")
+            other.round_ends_at += 60  # next round started elsewhere
+            await second.save(other)
+
+        await asyncio.wait_for(task, 2)
+        return await first.get("TIME")
+
+    room = asyncio.run(run())
+    assert sent == []
+    assert not room.timer_ended and room.round_ends_at > 0
+
+
+def test_timer_ends_its_own_round(make_room, workers):
+    (first, _), sent = workers
+
+    async def run():
+        room = playing_room(make_room, 2)
+        await first.save(room)
+        websocket.schedule_round_timer("TIME", 2, room.round_ends_at)
+        await asyncio.wait_for(websocket.active_timers["TIME"], 3)
+        return await first.get("TIME")
+
+    room = asyncio.run(run())
+    assert sent == ["timer_update", "timer_update", "timer_ended"]
+    assert room.timer_ended and room.round_ends_at == 0.0
@@ -0,0 +1,87 @@
+import asyncio
+import json
+
+import pytest
+
+from app import tracing
+from app.tracing import NOOP_SPAN, Tracer
+
+
+@pytest.fixture
+def enabled(monkeypatch, tmp_path):
+    """Tracing on, exporting to a file; fast traces are never sampled. Returns the file."""
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(tracing, "ENABLED", True)
+    monkeypatch.setattr(tracing, "TRACE_FILE", str(path))
+    monkeypatch.setattr(tracing, "TRACE_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(tracing, "TRACE_SLOW_THRESHOLD", 60.0)
+    return path
+
+
+@tracing.traced("word_draw")
+def draw_word():
+    return "cat"
+
+
+def handle_message(tracer: Tracer, fail: bool = False):
+    root = tracer.start_trace("ws_message", room="ROOM", type="word_guessed")
+    try:
+        with tracing.span("handler") as handler:
+            handler.set(team=1)
+            draw_word()
+            if fail:
+                with tracing.span("send"):
+                    raise ConnectionError
+    except ConnectionError:
+        pass
+    tracer.finish(root)
+    return root
+
+
+def test_disabled_tracing_is_a_noop():
+    tracer = Tracer()
+    assert tracer.start_trace("ws_message") is NOOP_SPAN
+    assert tracing.span("handler") is NOOP_SPAN
+    tracer.finish(NOOP_SPAN)
+    assert tracer.stats()["started"] == 0
+
+
+def test_fast_traces_are_discarded_and_slow_ones_kept(enabled, monkeypatch):
+    tracer = Tracer()
+    handle_message(tracer)
+    assert tracer.stats() == {"enabled": True, "started": 1, "kept": 0, "dropped": 0, "export_failed": 0,
+                              "pending": 0}
+    # Spans opened after the trace ended are not recorded into it
+    assert tracing.span("late") is NOOP_SPAN
+
+    monkeypatch.setattr(tracing, "TRACE_SAMPLE_RATE", 1.0)
+    handle_message(tracer)
+    monkeypatch.setattr(tracing, "TRACE_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(tracing, "TRACE_SLOW_THRESHOLD", 0.0)
+    handle_message(tracer)
+    monkeypatch.setattr(tracing, "TRACE_BUFFER_MAX", 2)
+    handle_message(tracer)
+    assert (tracer.kept, tracer.dropped, len(tracer.buffer)) == (2, 1, 2)
+
+
+def test_kept_trace_is_exported_with_its_span_tree(enabled, monkeypatch):
+    monkeypatch.setattr(tracing, "TRACE_SLOW_THRESHOLD", 0.0)
+    tracer = Tracer()
+    root = handle_message(tracer, fail=True)
+    otlp = tracing.to_otlp(tracer.buffer)
+    asyncio.run(tracer.flush())
+
+    record = json.loads(enabled.read_text())
+    assert (record["name"], record["room"], record["type"]) == ("ws_message", "ROOM", "word_guessed")
+    spans = {s["name"]: s for s in record["spans"]}
+    assert list(spans) == ["word_draw", "send", "handler"]  # in end order
+    assert spans["handler"]["parent_id"] == root.span_id and spans["handler"]["team"] == 1
+    assert spans["word_draw"]["parent_id"] == spans["send"]["parent_id"] == spans["handler"]["span_id"]
+    assert spans["send"]["error"] == "ConnectionError"
+    assert tracer.buffer == []
+
+    exported = otlp["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert [(s["name"], s["kind"]) for s in exported] == [
+        ("word_draw", 1), ("send", 1), ("handler", 1), ("ws_message", 2),
+    ]
+    assert {"key": "team", "value": {"intValue": "1"}} in exported[2]["attributes"]
@@ -0,0 +1,55 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.database import AsyncSessionLocal, SessionLocal
+from app.db_models import GameHistory, UserStats
+from app.migrate import main as migrate
+from app.services import user_stats
+
+
+@pytest.fixture(scope="module", autouse=True)
+def schema():
+    migrate()
+
+
+def saved_game(user_id: int, score: float, won: bool, words: int) -> dict:
+    return {"user_id": user_id, "score": score, "won": won, "guessed_words_count": words}
+
+
+def test_batches_add_up_per_user():
+    async def run():
+        async with AsyncSessionLocal() as db:
+            await user_stats.apply_games(db, [saved_game(501, 10, True, 4), saved_game(502, 3, False, 1)])
+            await db.commit()
+            await user_stats.apply_games(db, [saved_game(501, 2.5, False, 3)])
+            await user_stats.apply_games(db, [])
+            await db.commit()
+            return {user_id: user_stats.to_response(user_id, await db.get(UserStats, user_id))
+                    for user_id in (501, 502, 503)}
+
+    stats = asyncio.run(run())
+    assert stats[501] == {"user_id": 501, "total_score": 12.5, "games_played": 2, "wins": 1,
+                          "avg_words_per_game": 3.5}
+    assert (stats[502]["games_played"], stats[502]["wins"]) == (1, 0)
+    # No games yet: zeros instead of a division by zero
+    assert stats[503] == {"user_id": 503, "total_score": 0, "games_played": 0, "wins": 0,
+                          "avg_words_per_game": 0.0}
+
+
+def test_backfill_rebuilds_stats_from_history():
+    with SessionLocal() as db:
+        db.add_all([
+            GameHistory(user_id=511, room_code="BKFL", played_at=datetime(2026, 1, day), teams=[],
+                        winner="Team 1", final_scores={}, guessed_words=[], guessed_words_count=words,
+                        score=score, won=won)
+            for day, score, won, words in [(1, 8, True, 2), (2, 4, False, 5), (3, 6, True, 2)]
+        ])
+        db.add(UserStats(user_id=511, total_score=999, games_played=99, wins=0, words_guessed=0))
+        db.commit()
+
+        user_stats.backfill_stats(db)
+        stats = user_stats.to_response(511, db.get(UserStats, 511))
+
+    assert stats == {"user_id": 511, "total_score": 18, "games_played": 3, "wins": 2, "avg_words_per_game": 3.0}
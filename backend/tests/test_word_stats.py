@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from app.database import AsyncSessionLocal, SessionLocal
+from app.db_models import PackWord
+from app.migrate import main as migrate
+from app.models import GameMode
+from app.room_state import WordState
+from app.services import word_stats
+from app.services.word_stats import WordGuessRecorder, word_id
+
+# Outcomes per word: "easyish" is always guessed, "toughie" mostly skipped
+PLAYS = [("easyish", "guessed")] * 4 + [("toughie", "skipped")] * 3 + [("toughie", "guessed")]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def schema():
+    migrate()
+
+
+def test_word_id_is_stable_and_mode_specific():
+    assert word_id("alias", "cat") == word_id("alias", "cat")
+    assert word_id("alias", "cat") != word_id("taboo", "cat")
+    assert 0 <= word_id("alias", "cat") < 2 ** 63
+
+
+def played_room(make_room):
+    room = make_room("WSTA")
+    room.mode = GameMode.TABOO
+    for word, outcome in PLAYS:
+        room.current_word = WordState(word, tier="medium")
+        room.log_word(outcome)
+    # Taking a guess back in round review turns it into "removed"
+    room.current_word = WordState("toughie", tier="medium")
+    room.log_word("guessed")
+    room.mark_word_removed("toughie")
+    return room
+
+
+def test_game_log_is_written_and_aggregated(make_room):
+    async def run():
+        recorder = WordGuessRecorder()
+        room = played_room(make_room)
+        recorder.record(room)
+        recorder.record(room)  # the log was handed over, nothing is written twice
+        await recorder.stop()
+        async with AsyncSessionLocal() as db:
+            skipped = await word_stats.word_stats(db, "taboo", "skipped", limit=10, min_samples=1)
+            hardest = await word_stats.word_stats(db, "taboo", "hardest", limit=10, min_samples=5)
+        return recorder.stats(), room.word_log, skipped, hardest
+
+    stats, word_log, skipped, hardest = asyncio.run(run())
+    assert stats == {"pending": 0, "games_written": 1, "rows_written": 9, "failed": 0}
+    assert word_log == []
+    assert [(w["word"], w["guessed"], w["skipped"], w["samples"]) for w in skipped] == [
+        ("toughie", 1, 3, 5), ("easyish", 4, 0, 4),
+    ]
+    assert [w["word"] for w in hardest] == ["toughie"]  # easyish has too few samples
+
+    pack_tiers = {"taboo": {"easyish": "medium", "toughie": "medium"}}
+    with SessionLocal() as db:
+        overrides = word_stats.retier(db, 4, pack_tiers, {"taboo": {"gone": "easy"}})
+        toughie = db.get(PackWord, word_id("taboo", "toughie"))
+    assert overrides == {"taboo": {"gone": "easy", "easyish": "easy", "toughie": "hard"}}
+    assert (toughie.samples, toughie.guess_rate, toughie.suggested_tier) == (5, 0.2, "hard")
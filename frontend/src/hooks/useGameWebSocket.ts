@@ -19,6 +19,10 @@ const getWsUrl = () => {
 
 const WS_URL = getWsUrl();
 
+// Server refuses new connections while overloaded; reconnect with backoff
+const OVERLOADED_CLOSE_CODE = 1013;
+const MAX_RECONNECT_DELAY_MS = 15000;
+
 interface GameState {
   room_code: string;
   mode: string;
@@ -62,15 +66,21 @@ const useGameWebSocket = (roomCode: string) => {
   const wsRef = useRef<WebSocket | null>(null);
   const gameStateRef = useRef<GameState | null>(null);
   const guessedWordsRef = useRef<GuessedWord[]>([]);
+  const [reconnectKey, setReconnectKey] = useState(0);
+  const reconnectAttemptsRef = useRef(0);
 
   useEffect(() => {
     if (!roomCode) return;
 
     const ws = new WebSocket(`${WS_URL}/ws/game/${roomCode}`);
 
+    let reconnectTimer: ReturnType<typeof setTimeout> | undefined;
+
     ws.onopen = () => {
       console.log('WebSocket connected');
       setIsConnected(true);
+      // Back-off starts over after every successful connection
+      reconnectAttemptsRef.current = 0;
     };
 
     ws.onmessage = (event) => {
@@ -173,7 +183,8 @@ const useGameWebSocket = (roomCode: string) => {
                 ? 'http://localhost:8050' 
                 : `${window.location.protocol}//${window.location.hostname}${window.location.port ? ':' + window.location.port : ''}`;
               
-              await fetch(`${API_URL}/history/save-game`, {
+              // Teams, scores and the winner are taken from the finished room on the server
+              const response = await fetch(`${API_URL}/history/save-game`, {
                 method: 'POST',
                 headers: {
                   'Authorization': `Bearer ${token}`,
@@ -181,12 +192,13 @@ const useGameWebSocket = (roomCode: string) => {
                 },
                 body: JSON.stringify({
                   room_code: roomCode,
-                  winner: message.winner,
-                  final_scores: message.scores || {},
-                  teams: currentGameState.teams || [],
                   guessed_words: allGuessedWords
                 })
               });
+              // 409: this account already saved the game (e.g. from another tab)
+              if (!response.ok && response.status !== 409) {
+                console.error('Failed to save game history:', response.status, await response.text());
+              }
             } catch (err) {
               console.error('Failed to save game history:', err);
             }
@@ -204,17 +216,25 @@ const useGameWebSocket = (roomCode: string) => {
       console.error('WebSocket error:', error);
     };
 
-    ws.onclose = () => {
+    ws.onclose = (event) => {
       console.log('WebSocket disconnected');
       setIsConnected(false);
+      if (event.code === OVERLOADED_CLOSE_CODE) {
+        const attempt = reconnectAttemptsRef.current++;
+        const delay = Math.min(1000 * 2 ** attempt, MAX_RECONNECT_DELAY_MS) + Math.random() * 500;
+        reconnectTimer = setTimeout(() => setReconnectKey((key) => key + 1), delay);
+      } else {
+        reconnectAttemptsRef.current = 0;
+      }
     };
 
     wsRef.current = ws;
 
     return () => {
+      clearTimeout(reconnectTimer);
       ws.close();
     };
-  }, [roomCode]);
+  }, [roomCode, reconnectKey]);
 
   const sendMessage = (message: any) => {
     if (wsRef.current && wsRef.current.readyState === WebSocket.OPEN) {
@@ -21,6 +21,10 @@ interface GameHistory {
   teams: Array<{ name: string; score: number }>;
   winner: string;
   final_scores: Record<string, number>;
+  guessed_words_count: number;
+}
+
+interface GameDetails extends GameHistory {
   guessed_words: Array<{ word: string; team: string; translation?: string }>;
 }
 
@@ -29,13 +33,15 @@ const HistoryPage: React.FC = () => {
   const [games, setGames] = useState<GameHistory[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
-  const [selectedGame, setSelectedGame] = useState<GameHistory | null>(null);
+  const [selectedGame, setSelectedGame] = useState<GameDetails | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     fetchHistory();
   }, []);
 
-  const fetchHistory = async () => {
+  const fetchHistory = async (cursor?: string) => {
     const token = localStorage.getItem('auth_token');
     if (!token) {
       navigate('/login');
@@ -43,7 +49,8 @@ const HistoryPage: React.FC = () => {
     }
 
     try {
-      const response = await fetch(`${API_URL}/history/my-games`, {
+      const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+      const response = await fetch(`${API_URL}/history/my-games${query}`, {
         headers: {
           'Authorization': `Bearer ${token}`
         }
@@ -54,11 +61,39 @@ const HistoryPage: React.FC = () => {
       }
 
       const data = await response.json();
-      setGames(data);
+      setGames((prev) => (cursor ? [...prev, ...data.games] : data.games));
+      setNextCursor(data.next_cursor);
     } catch (err: any) {
       setError(err.message);
     } finally {
       setLoading(false);
+      setLoadingMore(false);
+    }
+  };
+
+  const loadMore = () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    fetchHistory(nextCursor);
+  };
+
+  // Guessed words are only loaded for the game being opened
+  const openGame = async (gameId: number) => {
+    const token = localStorage.getItem('auth_token');
+    try {
+      const response = await fetch(`${API_URL}/history/games/${gameId}`, {
+        headers: {
+          'Authorization': `Bearer ${token}`
+        }
+      });
+
+      if (!response.ok) {
+        throw new Error('Failed to fetch game details');
+      }
+
+      setSelectedGame(await response.json());
+    } catch (err: any) {
+      setError(err.message);
     }
   };
 
@@ -116,7 +151,7 @@ const HistoryPage: React.FC = () => {
               <div
                 key={game.id}
                 className="bg-white rounded-lg shadow-lg p-6 cursor-pointer hover:shadow-xl transition"
-                onClick={() => setSelectedGame(game)}
+                onClick={() => openGame(game.id)}
               >
                 <div className="flex justify-between items-start mb-4">
                   <div>
@@ -142,10 +177,22 @@ const HistoryPage: React.FC = () => {
                 </div>
 
                 <div className="mt-4 text-sm text-gray-500">
-                  {game.guessed_words.length} words guessed • Click for details
+                  {game.guessed_words_count} words guessed • Click for details
                 </div>
               </div>
             ))}
+
+            {nextCursor && (
+              <div className="text-center">
+                <button
+                  onClick={loadMore}
+                  disabled={loadingMore}
+                  className="bg-white text-blue-600 px-6 py-2 rounded-lg font-medium hover:bg-gray-100 transition disabled:opacity-50"
+                >
+                  {loadingMore ? 'Loading...' : 'Load more'}
+                </button>
+              </div>
+            )}
           </div>
         )}
 